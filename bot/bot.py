@@ -1,19 +1,26 @@
 import asyncio
 import contextlib
+import time
+import types
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
 from sys import exception
 
 import aiohttp
 from discord.errors import Forbidden
 from pydis_core import BotBase
+from pydis_core.utils import scheduling
 from pydis_core.utils.error_handling import handle_forbidden_from_block
 from sentry_sdk import new_scope, start_transaction
 
 from bot import constants, exts
 from bot.log import get_logger
+from bot.utils.http_cache import HTTPCache
+from bot.utils.listener_stats import ListenerStats
+from bot.utils.metrics import AggregatingStats
 
 log = get_logger("bot")
 
-
 class StartupError(Exception):
     """Exception class for startup errors."""
 
@@ -22,6 +29,16 @@ class StartupError(Exception):
         self.exception = base
 
 
+@dataclass(slots=True)
+class ExtensionLoad:
+    """When an extension's loading started and finished, relative to the start of extension loading."""
+
+    name: str
+    started_at: float | None = None
+    finished_at: float | None = None
+    failed: bool = False
+
+
 class Bot(BotBase):
     """A subclass of `pydis_core.BotBase` that implements bot-specific functions."""
 
@@ -29,10 +46,90 @@ class Bot(BotBase):
 
         super().__init__(*args, **kwargs)
 
+        # A cache of responses from external APIs, shared by the users of `http_session`.
+        self.http_cache = HTTPCache(redis_namespace="HTTPCache.responses")
+
+        # Metrics reported from hot paths are buffered, and sent to `stats` in batches.
+        self.metrics = AggregatingStats(lambda: self.stats)
+
+        # The time taken by each event listener, used to find the listeners which hold up the event loop.
+        self.listener_stats = ListenerStats(self.metrics)
+
+        # The loading of each extension found at startup, reported as a timeline once they're all loaded.
+        self._extension_loads: dict[str, ExtensionLoad] | None = None
+        self._extension_loads_start = 0.0
+        self._extensions_loaded = asyncio.Event()
+
     async def load_extension(self, name: str, *args, **kwargs) -> None:
-        """Extend D.py's load_extension function to also record sentry performance stats."""
-        with start_transaction(op="cog-load", name=name):
-            await super().load_extension(name, *args, **kwargs)
+        """
+        Extend D.py's load_extension function to also record sentry performance stats.
+
+        The extensions loaded at startup also have their loading added to the timeline reported once they're loaded.
+        """
+        load = None
+        if self._extension_loads is not None:
+            load = ExtensionLoad(name, started_at=time.perf_counter() - self._extension_loads_start)
+            self._extension_loads[name] = load
+
+        try:
+            with start_transaction(op="cog-load", name=name):
+                await super().load_extension(name, *args, **kwargs)
+        except BaseException:
+            if load is not None:
+                load.failed = True
+            raise
+        finally:
+            if load is not None:
+                load.finished_at = time.perf_counter() - self._extension_loads_start
+                self._check_extensions_loaded()
+
+    async def _run_event(self, coro: Callable[..., Coroutine], event_name: str, *args, **kwargs) -> None:
+        """Extend D.py's event runner to time each listener it runs."""
+        await super()._run_event(self.listener_stats.instrument(coro, event_name), event_name, *args, **kwargs)
+
+    async def _load_extensions(self, module: types.ModuleType) -> None:
+        """Extend `BotBase._load_extensions` to log, and send to Sentry, the timeline of the extensions' loading."""
+        # The timeline starts once the guild is available, rather than including the wait for it.
+        await self.wait_until_guild_available()
+        self._extension_loads = {}
+        self._extension_loads_start = time.perf_counter()
+        await super()._load_extensions(module)
+
+        self._check_extensions_loaded()
+        scheduling.create_task(self._report_extension_loads())
+
+    def _check_extensions_loaded(self) -> None:
+        """Mark the extensions as loaded once all those found at startup have finished loading."""
+        if self.all_extensions is None or self._extension_loads is None:
+            return
+
+        loads = self._extension_loads
+        if all(name in loads and loads[name].finished_at is not None for name in self.all_extensions):
+            self._extensions_loaded.set()
+
+    async def _report_extension_loads(self) -> None:
+        """Log and send to Sentry the timeline of the extensions' loading, once they have all been loaded."""
+        await self._extensions_loaded.wait()
+        total = time.perf_counter() - self._extension_loads_start
+        loads = sorted(self._extension_loads.values(), key=lambda load: load.started_at)
+        self._extension_loads = None
+
+        timeline = "\n".join(
+            f"{load.started_at:>7.2f}s {load.finished_at - load.started_at:>7.2f}s  {load.name}"
+            + (" (failed)" if load.failed else "")
+            for load in loads
+        )
+        log.info(f"Loaded {len(loads)} extensions in {total:.2f}s. Start time and duration of each:\n{timeline}")
+
+        # Spans can only be recorded with absolute timestamps, so the monotonic offsets are converted.
+        wall_start = time.time() - total
+        with start_transaction(op="startup", name="Load extensions", start_timestamp=wall_start) as transaction:
+            for load in loads:
+                span = transaction.start_child(
+                    op="extension-load", name=load.name, start_timestamp=wall_start + load.started_at
+                )
+                span.set_status("internal_error" if load.failed else "ok")
+                span.finish(end_timestamp=wall_start + load.finished_at)
 
     async def ping_services(self) -> None:
         """A helper to make sure all the services the bot relies on are available on startup."""
@@ -55,6 +152,11 @@ class Bot(BotBase):
         await super().setup_hook()
         await self.load_extensions(exts)
 
+    async def close(self) -> None:
+        """Send any buffered metrics before closing the statsd client along with everything else."""
+        self.metrics.flush()
+        await super().close()
+
     async def on_error(self, event: str, *args, **kwargs) -> None:
         """Log errors raised in event listeners rather than printing them to stderr."""
         e_val = exception()
@@ -370,6 +370,16 @@ class _VoiceGate(EnvConfig, env_prefix="voice_gate_"):
 VoiceGate = _VoiceGate()
 
 
+class _Snekbox(EnvConfig, env_prefix="snekbox_"):
+
+    max_concurrent_jobs: int = 4
+    # How long the results of identical jobs are reused for, in seconds. Set to 0 to disable the cache.
+    result_cache_ttl: int = 0
+
+
+Snekbox = _Snekbox()
+
+
 class _Branding(EnvConfig, env_prefix="branding_"):
 
     cycle_frequency: int = 3
@@ -448,6 +458,8 @@ class _BaseURLs(EnvConfig, env_prefix="urls_"):
 
     # Site
     site_api: str = "http://site.web.svc.cluster.local/api"
+    # Whether the site API accepts gzip-compressed request bodies, e.g. through a decompressing proxy.
+    site_api_gzip: bool = False
     paste_url: str = "https://paste.pythondiscord.com"
 
 
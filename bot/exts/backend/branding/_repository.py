@@ -1,6 +1,8 @@
+import asyncio
 import inspect
+import time
 import typing as t
-from datetime import UTC, date, datetime
+from datetime import UTC, date, datetime, timedelta
 
 import frontmatter
 from aiohttp import ClientResponse, ClientResponseError
@@ -28,6 +30,9 @@ ARBITRARY_YEAR = 2020
 # Format used to parse date strings after we inject `ARBITRARY_YEAR` at the end.
 DATE_FMT = "%B %d %Y"  # Ex: July 10 2020
 
+# Maximum number of concurrent requests into the branding repository.
+MAX_CONCURRENT_REQUESTS = 5
+
 log = get_logger(__name__)
 
 
@@ -117,15 +122,22 @@ class BrandingRepository:
     We work with the assumption that the branding repository checks for such conflicts and prevents them
     from reaching the main branch.
 
-    This class keeps no internal state. All `get_current_event` calls will result in GitHub API requests.
-    The caller is therefore responsible for being responsible and caching information to prevent API abuse.
+    Directory listings are requested conditionally through the bot's HTTP cache, so an unchanged listing costs
+    a 304 response, which doesn't count against the rate limit. Constructed events are kept in memory and keyed
+    by the SHA of their directory, which changes whenever anything inside it does. Unchanged events are therefore
+    reused without fetching their contents again.
 
-    Requests are made using the HTTP session looked up on the bot instance.
+    Requests are made using the HTTP session looked up on the bot instance, with at most `MAX_CONCURRENT_REQUESTS`
+    in flight at once.
     """
 
     def __init__(self, bot: Bot) -> None:
         self.bot = bot
 
+        self.api_calls = 0  # Total number of requests made into the branding repository.
+        self._request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._events: dict[tuple[str, str], Event] = {}  # Event directory path & SHA -> constructed event.
+
     @_retry_server_error
     async def fetch_directory(self, path: str, types: t.Container[str] = ("file", "dir")) -> dict[str, RemoteObject]:
         """
@@ -138,9 +150,17 @@ class BrandingRepository:
         full_url = f"{BRANDING_URL}/{path}"
         log.debug(f"Fetching directory from branding repository: '{full_url}'.")
 
-        async with self.bot.http_session.get(full_url, params=PARAMS, headers=HEADERS) as response:
-            _raise_for_status(response)
-            json_directory = await response.json()
+        async with self._request_semaphore:
+            self.api_calls += 1
+            try:
+                json_directory = await self.bot.http_cache.get(
+                    self.bot.http_session, full_url, "json", params=PARAMS, headers=HEADERS
+                )
+            except ClientResponseError as err:
+                log.trace(f"GitHub response status: {err.status}")
+                if err.status >= 500:
+                    raise GitHubServerError from err
+                raise
 
         return {file["name"]: RemoteObject(file) for file in json_directory if file["type"] in types}
 
@@ -153,9 +173,11 @@ class BrandingRepository:
         """
         log.debug(f"Fetching file from branding repository: '{download_url}'.")
 
-        async with self.bot.http_session.get(download_url, params=PARAMS, headers=HEADERS) as response:
-            _raise_for_status(response)
-            return await response.read()
+        async with self._request_semaphore:
+            self.api_calls += 1
+            async with self.bot.http_session.get(download_url, params=PARAMS, headers=HEADERS) as response:
+                _raise_for_status(response)
+                return await response.read()
 
     def parse_meta_file(self, raw_file: bytes) -> MetaFile:
         """
@@ -197,16 +219,17 @@ class BrandingRepository:
         if missing_assets:
             raise BrandingMisconfigurationError(f"Directory is missing following assets: {missing_assets}")
 
-        server_icons = await self.fetch_directory(contents["server_icons"].path, types=("file",))
-        banners = await self.fetch_directory(contents["banners"].path, types=("file",))
+        server_icons, banners, meta_bytes = await asyncio.gather(
+            self.fetch_directory(contents["server_icons"].path, types=("file",)),
+            self.fetch_directory(contents["banners"].path, types=("file",)),
+            self.fetch_file(contents["meta.md"].download_url),
+        )
 
         if len(server_icons) == 0:
             raise BrandingMisconfigurationError("Found no server icons!")
         if len(banners) == 0:
             raise BrandingMisconfigurationError("Found no server banners!")
 
-        meta_bytes = await self.fetch_file(contents["meta.md"].download_url)
-
         meta_file = self.parse_meta_file(meta_bytes)
 
         return Event(directory.path, meta_file, list(banners.values()), list(server_icons.values()))
@@ -215,20 +238,45 @@ class BrandingRepository:
         """
         Discover available events in the branding repository.
 
+        Event directories are read concurrently. Those whose SHA hasn't changed since the previous discovery
+        are reused without making any further requests.
+
         Propagate errors if an event fails to fetch or deserialize.
         """
         log.debug("Discovering events in branding repository.")
+        start = time.perf_counter()
+        api_calls = self.api_calls
 
         event_directories = await self.fetch_directory("events", types=("dir",))  # Skip files.
 
-        instances: list[Event] = []
-
-        for event_directory in event_directories.values():
-            log.trace(f"Reading event directory: '{event_directory.path}'.")
-            instance = await self.construct_event(event_directory)
-            instances.append(instance)
-
-        return instances
+        # Snapshot the known events, as another discovery may replace them while this one is fetching.
+        known_events = self._events
+        changed_directories = {
+            (directory.path, directory.sha): directory
+            for directory in event_directories.values()
+            if (directory.path, directory.sha) not in known_events
+        }
+        log.trace(f"Reading {len(changed_directories)} new or changed event directories.")
+        constructed = await asyncio.gather(*map(self.construct_event, changed_directories.values()))
+        known_events = known_events | dict(zip(changed_directories, constructed, strict=True))
+
+        # Only keep the current events, so that removed and changed events don't pile up.
+        self._events = {
+            (directory.path, directory.sha): known_events[directory.path, directory.sha]
+            for directory in event_directories.values()
+        }
+        events = list(self._events.values())
+
+        elapsed = time.perf_counter() - start
+        api_calls = self.api_calls - api_calls
+        log.info(
+            f"Discovered {len(events)} events in {elapsed:.2f}s with {api_calls} API calls "
+            f"({len(events) - len(changed_directories)} unchanged events reused)."
+        )
+        self.bot.metrics.timing("branding.discovery_time", timedelta(seconds=elapsed))
+        self.bot.metrics.gauge("branding.discovery_api_calls", api_calls)
+
+        return events
 
     async def get_current_event(self) -> tuple[Event, list[Event]]:
         """
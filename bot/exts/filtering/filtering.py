@@ -1081,7 +1081,7 @@ class Filtering(Cog):
         for filters in triggered_filters.values():
             for filter_ in filters:
                 if isinstance(filter_, UniqueFilter):
-                    self.bot.stats.incr(f"filters.{filter_.name}")
+                    self.bot.metrics.incr(f"filters.{filter_.name}")
 
     async def _recently_alerted_name(self, member: discord.Member) -> bool:
         """When it hasn't been `HOURS_BETWEEN_NICKNAME_ALERTS` since last alert, return False, otherwise True."""
@@ -1,4 +1,8 @@
 import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
 
 import discord
 from discord import Color, Embed, Message, RawReactionActionEvent, errors
@@ -14,6 +18,18 @@ from bot.utils.webhooks import send_webhook
 
 log = get_logger(__name__)
 
+# How long a message's duck tally is kept after it last changed.
+# A message ducked again after that has its tally rebuilt from its reactions.
+DUCK_TALLY_WINDOW = timedelta(hours=6)
+
+
+@dataclass
+class DuckTally:
+    """The staff members who reacted to a message with a duck, along with the duck emoji each of them used."""
+
+    ducks: dict[int, set[int | str]] = field(default_factory=dict)
+    updated_at: float = field(default_factory=time.monotonic)
+
 
 class DuckPond(Cog):
     """Relays messages to #duck-pond whenever a certain number of duck reactions have been achieved."""
@@ -22,9 +38,14 @@ class DuckPond(Cog):
         self.bot = bot
         self.webhook_id = constants.Webhooks.duck_pond.id
         self.webhook = None
-        self.ducked_messages = []
+        self.ducked_messages: set[int] = set()
         self.relay_lock = None
 
+        # Tallies of staff ducks by message ID, ordered from the least to the most recently updated.
+        self.duck_tallies: OrderedDict[int, DuckTally] = OrderedDict()
+        # Reactions to messages sent since then are all seen by the cog, so their tallies start out empty.
+        self.tallying_since = datetime.now(tz=UTC)
+
     @staticmethod
     def is_staff(member: MemberOrUser) -> bool:
         """Check if a specific member or user is staff."""
@@ -50,6 +71,63 @@ class DuckPond(Cog):
             return emoji == "🦆"
         return hasattr(emoji, "name") and emoji.name.startswith("ducky_")
 
+    @staticmethod
+    def _emoji_key(emoji: str | discord.PartialEmoji | discord.Emoji) -> int | str:
+        """Return a key identifying `emoji`, which is the same for reactions and reaction payloads."""
+        if isinstance(emoji, str):
+            return emoji
+        return emoji.id or emoji.name
+
+    def _is_human_staff(self, member: discord.Member | None) -> bool:
+        """Check if `member` is a staff member who isn't a bot."""
+        return member is not None and not member.bot and self.is_staff(member)
+
+    async def get_duck_tally(self, channel: discord.abc.Messageable, message_id: int) -> DuckTally:
+        """
+        Return the tally of staff ducks on the message with `message_id`, creating it if needed.
+
+        If the message may have been ducked before the tally started, it's built from the message's reactions.
+        Otherwise, it starts out empty without any requests being made.
+        """
+        self._expire_duck_tallies()
+
+        if (tally := self.duck_tallies.get(message_id)) is not None:
+            self.duck_tallies.move_to_end(message_id)
+            return tally
+
+        # A message younger than the window can't have had its tally expired.
+        created_at = discord.utils.snowflake_time(message_id)
+        if created_at < self.tallying_since or created_at < datetime.now(tz=UTC) - DUCK_TALLY_WINDOW:
+            log.trace(f"Building the duck tally of message {message_id} from its reactions.")
+            tally = await self._tally_reactions(await channel.fetch_message(message_id))
+        else:
+            tally = DuckTally()
+
+        # Another reaction may have created the tally while the reactions were being fetched.
+        return self.duck_tallies.setdefault(message_id, tally)
+
+    async def _tally_reactions(self, message: Message) -> DuckTally:
+        """Tally the staff ducks in the reactions of `message`."""
+        tally = DuckTally()
+        for reaction in message.reactions:
+            if not self._is_duck_emoji(reaction.emoji):
+                continue
+
+            async for user in reaction.users():
+                if self._is_human_staff(message.guild.get_member(user.id)):
+                    tally.ducks.setdefault(user.id, set()).add(self._emoji_key(reaction.emoji))
+
+        return tally
+
+    def _expire_duck_tallies(self) -> None:
+        """Remove the tallies which weren't updated within the window."""
+        expired_before = time.monotonic() - DUCK_TALLY_WINDOW.total_seconds()
+        while self.duck_tallies:
+            message_id, tally = next(iter(self.duck_tallies.items()))
+            if tally.updated_at >= expired_before:
+                break
+            del self.duck_tallies[message_id]
+
     async def count_ducks(self, message: Message) -> int:
         """
         Count the number of ducks in the reactions of a specific message.
@@ -158,44 +236,59 @@ class DuckPond(Cog):
         if not channel.permissions_for(helper_role).view_channel:
             return
 
-        try:
-            message = await channel.fetch_message(payload.message_id)
-        except discord.NotFound:
-            return  # Message was deleted.
-
-        member = discord.utils.get(message.guild.members, id=payload.user_id)
-        if not member:
-            return  # Member left or wasn't in the cache.
-
         # Was the message sent by a human staff member?
-        if not self.is_staff(message.author) or message.author.bot:
+        if not self._is_human_staff(guild.get_member(payload.message_author_id)):
             return
 
         # Is the reactor a human staff member?
-        if not self.is_staff(member) or member.bot:
+        if not self._is_human_staff(payload.member):
             return
 
         # Time to count our ducks!
-        duck_count = await self.count_ducks(message)
+        try:
+            tally = await self.get_duck_tally(channel, payload.message_id)
+        except discord.NotFound:
+            return  # Message was deleted.
+        tally.ducks.setdefault(payload.user_id, set()).add(self._emoji_key(payload.emoji))
+        tally.updated_at = time.monotonic()
 
         # If we've got more than the required amount of ducks, send the message to the duck_pond.
-        if duck_count >= constants.DuckPond.threshold and message.id not in self.ducked_messages:
-            self.ducked_messages.append(message.id)
+        if len(tally.ducks) >= constants.DuckPond.threshold and payload.message_id not in self.ducked_messages:
+            self.ducked_messages.add(payload.message_id)
+            message = discord.utils.get(self.bot.cached_messages, id=payload.message_id)
+            try:
+                message = message or await channel.fetch_message(payload.message_id)
+            except discord.NotFound:
+                return  # Message was deleted.
             await self.locked_relay(message)
 
     @Cog.listener()
     async def on_raw_reaction_remove(self, payload: RawReactionActionEvent) -> None:
-        """Ensure that people don't remove the green checkmark from duck ponded messages."""
+        """Update the duck tallies, and ensure that people don't remove the green checkmark from ducked messages."""
         # Ignore other guilds and DMs.
         if payload.guild_id != constants.Guild.id:
             return
 
-        channel = discord.utils.get(self.bot.get_all_channels(), id=payload.channel_id)
+        if self._payload_has_duckpond_emoji(payload.emoji):
+            tally = self.duck_tallies.get(payload.message_id)
+            if tally is not None and (emoji := tally.ducks.get(payload.user_id)) is not None:
+                emoji.discard(self._emoji_key(payload.emoji))
+                if not emoji:
+                    del tally.ducks[payload.user_id]
+                tally.updated_at = time.monotonic()
+            return
+
+        guild = self.bot.get_guild(payload.guild_id)
+        channel = guild and guild.get_channel_or_thread(payload.channel_id)
         if channel is None:
             return
 
         # Prevent the green checkmark from being removed
         if payload.emoji.name == "✅":
+            if payload.message_id in self.ducked_messages:
+                await channel.get_partial_message(payload.message_id).add_reaction("✅")
+                return
+
             message = await channel.fetch_message(payload.message_id)
             duck_count = await self.count_ducks(message)
             if duck_count >= constants.DuckPond.threshold:
@@ -3,6 +3,7 @@ import datetime
 import difflib
 import json
 import random
+from bisect import bisect_left, bisect_right
 from functools import partial
 
 from discord import ButtonStyle, Colour, Embed, HTTPException, Interaction
@@ -10,6 +11,7 @@ from discord.ext import tasks
 from discord.ext.commands import Cog, Context, group, has_any_role
 from discord.ui import Button, View
 from pydis_core.site_api import ResponseCodeError
+from rapidfuzz import fuzz, process
 
 from bot.bot import Bot
 from bot.constants import Bot as BotConfig, Channels, MODERATION_ROLES, NEGATIVE_REPLIES
@@ -24,14 +26,91 @@ OTN_FORMATTER = "ot{number}-{name}"
 OT_NUMBER_INDEX = 2
 NAME_START_INDEX = 4
 
+# The number of close matches returned by a search, in addition to the names containing the query.
+SEARCH_CLOSE_MATCHES = 10
+# The minimum similarity, out of 100, of a name to the query for it to be a close match.
+SEARCH_CUTOFF = 70
+
 log = get_logger(__name__)
 
 
+class OffTopicNameIndex:
+    """
+    The off-topic names, normalised once for searching.
+
+    The names are kept as their normalised forms, mapped to the names as they are stored on the site.
+    The normalised names are also joined into a single string, so that finding the names which contain
+    a query is a single scan in C, rather than a loop over the names.
+    """
+
+    def __init__(self, names: list[str]):
+        self.names = {OffTopicNameIndex.normalise(name): name for name in names}
+
+        # Sorted by length, so that only the names long enough to be similar to a query have to be scored.
+        self._keys = sorted(self.names, key=len)
+        self._lengths = [len(key) for key in self._keys]
+        self._text = "\n".join(self._keys)
+
+        # The offset in `_text` at which each of the normalised names starts.
+        self._starts = []
+        offset = 0
+        for key in self._keys:
+            self._starts.append(offset)
+            offset += len(key) + 1
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    @staticmethod
+    def normalise(name: str) -> str:
+        """Return the form of `name` used for searching."""
+        return OffTopicName.translate_name(name, from_unicode=False).lower()
+
+    def containing(self, query: str) -> set[str]:
+        """Return the normalised names which contain `query`."""
+        matches = set()
+        position = self._text.find(query)
+        while position != -1:
+            index = bisect_right(self._starts, position) - 1
+            key = self._keys[index]
+            matches.add(key)
+            # Continue after the end of the matching name, as it's only needed once.
+            position = self._text.find(query, self._starts[index] + len(key) + 1)
+        return matches
+
+    def similar(self, query: str) -> list[str]:
+        """Return up to `SEARCH_CLOSE_MATCHES` normalised names which are similar to `query`."""
+        # The ratio of two strings is at most 200 * shorter / (shorter + longer), which bounds the lengths
+        # of the names that can reach the cutoff.
+        shortest = -(-SEARCH_CUTOFF * len(query) // (200 - SEARCH_CUTOFF))
+        longest = (200 - SEARCH_CUTOFF) * len(query) // SEARCH_CUTOFF
+        candidates = self._keys[bisect_left(self._lengths, shortest):bisect_right(self._lengths, longest)]
+
+        matches = process.extract(
+            query,
+            candidates,
+            scorer=fuzz.ratio,
+            processor=None,
+            limit=SEARCH_CLOSE_MATCHES,
+            score_cutoff=SEARCH_CUTOFF,
+        )
+        return [key for key, _score, _index in matches]
+
+    def search(self, query: str) -> list[str]:
+        """Return the names which contain `query` or are similar to it, sorted."""
+        query = self.normalise(query)
+        matches = self.containing(query)
+        matches.update(self.similar(query))
+        return sorted(self.names[key] for key in matches)
+
+
 class OffTopicNames(Cog):
     """Commands related to managing the off-topic category channel names."""
 
     def __init__(self, bot: Bot):
         self.bot = bot
+        self._name_index: OffTopicNameIndex | None = None
+        self._name_index_lock = asyncio.Lock()
 
         # What errors to handle and restart the task using an exponential back-off algorithm
         self.update_names.add_exception_type(ResponseCodeError)
@@ -79,12 +158,26 @@ class OffTopicNames(Cog):
             f" {channel_0_name}, {channel_1_name} and {channel_2_name}"
         )
 
+    async def get_name_index(self) -> OffTopicNameIndex:
+        """Return the index of all off-topic names, fetching the names from the site if they aren't indexed."""
+        async with self._name_index_lock:
+            if self._name_index is None:
+                names = await self.bot.api_client.get("bot/off-topic-channel-names")
+                self._name_index = OffTopicNameIndex(names)
+                log.trace(f"Indexed {len(self._name_index)} off-topic names.")
+            return self._name_index
+
+    def invalidate_name_index(self) -> None:
+        """Discard the index of off-topic names, so that it's rebuilt with the site's names on the next search."""
+        self._name_index = None
+
     async def toggle_ot_name_activity(self, ctx: Context, name: str, active: bool) -> None:
         """Toggle active attribute for an off-topic name."""
         data = {
             "active": active
         }
         await self.bot.api_client.patch(f"bot/off-topic-channel-names/{name}", data=data)
+        self.invalidate_name_index()
         await ctx.send(f"Off-topic name `{name}` has been {'activated' if active else 'deactivated'}.")
 
     async def list_ot_names(self, ctx: Context, active: bool = True) -> None:
@@ -139,6 +232,7 @@ class OffTopicNames(Cog):
     async def _add_name(self, ctx: Context, name: str) -> None:
         """Adds an off-topic channel name to the site storage."""
         await self.bot.api_client.post("bot/off-topic-channel-names", params={"name": name})
+        self.invalidate_name_index()
 
         log.info(f"{ctx.author} added the off-topic channel name '{name}'")
         await ctx.send(f":ok_hand: Added `{name}` to the names list.")
@@ -148,6 +242,7 @@ class OffTopicNames(Cog):
     async def delete_command(self, ctx: Context, *, name: OffTopicName) -> None:
         """Removes a off-topic name from the rotation."""
         await self.bot.api_client.delete(f"bot/off-topic-channel-names/{name}")
+        self.invalidate_name_index()
 
         log.info(f"{ctx.author} deleted the off-topic channel name '{name}'")
         await ctx.send(f":ok_hand: Removed `{name}` from the names list.")
@@ -282,20 +377,8 @@ class OffTopicNames(Cog):
     @has_any_role(*MODERATION_ROLES)
     async def search_command(self, ctx: Context, *, query: OffTopicName) -> None:
         """Search for an off-topic name."""
-        query = OffTopicName.translate_name(query, from_unicode=False).lower()
-
-        # Map normalized names to returned names for search purposes
-        result = {
-            OffTopicName.translate_name(name, from_unicode=False).lower(): name
-            for name in await self.bot.api_client.get("bot/off-topic-channel-names")
-        }
-
-        # Search normalized keys
-        in_matches = {name for name in result if query in name}
-        close_matches = difflib.get_close_matches(query, result.keys(), n=10, cutoff=0.70)
-
-        # Send Results
-        lines = sorted(f"- {result[name]}" for name in in_matches.union(close_matches))
+        index = await self.get_name_index()
+        lines = [f"- {name}" for name in index.search(query)]
         embed = Embed(
             title="Query results",
             colour=Colour.blue()
@@ -2,4 +2,13 @@ from async_rediscache import RedisCache
 
 # Stores posts that have had a non-claimant, non-bot, reply.
 # Currently only used to determine whether the post was answered or not when collecting stats.
+# The value is the POSIX timestamp of the most recent non-claimant message.
 posts_with_non_claimant_messages = RedisCache(namespace="HelpChannels.posts_with_non_claimant_messages")
+
+# Stores the POSIX timestamp of the most recent message sent in each open post.
+# Used to determine when a post becomes idle without having to read its history.
+posts_last_message_times = RedisCache(namespace="HelpChannels.posts_last_message_times")
+
+# Stores the POSIX timestamp of the most recent message the claimant sent in each open post,
+# ignoring the starter message. Used to determine whether the claimant followed up on their post.
+posts_last_claimant_message_times = RedisCache(namespace="HelpChannels.posts_last_claimant_message_times")
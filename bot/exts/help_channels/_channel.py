@@ -8,7 +8,7 @@ from pydis_core.utils.channel import get_or_fetch_channel
 
 import bot
 from bot import constants
-from bot.exts.help_channels import _stats
+from bot.exts.help_channels import _caches, _stats
 from bot.log import get_logger
 
 log = get_logger(__name__)
@@ -34,6 +34,15 @@ To maximize your chances of getting a response, check out this guide on [asking
 """
 CLOSED_POST_ICON_URL = f"{BRANDING_REPO_RAW_URL}/main/icons/zzz/zzz-dist.png"
 
+# IDs of the posts whose every message since the bot started has been tracked, either because they were
+# opened since then or because their history has been read. The tracked activity of other posts may be missing
+# messages sent while the bot was offline, such as a claimant's follow-up, so it can't be relied on.
+_fully_tracked_posts: set[int] = set()
+
+# The ID of the latest message sent by a bot in each fully tracked post, such as the opener message.
+# Bot messages aren't activity, so a post's last message being one of them doesn't make its tracked activity outdated.
+_last_bot_messages: dict[int, int] = {}
+
 
 def is_help_forum_post(channel: discord.abc.GuildChannel) -> bool:
     """Return True if `channel` is a post in the help forum."""
@@ -65,11 +74,7 @@ async def _close_help_post(
     # Include a ping in the close message if no one else engages, to encourage them
     # to read the guide for asking better questions
     if closing_reason == _stats.ClosingReason.INACTIVE and closed_post.owner is not None:
-        participant_ids = {
-            message.author.id async for message in closed_post.history(limit=100, oldest_first=False)
-            if not message.author.bot
-        }
-        if participant_ids == {closed_post.owner_id}:
+        if not await _caches.posts_with_non_claimant_messages.get(closed_post.id):
             message = closed_post.owner.mention
 
     try:
@@ -88,6 +93,7 @@ async def _close_help_post(
 
     _stats.report_post_count()
     await _stats.report_complete_session(closed_post, closing_reason)
+    await _clear_post_activity(closed_post.id)
 
 
 async def send_opened_post_message(post: discord.Thread) -> None:
@@ -98,7 +104,8 @@ async def send_opened_post_message(post: discord.Thread) -> None:
     )
     embed.set_author(name="Python help channel opened", icon_url=NEW_POST_ICON_URL)
     embed.set_footer(text=NEW_POST_FOOTER)
-    await post.send(embed=embed, content=post.owner.mention)
+    message = await post.send(embed=embed, content=post.owner.mention)
+    _last_bot_messages[post.id] = message.id
 
 
 async def help_post_opened(
@@ -108,7 +115,8 @@ async def help_post_opened(
 ) -> None:
     """Apply new post logic to a new help forum post."""
     _stats.report_post_count()
-    bot.instance.stats.incr("help.claimed")
+    bot.instance.metrics.incr("help.claimed")
+    _fully_tracked_posts.add(opened_post.id)
 
     if not isinstance(opened_post.owner, discord.Member):
         log.debug(f"{opened_post.owner_id} isn't a member. Closing post.")
@@ -158,34 +166,128 @@ async def help_post_deleted(deleted_post_event: discord.RawThreadDeleteEvent) ->
         # If the post is in the bot's cache, and it was not archived before deleting,
         # report a complete session.
         await _stats.report_complete_session(cached_post, _stats.ClosingReason.DELETED)
+    await _clear_post_activity(deleted_post_event.thread_id)
 
 
-async def get_closing_time(post: discord.Thread) -> tuple[arrow.Arrow, _stats.ClosingReason]:
+async def record_post_activity(message: discord.Message) -> None:
     """
-    Return the time at which the given help `post` should be closed along with the reason.
+    Record the activity of `message`, sent in a help post, to be used when determining idleness.
 
-    The time is calculated by first checking if the opening message is deleted.
-    If it is, then get the last 100 messages (the most that can be fetched in one API call).
-    If less than 100 message are returned, and none are from the post owner, then assume the poster
-        has sent no further messages and close deleted_idle_minutes after the post creation time.
+    Messages sent by bots aren't activity, including the bot's own closing message, which would otherwise
+    be recorded after the activity of the closed post was cleared. Only their IDs are kept for fully tracked posts.
+    """
+    post = message.channel
+    if message.author.bot:
+        if post.id in _fully_tracked_posts:
+            _last_bot_messages[post.id] = message.id
+        return
 
-    Otherwise, use the most recent message's create_at date and add `idle_minutes_claimant`.
+    timestamp = message.created_at.timestamp()
+
+    await _caches.posts_last_message_times.set(post.id, timestamp)
+
+    if message.author.id != post.owner_id:
+        await _caches.posts_with_non_claimant_messages.set(post.id, timestamp)
+    elif message.id != post.id:
+        # The starter message is always sent by the claimant, so it doesn't count as a follow-up.
+        await _caches.posts_last_claimant_message_times.set(post.id, timestamp)
+
+
+async def _clear_post_activity(post_id: int) -> None:
+    """Remove the tracked activity of the post with the given ID, as it's no longer needed once closed."""
+    _fully_tracked_posts.discard(post_id)
+    _last_bot_messages.pop(post_id, None)
+    await _caches.posts_last_message_times.delete(post_id)
+    await _caches.posts_last_claimant_message_times.delete(post_id)
+
+
+async def _get_tracked_activity(post: discord.Thread) -> tuple[arrow.Arrow, bool] | None:
     """
-    try:
-        starter_message = post.starter_message or await post.fetch_message(post.id)
-    except discord.NotFound:
-        starter_message = None
+    Return the time of the last message in `post` and whether the claimant followed up, as tracked from events.
+
+    None is returned if no activity was tracked for the post, or if the tracked activity may be outdated.
+    The latter is the case for posts which weren't fully tracked since the bot started, as messages may have been
+    sent while it was offline, and for posts whose `last_message_id`, which is kept up to date by the gateway,
+    is newer than the tracked time and isn't that of a bot message.
+    """
+    if post.id not in _fully_tracked_posts:
+        log.trace(f"Activity of #{post} ({post.id}) wasn't fully tracked since the bot started.")
+        return None
+
+    last_message_timestamp = await _caches.posts_last_message_times.get(post.id)
+    if last_message_timestamp is None:
+        return None
+
+    if post.last_message_id is not None and post.last_message_id != _last_bot_messages.get(post.id):
+        if discord.utils.snowflake_time(post.last_message_id).timestamp() > last_message_timestamp:
+            log.trace(f"Tracked activity of #{post} ({post.id}) is outdated.")
+            return None
 
+    claimant_followed_up = await _caches.posts_last_claimant_message_times.contains(post.id)
+    return arrow.Arrow.utcfromtimestamp(last_message_timestamp), claimant_followed_up
+
+
+async def _get_activity_from_history(post: discord.Thread) -> tuple[arrow.Arrow, bool, bool]:
+    """
+    Return the post's last message time, whether the claimant followed up, and if that could be determined.
+
+    The last 100 messages (the most that can be fetched in one API call) of the post are read.
+    If 100 messages are returned, then it can't be determined whether the claimant has followed up.
+    Like when tracking activity from events, messages sent by bots are ignored, falling back to the post's creation.
+    The tracked activity of the post is refreshed with the result, and relied on from then on if it's complete.
+    """
     last_100_messages = [message async for message in post.history(limit=100, oldest_first=False)]
+    user_messages = [message for message in last_100_messages if not message.author.bot]
+
+    claimant_messages = [
+        message for message in user_messages
+        if message.author.id == post.owner_id and message.id != post.id
+    ]
+    last_message_time = arrow.Arrow.fromdatetime(user_messages[0].created_at if user_messages else post.created_at)
+    known_follow_up = len(last_100_messages) < 100
+
+    await _caches.posts_last_message_times.set(post.id, last_message_time.timestamp())
+    if claimant_messages:
+        await _caches.posts_last_claimant_message_times.set(post.id, claimant_messages[0].created_at.timestamp())
+    if claimant_messages or known_follow_up:
+        _fully_tracked_posts.add(post.id)
+        if last_100_messages and last_100_messages[0].author.bot:
+            _last_bot_messages[post.id] = last_100_messages[0].id
+
+    return last_message_time, bool(claimant_messages), known_follow_up
+
 
-    if starter_message is None and len(last_100_messages) < 100:
-        if not discord.utils.get(last_100_messages, author__id=post.owner_id):
+async def get_closing_time(post: discord.Thread) -> tuple[arrow.Arrow, _stats.ClosingReason]:
+    """
+    Return the time at which the given help `post` should be closed along with the reason.
+
+    The post's activity is taken from what was tracked from message events. If nothing was tracked, or
+    the tracked activity is outdated (e.g. after a restart), the post's recent history is read instead.
+
+    If the poster has sent no further messages since opening the post, and the opening message is deleted,
+    then close deleted_idle_minutes after the post creation time.
+
+    Otherwise, use the most recent message's create_at date and add `idle_minutes_claimant`.
+    """
+    tracked_activity = await _get_tracked_activity(post)
+    if tracked_activity is not None:
+        last_message_time, claimant_followed_up = tracked_activity
+        known_follow_up = True
+    else:
+        last_message_time, claimant_followed_up, known_follow_up = await _get_activity_from_history(post)
+
+    if known_follow_up and not claimant_followed_up:
+        try:
+            starter_message = post.starter_message or await post.fetch_message(post.id)
+        except discord.NotFound:
+            starter_message = None
+
+        if starter_message is None:
             time = arrow.Arrow.fromdatetime(post.created_at)
             time += timedelta(minutes=constants.HelpChannels.deleted_idle_minutes)
             return time, _stats.ClosingReason.DELETED
 
-    time = arrow.Arrow.fromdatetime(last_100_messages[0].created_at)
-    time += timedelta(minutes=constants.HelpChannels.idle_minutes)
+    time = last_message_time + timedelta(minutes=constants.HelpChannels.idle_minutes)
     return time, _stats.ClosingReason.INACTIVE
 
 
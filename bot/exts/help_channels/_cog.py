@@ -8,7 +8,7 @@ from pydis_core.utils import scheduling
 
 from bot import constants
 from bot.bot import Bot
-from bot.exts.help_channels import _caches, _channel
+from bot.exts.help_channels import _channel
 from bot.log import get_logger
 from bot.utils.checks import has_any_role_check
 
@@ -56,13 +56,13 @@ class HelpForum(commands.Cog):
 
         if ctx.author.id == ctx.channel.owner_id:
             log.trace(f"{ctx.author} is the help channel claimant, passing the check for dormant.")
-            self.bot.stats.incr("help.dormant_invoke.claimant")
+            self.bot.metrics.incr("help.dormant_invoke.claimant")
             return True
 
         log.trace(f"{ctx.author} is not the help channel claimant, checking roles.")
         has_role = await commands.has_any_role(*constants.HelpChannels.cmd_whitelist).predicate(ctx)
         if has_role:
-            self.bot.stats.incr("help.dormant_invoke.staff")
+            self.bot.metrics.incr("help.dormant_invoke.staff")
         return has_role
 
     @commands.group(name="help-forum", aliases=("hf",))
@@ -137,12 +137,11 @@ class HelpForum(commands.Cog):
 
     @commands.Cog.listener("on_message")
     async def new_post_message_listener(self, message: discord.Message) -> None:
-        """Defer application of new message logic for messages in the help forum to the _message helper."""
+        """Defer application of new message logic for messages in the help forum to the _channel helper."""
         if not _channel.is_help_forum_post(message.channel):
             return
 
-        if not message.author.bot and message.author.id != message.channel.owner_id:
-            await _caches.posts_with_non_claimant_messages.set(message.channel.id, "sentinel")
+        await _channel.record_post_activity(message)
 
     @commands.Cog.listener()
     async def on_member_remove(self, member: discord.Member) -> None:
@@ -1,7 +1,9 @@
+import asyncio
 import logging
 import re
 import textwrap
-from typing import Any
+from collections.abc import Awaitable, Callable
+from typing import Any, Literal
 from urllib.parse import quote_plus
 
 import discord
@@ -68,14 +70,13 @@ class CodeSnippets(Cog):
             (PYDIS_PASTEBIN_RE, self._fetch_pastebin_snippets),
         ]
 
-    async def _fetch_response(self, url: str, response_format: str, **kwargs) -> Any:
-        """Makes http requests using aiohttp."""
-        async with self.bot.http_session.get(url, raise_for_status=True, **kwargs) as response:
-            if response_format == "text":
-                return await response.text()
-            if response_format == "json":
-                return await response.json()
-            return None
+    async def _fetch_response(self, url: str, response_format: Literal["text", "json"], **kwargs) -> Any:
+        """
+        Makes http requests using aiohttp.
+
+        Responses are cached and revalidated with conditional requests, which saves on API rate limits.
+        """
+        return await self.bot.http_cache.get(self.bot.http_session, url, response_format, **kwargs)
 
     def _find_ref(self, path: str, refs: tuple) -> tuple:
         """Loops through all branches and tags to find the required ref."""
@@ -98,12 +99,10 @@ class CodeSnippets(Cog):
     ) -> str:
         """Fetches a snippet from a GitHub repo."""
         # Search the GitHub API for the specified branch
-        branches = await self._fetch_response(
-            f"https://api.github.com/repos/{repo}/branches",
-            "json",
-            headers=GITHUB_HEADERS
+        branches, tags = await asyncio.gather(
+            self._fetch_response(f"https://api.github.com/repos/{repo}/branches", "json", headers=GITHUB_HEADERS),
+            self._fetch_response(f"https://api.github.com/repos/{repo}/tags", "json", headers=GITHUB_HEADERS),
         )
-        tags = await self._fetch_response(f"https://api.github.com/repos/{repo}/tags", "json", headers=GITHUB_HEADERS)
         refs = branches + tags
         ref, file_path = self._find_ref(path, refs)
 
@@ -150,11 +149,10 @@ class CodeSnippets(Cog):
         enc_repo = quote_plus(repo)
 
         # Searches the GitLab API for the specified branch
-        branches = await self._fetch_response(
-            f"https://gitlab.com/api/v4/projects/{enc_repo}/repository/branches",
-            "json"
+        branches, tags = await asyncio.gather(
+            self._fetch_response(f"https://gitlab.com/api/v4/projects/{enc_repo}/repository/branches", "json"),
+            self._fetch_response(f"https://gitlab.com/api/v4/projects/{enc_repo}/repository/tags", "json"),
         )
-        tags = await self._fetch_response(f"https://gitlab.com/api/v4/projects/{enc_repo}/repository/tags", "json")
         refs = branches + tags
         ref, file_path = self._find_ref(path, refs)
         enc_ref = quote_plus(ref)
@@ -269,9 +267,27 @@ class CodeSnippets(Cog):
         # Returns an empty codeblock if the snippet is empty
         return f"{ret}``` ```"
 
+    async def _fetch_snippets(self, match: re.Match, handler: Callable[..., Awaitable]) -> list[tuple[int, str]]:
+        """Return the snippets for the URL `match` using `handler`, paired with the match index."""
+        try:
+            result = await handler(**match.groupdict())
+        except ClientResponseError as error:
+            error_message = error.message
+            log.log(
+                logging.DEBUG if error.status == 404 else logging.ERROR,
+                f"Failed to fetch code snippet from {match[0]!r}: {error.status} "
+                f"{error_message} for GET {error.request_info.real_url.human_repr()}"
+            )
+            return []
+
+        if isinstance(result, list):
+            # The handler returned multiple snippets (currently only possible with our pastebin)
+            return [(match.start(), snippet) for snippet in result]
+        return [(match.start(), result)]
+
     async def _parse_snippets(self, content: str) -> str:
         """Parse message content and return a string with a code block for each URL found."""
-        all_snippets = []
+        fetches = []
 
         for pattern, handler in self.pattern_handlers:
             for match in pattern.finditer(content):
@@ -289,22 +305,10 @@ class CodeSnippets(Cog):
                             unsanitized
                         )
                         continue
-                try:
-                    result = await handler(**match.groupdict())
-                except ClientResponseError as error:
-                    error_message = error.message
-                    log.log(
-                        logging.DEBUG if error.status == 404 else logging.ERROR,
-                        f"Failed to fetch code snippet from {match[0]!r}: {error.status} "
-                        f"{error_message} for GET {error.request_info.real_url.human_repr()}"
-                    )
-                    continue
-
-                if isinstance(result, list):
-                    # The handler returned multiple snippets (currently only possible with our pastebin)
-                    all_snippets.extend((match.start(), snippet) for snippet in result)
-                else:
-                    all_snippets.append((match.start(), result))
+                fetches.append(self._fetch_snippets(match, handler))
+
+        # Fetch the snippets of all URLs concurrently
+        all_snippets = [snippet for snippets in await asyncio.gather(*fetches) for snippet in snippets]
 
         # Sort the list of snippets by ONLY their match index
         all_snippets.sort(key=lambda item: item[0])
@@ -1,4 +1,7 @@
+import asyncio
+import hashlib
 import time
+from collections import OrderedDict
 
 import discord
 from discord import Message, RawMessageUpdateEvent
@@ -11,12 +14,18 @@ from bot.exts.filtering._filters.unique.discord_token import DiscordTokenFilter
 from bot.exts.filtering._filters.unique.webhook import WEBHOOK_URL_RE
 from bot.exts.help_channels._channel import is_help_forum_post
 from bot.exts.info.codeblock._instructions import get_instructions
+from bot.exts.info.codeblock._parsing import looks_like_prose
 from bot.log import get_logger
 from bot.utils import has_lines
 from bot.utils.messages import wait_for_deletion
 
 log = get_logger(__name__)
 
+# Messages longer than this are parsed in a thread, so that their parsing doesn't block the event loop for long.
+PARSE_IN_THREAD_LENGTH = 1000
+# The number of messages for which the instructions are kept, so that re-checking an unchanged edit is cheap.
+INSTRUCTIONS_CACHE_SIZE = 128
+
 
 class CodeBlockCog(Cog, name="Code Block"):
     """
@@ -60,6 +69,9 @@ class CodeBlockCog(Cog, name="Code Block"):
         # Maps users' messages to the messages the bot sent with instructions.
         self.codeblock_message_ids = {}
 
+        # Maps hashes of messages' contents to their instructions, in least recently used order.
+        self.instructions_cache: OrderedDict[bytes, str | None] = OrderedDict()
+
     @staticmethod
     def create_embed(instructions: str) -> discord.Embed:
         """Return an embed which displays code block formatting `instructions`."""
@@ -81,6 +93,37 @@ class CodeBlockCog(Cog, name="Code Block"):
             log.debug("Could not find instructions message; it was probably deleted.")
             return None
 
+    async def get_instructions(self, content: str) -> str | None:
+        """
+        Return code block formatting instructions for a message's `content`, or None if nothing is wrong.
+
+        The detection is staged, so that the common case of a message which is plain prose is cheap:
+
+        1. A lexical prefilter discards messages which can't have code blocks or Python code
+        2. The instructions of recently parsed contents are cached, for edits which didn't change them
+        3. Long contents are parsed in a thread, rather than on the event loop
+        """
+        if looks_like_prose(content):
+            log.trace("Skipping code block parsing: content looks like prose.")
+            return None
+
+        key = hashlib.blake2b(content.encode(errors="surrogatepass"), digest_size=16).digest()
+        if key in self.instructions_cache:
+            log.trace("Using cached code block instructions.")
+            self.instructions_cache.move_to_end(key)
+            return self.instructions_cache[key]
+
+        if len(content) > PARSE_IN_THREAD_LENGTH:
+            instructions = await asyncio.to_thread(get_instructions, content)
+        else:
+            instructions = get_instructions(content)
+
+        self.instructions_cache[key] = instructions
+        if len(self.instructions_cache) > INSTRUCTIONS_CACHE_SIZE:
+            self.instructions_cache.popitem(last=False)
+
+        return instructions
+
     def is_on_cooldown(self, channel: discord.TextChannel) -> bool:
         """
         Return True if an embed was sent too recently for `channel`.
@@ -149,7 +192,7 @@ class CodeBlockCog(Cog, name="Code Block"):
             log.trace(f"Skipping code block detection of {msg.id}: #{msg.channel} is on cooldown.")
             return
 
-        instructions = get_instructions(msg.content)
+        instructions = await self.get_instructions(msg.content)
         if instructions:
             await self.send_instructions(msg, instructions)
 
@@ -170,7 +213,7 @@ class CodeBlockCog(Cog, name="Code Block"):
 
         # Parse the message to see if the code blocks have been fixed.
         content = payload.data.get("content")
-        instructions = get_instructions(content)
+        instructions = await self.get_instructions(content)
 
         bot_message = await self.get_sent_instructions(payload)
         if not bot_message:
@@ -30,6 +30,21 @@ _TICKS = {
     "\u3003",  # VERTICAL KANA REPEAT MARK UPPER HALF
 }
 
+# Characters without which a message can't contain a statement other than an expression, outside of the
+# simple statements below: assignments, annotations, and the headers of compound statements all need one of them.
+# Null bytes are included since they're removed before parsing, which could move a keyword to the start of a line.
+_STATEMENT_CHARACTERS = ("=", ":", ";", "\x00")
+
+# Simple statements, and REPL prompts, which need none of the above characters, at the start of a line.
+# Lines may be split by any of the separators of `str.splitlines`, which is used to find REPL lines.
+_RE_STATEMENT_START = re.compile(
+    r"""
+    (?:^|[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029])\s*
+    (?:>>>|\.\.\.|(?:import|from|return|pass|break|continue|raise|del|global|nonlocal|assert)\b)
+    """,
+    re.MULTILINE | re.VERBOSE
+)
+
 _RE_PYTHON_REPL = re.compile(r"^(>>>|\.\.\.)( |$)")
 _RE_IPYTHON_REPL = re.compile(r"^((In|Out) \[\d+\]: |\s*\.{3,}: ?)")
 
@@ -78,6 +93,30 @@ class BadLanguage(NamedTuple):
     has_terminal_newline: bool
 
 
+def looks_like_prose(message: str) -> bool:
+    """
+    Return True if `message` certainly doesn't need code block instructions, using only cheap lexical checks.
+
+    This is a conservative prefilter for the full parsing: a False result doesn't mean the message contains code.
+    A message is prose if:
+
+    1. It has no backticks, so it has no code block which could be valid or missing a language
+    2. It has no other tick repeated, or directly followed by a Python language, so none of its blocks are faulty
+    3. It has no characters or keywords which could start a statement, so it isn't Python code
+    """
+    if BACKTICK in message:
+        return False
+
+    for tick in _TICKS:
+        if tick in message and (tick * 2 in message or f"{tick}py" in message):
+            return False
+
+    if any(character in message for character in _STATEMENT_CHARACTERS):
+        return False
+
+    return not _RE_STATEMENT_START.search(message)
+
+
 def find_faulty_code_blocks(message: str) -> Sequence[CodeBlock] | None:
     """
     Find and return all faulty Markdown code blocks in the `message`.
@@ -24,8 +24,9 @@ from bot.errors import NonExistentRoleError
 from bot.log import get_logger
 from bot.pagination import LinePaginator
 from bot.utils import time
-from bot.utils.channel import is_mod_channel, is_staff_channel
+from bot.utils.channel import is_mod_channel
 from bot.utils.checks import cooldown_with_role_bypass, has_no_roles_check, in_whitelist_check
+from bot.utils.guild_stats import GuildStatistics, channel_type_key
 from bot.utils.messages import send_denial
 
 log = get_logger(__name__)
@@ -37,6 +38,7 @@ DEFAULT_RULES_DESCRIPTION = (
 )
 
 if TYPE_CHECKING:
+    from bot.exts.info.stats import Stats
     from bot.exts.moderation.defcon import Defcon
     from bot.exts.moderation.watchchannels.bigbrother import BigBrother
     from bot.exts.recruitment.talentpool._cog import TalentPool
@@ -48,41 +50,62 @@ class Information(Cog):
     def __init__(self, bot: Bot):
         self.bot = bot
 
+    def get_guild_stats(self) -> GuildStatistics | None:
+        """Return the guild statistics maintained by the Stats cog, if they're available."""
+        stats_cog: Stats | None = self.bot.get_cog("Stats")
+        if stats_cog and stats_cog.guild_stats.ready:
+            return stats_cog.guild_stats
+        return None
+
     @staticmethod
-    def get_channel_type_counts(guild: Guild) -> defaultdict[str, int]:
+    def get_channel_type_counts(guild: Guild, guild_stats: GuildStatistics | None = None) -> dict[str, int]:
         """Return the total amounts of the various types of channels in `guild`."""
+        if guild_stats is not None:
+            return guild_stats.channel_type_counts()
+
         channel_counter = defaultdict(int)
 
         for channel in guild.channels:
-            if is_staff_channel(channel):
-                channel_counter["staff"] += 1
-            else:
-                channel_counter[str(channel.type)] += 1
+            channel_counter[channel_type_key(channel)] += 1
 
         return channel_counter
 
     @staticmethod
-    def join_role_stats(role_ids: list[int], guild: Guild, name: str | None = None) -> dict[str, int]:
+    def join_role_stats(
+        role_ids: list[int],
+        guild: Guild,
+        name: str | None = None,
+        guild_stats: GuildStatistics | None = None,
+    ) -> dict[str, int]:
         """Return a dictionary with the number of `members` of each role given, and the `name` for this joined group."""
         member_count = 0
         for role_id in role_ids:
             if (role := guild.get_role(role_id)) is not None:
-                member_count += len(role.members)
+                if guild_stats is not None:
+                    member_count += guild_stats.role_member_count(role_id)
+                else:
+                    member_count += len(role.members)
             else:
                 raise NonExistentRoleError(role_id)
         return {name or role.name.title(): member_count}
 
     @staticmethod
-    def get_member_counts(guild: Guild) -> dict[str, int]:
-        """Return the total number of members for certain roles in `guild`."""
+    def get_member_counts(guild: Guild, guild_stats: GuildStatistics | None = None) -> dict[str, int]:
+        """
+        Return the total number of members for certain roles in `guild`.
+
+        If `guild_stats` are given, the counts are read from them instead of scanning the members of each role.
+        """
         role_ids = [constants.Roles.helpers, constants.Roles.mod_team, constants.Roles.admins,
                     constants.Roles.owners, constants.Roles.contributors]
 
         role_stats = {}
         for role_id in role_ids:
-            role_stats.update(Information.join_role_stats([role_id], guild))
+            role_stats.update(Information.join_role_stats([role_id], guild, guild_stats=guild_stats))
         role_stats.update(
-            Information.join_role_stats([constants.Roles.project_leads, constants.Roles.domain_leads], guild, "Leads")
+            Information.join_role_stats(
+                [constants.Roles.project_leads, constants.Roles.domain_leads], guild, "Leads", guild_stats
+            )
         )
         return role_stats
 
@@ -171,8 +194,10 @@ class Information(Cog):
         if failed_roles:
             await ctx.send(f":x: Could not retrieve the following roles: {', '.join(failed_roles)}")
 
+        guild_stats = self.get_guild_stats()
         for role in parsed_roles:
             h, s, v = colorsys.rgb_to_hsv(*role.colour.to_rgb())
+            member_count = guild_stats.role_member_count(role.id) if guild_stats else len(role.members)
 
             embed = Embed(
                 title=f"{role.name} info",
@@ -181,7 +206,7 @@ class Information(Cog):
             embed.add_field(name="ID", value=role.id, inline=True)
             embed.add_field(name="Colour (RGB)", value=f"#{role.colour.value:0>6x}", inline=True)
             embed.add_field(name="Colour (HSV)", value=f"{h:.2f} {s:.2f} {v}", inline=True)
-            embed.add_field(name="Member count", value=len(role.members), inline=True)
+            embed.add_field(name="Member count", value=member_count, inline=True)
             embed.add_field(name="Position", value=role.position)
             embed.add_field(name="Permission code", value=role.permissions.value, inline=True)
 
@@ -223,13 +248,14 @@ class Information(Cog):
 
         # Members
         total_members = f"{ctx.guild.member_count:,}"
-        member_counts = self.get_member_counts(ctx.guild)
+        guild_stats = self.get_guild_stats()
+        member_counts = self.get_member_counts(ctx.guild, guild_stats)
         member_info = "\n".join(f"{role}: {count}" for role, count in member_counts.items())
         embed.add_field(name=f"Members: {total_members}", value=member_info)
 
         # Channels
         total_channels = len(ctx.guild.channels)
-        channel_counts = self.get_channel_type_counts(ctx.guild)
+        channel_counts = self.get_channel_type_counts(ctx.guild, guild_stats)
         channel_info = "\n".join(
             f"{channel.title()}: {count}" for channel, count in sorted(channel_counts.items())
         )
@@ -1,12 +1,15 @@
 import string
+from functools import lru_cache
 
-from discord import Member, Message
+from discord import Member, Message, Role
+from discord.abc import GuildChannel
 from discord.ext.commands import Cog, Context
 from discord.ext.tasks import loop
 
 from bot.bot import Bot
 from bot.constants import Categories, Channels, Guild
 from bot.utils.channel import is_in_category
+from bot.utils.guild_stats import GuildStatistics
 
 CHANNEL_NAME_OVERRIDES = {
     Channels.off_topic_0: "off_topic_0",
@@ -18,13 +21,23 @@ CHANNEL_NAME_OVERRIDES = {
 ALLOWED_CHARS = string.ascii_letters + string.digits + "_"
 
 
+@lru_cache(maxsize=1024)
+def channel_stat_name(channel_id: int, channel_name: str) -> str:
+    """Return the name of the message count stat of a channel, with any characters statsd doesn't allow replaced."""
+    reformatted_name = CHANNEL_NAME_OVERRIDES.get(channel_id, channel_name)
+    reformatted_name = "".join(char if char in ALLOWED_CHARS else "_" for char in reformatted_name)
+    return f"channels.{reformatted_name}"
+
+
 class Stats(Cog):
     """A cog which provides a way to hook onto Discord events and forward to stats."""
 
     def __init__(self, bot: Bot):
         self.bot = bot
         self.last_presence_update = None
+        self.guild_stats = GuildStatistics()
         self.update_guild_boost.start()
+        self.recount_guild_stats.start()
 
     @Cog.listener()
     async def on_message(self, message: Message) -> None:
@@ -44,37 +57,81 @@ class Stats(Cog):
         channel = message.channel
         if hasattr(channel, "parent") and channel.parent:
             channel = channel.parent
-        reformatted_name = CHANNEL_NAME_OVERRIDES.get(channel.id, channel.name)
-        reformatted_name = "".join(char if char in ALLOWED_CHARS else "_" for char in reformatted_name)
-
-        stat_name = f"channels.{reformatted_name}"
-        self.bot.stats.incr(stat_name)
+        self.bot.metrics.incr(channel_stat_name(channel.id, channel.name))
 
         # Increment the total message count
-        self.bot.stats.incr("messages")
+        self.bot.metrics.incr("messages")
 
     @Cog.listener()
     async def on_command_completion(self, ctx: Context) -> None:
         """Report completed commands to statsd."""
         command_name = ctx.command.qualified_name.replace(" ", "_")
 
-        self.bot.stats.incr(f"commands.{command_name}")
+        self.bot.metrics.incr(f"commands.{command_name}")
 
     @Cog.listener()
     async def on_member_join(self, member: Member) -> None:
-        """Update member count stat on member join."""
+        """Update member count stats on member join."""
         if member.guild.id != Guild.id:
             return
 
-        self.bot.stats.gauge("guild.total_members", len(member.guild.members))
+        self.guild_stats.add_member(member)
+        self.bot.metrics.gauge("guild.total_members", member.guild.member_count)
 
     @Cog.listener()
-    async def on_member_leave(self, member: Member) -> None:
-        """Update member count stat on member leave."""
+    async def on_member_remove(self, member: Member) -> None:
+        """Update member count stats on member leave."""
         if member.guild.id != Guild.id:
             return
 
-        self.bot.stats.gauge("guild.total_members", len(member.guild.members))
+        self.guild_stats.remove_member(member)
+        self.bot.metrics.gauge("guild.total_members", member.guild.member_count)
+
+    @Cog.listener()
+    async def on_member_update(self, before: Member, after: Member) -> None:
+        """Update the role member counts when a member's roles change."""
+        if after.guild.id != Guild.id:
+            return
+
+        self.guild_stats.update_member(before, after)
+
+    @Cog.listener()
+    async def on_guild_role_delete(self, role: Role) -> None:
+        """Stop counting the members of a deleted role."""
+        if role.guild.id != Guild.id:
+            return
+
+        self.guild_stats.remove_role(role.id)
+
+    @Cog.listener()
+    async def on_guild_channel_create(self, channel: GuildChannel) -> None:
+        """Count a new channel."""
+        if channel.guild.id != Guild.id:
+            return
+
+        self.guild_stats.add_channel(channel)
+
+    @Cog.listener()
+    async def on_guild_channel_update(self, before: GuildChannel, after: GuildChannel) -> None:
+        """Re-count an updated channel, as its permissions may have made it a staff channel or not."""
+        if after.guild.id != Guild.id:
+            return
+
+        self.guild_stats.add_channel(after)
+
+    @Cog.listener()
+    async def on_guild_channel_delete(self, channel: GuildChannel) -> None:
+        """Stop counting a deleted channel."""
+        if channel.guild.id != Guild.id:
+            return
+
+        self.guild_stats.remove_channel(channel)
+
+    @loop(hours=6)
+    async def recount_guild_stats(self) -> None:
+        """Rebuild the guild statistics from the member and channel caches, correcting any drift."""
+        await self.bot.wait_until_guild_available()
+        self.guild_stats.recount(self.bot.get_guild(Guild.id))
 
     @loop(hours=1)
     async def update_guild_boost(self) -> None:
@@ -85,8 +142,9 @@ class Stats(Cog):
         self.bot.stats.gauge("boost.tier", g.premium_tier)
 
     async def cog_unload(self) -> None:
-        """Stop the boost statistic task on unload of the Cog."""
+        """Stop the boost and guild statistic tasks on unload of the Cog."""
         self.update_guild_boost.stop()
+        self.recount_guild_stats.stop()
 
 
 async def setup(bot: Bot) -> None:
@@ -1,4 +1,6 @@
+import asyncio
 import gettext
+from time import monotonic
 
 import discord
 from discord.ext import commands
@@ -15,12 +17,19 @@ from bot.utils.time import discord_timestamp
 
 log = get_logger(__name__)
 
+# The number of associated accounts whose members are looked up at once.
+MAX_CONCURRENT_LOOKUPS = 10
+# Seconds for which the name of an associated account is cached, to be reused by repeated lookups of the same alts.
+ALT_NAME_CACHE_TTL = 5 * 60
+
 
 class AlternateAccounts(commands.Cog):
     """A cog used to track a user's alternative accounts across Discord."""
 
     def __init__(self, bot: Bot):
         self.bot = bot
+        self._alt_names: dict[int, tuple[float, str | None]] = {}
+        self._lookup_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LOOKUPS)
 
     @staticmethod
     def error_text_from_error(error: ResponseCodeError) -> str:
@@ -37,13 +46,31 @@ class AlternateAccounts(commands.Cog):
             return str(error.response_json)
         return error.response_text
 
+    async def get_alt_name(self, guild: discord.Guild, user_id: int) -> str | None:
+        """Return the name of the member with `user_id`, or None if they aren't a member, caching it for a while."""
+        if (cached := self._alt_names.get(user_id)) and monotonic() - cached[0] < ALT_NAME_CACHE_TTL:
+            return cached[1]
+
+        async with self._lookup_semaphore:
+            member = await get_or_fetch_member(guild, user_id)
+
+        name = str(member) if member else None
+        self._alt_names[user_id] = (monotonic(), name)
+        return name
+
     async def alts_to_string(self, alts: list[dict]) -> list[str]:
         """Convert a list of alts to a list of string representations."""
-        lines = []
+        now = monotonic()
+        self._alt_names = {
+            user_id: cached for user_id, cached in self._alt_names.items() if now - cached[0] < ALT_NAME_CACHE_TTL
+        }
+
         guild = self.bot.get_guild(self.bot.guild_id)
-        for idx, alt in enumerate(alts):
-            alt_obj = await get_or_fetch_member(guild, alt["target"])
-            alt_name = str(alt_obj) if alt_obj else alt["target"]
+        alt_names = await asyncio.gather(*(self.get_alt_name(guild, alt["target"]) for alt in alts))
+
+        lines = []
+        for idx, (alt, alt_name) in enumerate(zip(alts, alt_names, strict=True)):
+            alt_name = alt_name or alt["target"]
             created_at = discord_timestamp(alt["created_at"])
             updated_at = discord_timestamp(alt["updated_at"])
 
@@ -1,21 +1,24 @@
 import asyncio
 import traceback
-from collections import namedtuple
+from collections import deque, namedtuple
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
+from time import monotonic
 
 import arrow
 from async_rediscache import RedisCache
 from dateutil.relativedelta import relativedelta
-from discord import Colour, Embed, Forbidden, Member, TextChannel, User
+from discord import Colour, Embed, Forbidden, HTTPException, Member, NotFound, TextChannel, User
 from discord.ext import tasks
 from discord.ext.commands import Cog, Context, group, has_any_role
 from pydis_core.utils import scheduling
+from pydis_core.utils.paste_service import PasteFile, PasteTooLongError, PasteUploadError, send_to_paste_service
 from pydis_core.utils.scheduling import Scheduler
 from redis import RedisError
 
 from bot.bot import Bot
-from bot.constants import Channels, Colours, Emojis, Event, Icons, MODERATION_ROLES, Roles
+from bot.constants import BaseURLs, Channels, Colours, Emojis, Event, Icons, MODERATION_ROLES, Roles
 from bot.converters import DurationDelta, Expiry
 from bot.exts.moderation.modlog import ModLog
 from bot.log import get_logger
@@ -40,6 +43,34 @@ BASE_CHANNEL_TOPIC = "Python Discord Defense Mechanism"
 
 SECONDS_IN_DAY = 86400
 
+# The maximum number of rejected members being DMed and kicked at the same time.
+MAX_CONCURRENT_REJECTIONS = 5
+# The maximum number of rejected members waiting to be DMed and kicked. Those rejected while it's full are kicked
+# right away instead, which is only expected while the server is being raided.
+MAX_QUEUED_REJECTIONS = 1000
+# How often rejections are summarised in the mod log, in seconds.
+REJECTION_LOG_INTERVAL = 30
+# The window over which the join rate is measured, in seconds.
+JOIN_RATE_WINDOW = 60
+# The number of joins within the window above which rejected members aren't DMed, to get them kicked sooner.
+DM_SKIP_JOIN_RATE = 30
+# The number of rejected members listed in the log embed when the paste service can't be used.
+MAX_LOGGED_REJECTIONS = 20
+
+
+@dataclass(frozen=True, slots=True)
+class Rejection:
+    """The outcome of rejecting a member whose account was too new."""
+
+    member_id: int
+    # The member's name, and their mention and ID as formatted by `format_user`.
+    name: str
+    formatted: str
+    avatar_url: str
+    # None if the DM was skipped due to a high join rate.
+    dm_sent: bool | None
+    kicked: bool
+
 
 class Action(Enum):
     """Defcon Action."""
@@ -69,6 +100,15 @@ class Defcon(Cog):
 
         self.scheduler = Scheduler(self.__class__.__name__)
 
+        self._recent_joins: deque[float] = deque()
+        self._rejection_queue: asyncio.Queue[Member] = asyncio.Queue(maxsize=MAX_QUEUED_REJECTIONS)
+        self._rejections: list[Rejection] = []
+        self._rejection_workers = [
+            scheduling.create_task(self._rejection_worker(), event_loop=self.bot.loop)
+            for _ in range(MAX_CONCURRENT_REJECTIONS)
+        ]
+        self.log_rejections.start()
+
         scheduling.create_task(self._sync_settings(), event_loop=self.bot.loop)
 
     async def get_mod_log(self) -> ModLog:
@@ -107,44 +147,157 @@ class Defcon(Cog):
 
         await self._update_channel_topic()
 
+    @property
+    def join_rate(self) -> int:
+        """The number of members who joined within the last `JOIN_RATE_WINDOW` seconds."""
+        cutoff = monotonic() - JOIN_RATE_WINDOW
+        while self._recent_joins and self._recent_joins[0] < cutoff:
+            self._recent_joins.popleft()
+        return len(self._recent_joins)
+
     @Cog.listener()
     async def on_member_join(self, member: Member) -> None:
         """Check newly joining users to see if they meet the account age threshold."""
+        self._recent_joins.append(monotonic())
+        self.bot.metrics.gauge("defcon.join_rate", self.join_rate)
+
         if self.threshold:
             now = arrow.utcnow()
 
             if now - member.created_at < time.relativedelta_to_timedelta(self.threshold):
                 log.info(f"Rejecting user {member}: Account is too new")
+                try:
+                    self._rejection_queue.put_nowait(member)
+                except asyncio.QueueFull:
+                    self.bot.metrics.incr("defcon.queue_overflows")
+                    self._rejections.append(await self._reject(member))
+                self.bot.metrics.gauge("defcon.queue_depth", self._rejection_queue.qsize())
+
+    async def _rejection_worker(self) -> None:
+        """Reject the members in the rejection queue, one at a time."""
+        while True:
+            member = await self._rejection_queue.get()
+            try:
+                self._rejections.append(await self._reject(member))
+            except Exception:
+                log.exception(f"Unexpected error while rejecting {member}.")
+            finally:
+                self._rejection_queue.task_done()
+                self.bot.metrics.gauge("defcon.queue_depth", self._rejection_queue.qsize())
+
+    async def _reject(self, member: Member) -> Rejection:
+        """DM `member` the rejection message, unless many members are joining, then kick them."""
+        dm_sent = None
+        if self.join_rate <= DM_SKIP_JOIN_RATE:
+            dm_sent = False
+            try:
+                await member.send(REJECTION_MESSAGE.format(user=member.mention))
+                dm_sent = True
+            except Forbidden:
+                log.debug(f"Cannot send DEFCON rejection DM to {member}: DMs disabled")
+            except Exception:
+                # Broadly catch exceptions because DM isn't critical, but it's imperative to kick them.
+                log.exception(f"Error sending DEFCON rejection message to {member}")
+        else:
+            self.bot.metrics.incr("defcon.rejection_dms_skipped")
+
+        kicked = True
+        try:
+            await member.kick(reason="DEFCON active, user is too new")
+        except NotFound:
+            log.debug(f"Cannot kick {member} for DEFCON: they already left")
+        except HTTPException:
+            log.exception(f"Failed to kick {member} for DEFCON")
+            kicked = False
+        else:
+            self.bot.metrics.incr("defcon.leaves")
 
-                message_sent = False
+        return Rejection(member.id, str(member), format_user(member), member.display_avatar.url, dm_sent, kicked)
 
-                try:
-                    await member.send(REJECTION_MESSAGE.format(user=member.mention))
-                    message_sent = True
-                except Forbidden:
-                    log.debug(f"Cannot send DEFCON rejection DM to {member}: DMs disabled")
-                except Exception:
-                    # Broadly catch exceptions because DM isn't critical, but it's imperative to kick them.
-                    log.exception(f"Error sending DEFCON rejection message to {member}")
-
-                await member.kick(reason="DEFCON active, user is too new")
-                self.bot.stats.incr("defcon.leaves")
-
-                message = (
-                    f"{format_user(member)} was denied entry because their account is too new."
-                )
-
-                if not message_sent:
-                    message = f"{message}\n\nUnable to send rejection message via DM; they probably have DMs disabled."
-
-                await send_log_message(
-                    self.bot,
-                    Icons.defcon_denied,
-                    Colours.soft_red,
-                    "Entry denied",
-                    message,
-                    thumbnail=member.display_avatar.url
-                )
+    @tasks.loop(seconds=REJECTION_LOG_INTERVAL)
+    async def log_rejections(self) -> None:
+        """Log the members rejected since the last iteration."""
+        await self.flush_rejections()
+
+    async def flush_rejections(self) -> None:
+        """
+        Log the members rejected since the rejections were last logged.
+
+        If they can't be logged, they're kept to be logged along with the next ones.
+        """
+        rejections, self._rejections = self._rejections, []
+        if not rejections:
+            return
+
+        try:
+            await self._send_rejections_log(rejections)
+        except HTTPException:
+            log.exception(f"Failed to log {len(rejections)} DEFCON rejections, retrying with the next batch.")
+            self._rejections = rejections + self._rejections
+        except asyncio.CancelledError:
+            self._rejections = rejections + self._rejections
+            raise
+
+    async def _send_rejections_log(self, rejections: list[Rejection]) -> None:
+        """Send a log message about the rejected members, summarising them if there were many."""
+        if len(rejections) == 1:
+            rejection = rejections[0]
+            message = f"{rejection.formatted} was denied entry because their account is too new."
+            if rejection.dm_sent is None:
+                message = f"{message}\n\nThe rejection message wasn't sent via DM due to the high join rate."
+            elif not rejection.dm_sent:
+                message = f"{message}\n\nUnable to send rejection message via DM; they probably have DMs disabled."
+            if not rejection.kicked:
+                message = f"{message}\n\n:warning: Failed to kick them from the server."
+
+            await send_log_message(
+                self.bot,
+                Icons.defcon_denied,
+                Colours.soft_red,
+                "Entry denied",
+                message,
+                thumbnail=rejection.avatar_url,
+            )
+            return
+
+        not_kicked = sum(not rejection.kicked for rejection in rejections)
+        dms_sent = sum(rejection.dm_sent is True for rejection in rejections)
+        dms_skipped = sum(rejection.dm_sent is None for rejection in rejections)
+        message = (
+            f"Rejected **{len(rejections)}** accounts in the last {REJECTION_LOG_INTERVAL}s "
+            "because they were too new.\n\n"
+            f"**DMs sent:** {dms_sent}\n"
+            f"**DMs skipped due to the join rate:** {dms_skipped}\n"
+            f"**Failed kicks:** {not_kicked}\n"
+            f"**Join rate:** {self.join_rate} in the last {JOIN_RATE_WINDOW}s\n\n"
+        )
+
+        lines = "\n".join(
+            f"{rejection.member_id} {rejection.name}{'' if rejection.kicked else ' (not kicked)'}"
+            for rejection in rejections
+        )
+        try:
+            paste = await send_to_paste_service(
+                files=[PasteFile(content=lines, lexer="text")],
+                http_session=self.bot.http_session,
+                paste_url=BaseURLs.paste_url,
+            )
+            message += f"**Rejected accounts:** {paste.link}"
+        except (ValueError, PasteTooLongError, PasteUploadError):
+            log.warning("Failed to upload the rejected DEFCON accounts to the paste service.")
+            listed = "\n".join(
+                f"`{rejection.member_id}` {rejection.name}" for rejection in rejections[:MAX_LOGGED_REJECTIONS]
+            )
+            message += f"**Rejected accounts:**\n{listed}"
+            if len(rejections) > MAX_LOGGED_REJECTIONS:
+                message += f"\n...and {len(rejections) - MAX_LOGGED_REJECTIONS} more"
+
+        await send_log_message(self.bot, Icons.defcon_denied, Colours.soft_red, "Entries denied", message)
+
+    @log_rejections.before_loop
+    async def before_log_rejections(self) -> None:
+        """Wait for the guild to be available before logging rejections."""
+        await self.bot.wait_until_guild_available()
 
     @group(name="defcon", aliases=("dc",), invoke_without_command=True)
     @has_any_role(*MODERATION_ROLES)
@@ -327,10 +480,28 @@ class Defcon(Cog):
         await self.channel.send(f"Defcon is on and is set to {time.humanize_delta(self.threshold)}.")
 
     async def cog_unload(self) -> None:
-        """Cancel the notifer and threshold removal tasks when the cog unloads."""
+        """
+        Cancel the notifer, threshold removal and rejection tasks, and log the pending rejections, on unload.
+
+        The members still waiting to be rejected won't be kicked, so they're logged to be dealt with manually.
+        """
         log.trace("Cog unload: canceling defcon notifier task.")
         self.defcon_notifier.cancel()
         self.scheduler.cancel_all()
+        self.log_rejections.cancel()
+        for worker in self._rejection_workers:
+            worker.cancel()
+
+        queued = []
+        while not self._rejection_queue.empty():
+            queued.append(self._rejection_queue.get_nowait())
+        if queued:
+            log.warning(
+                f"{len(queued)} members were waiting to be rejected when the cog unloaded, and weren't kicked: "
+                + ", ".join(f"{member} ({member.id})" for member in queued)
+            )
+
+        await self.flush_rejections()
 
 
 async def setup(bot: Bot) -> None:
@@ -1,5 +1,6 @@
 import asyncio
 import re
+from collections import OrderedDict
 from datetime import UTC, datetime
 from enum import Enum
 
@@ -30,6 +31,18 @@ DISCORD_MESSAGE_LINK_RE = re.compile(
     r"/[0-9]{15,20}/[0-9]{15,20})"
 )
 
+# Matches the ID of the deleted message in a message deletion log entry
+DELETED_MESSAGE_ID_RE = re.compile(r"\*\*Message ID:\*\* `([0-9]{15,20})`")
+
+# Amount of resolved message link embeds to keep in memory
+MESSAGE_LINK_CACHE_SIZE = 256
+
+# Amount of message deletion log entries to keep indexed by the ID of the deleted message
+DELETION_LOG_INDEX_SIZE = 1000
+
+# Amount of messages to index from the message change log when the first deleted message is looked up
+DELETION_LOG_HISTORY_LIMIT = 100
+
 
 class Signal(Enum):
     """
@@ -178,79 +191,139 @@ def shorten_text(text: str) -> str:
     return text
 
 
-async def make_message_link_embed(ctx: Context, message_link: str) -> discord.Embed | None:
+class MessageLinkResolver:
     """
-    Create an embedded representation of the discord message link contained in the incident report.
+    Resolve message links into embeds, keeping the most recently used embeds in an LRU cache.
 
-    The Embed would contain the following information -->
-        Author: @Jason Terror ♦ (736234578745884682)
-        Channel: Special/#bot-commands (814190307980607493)
-        Content: This is a very important message!
+    Links to deleted messages are looked up in an index of the message deletion log entries,
+    which is kept up to date through `index_deletion_log` as the entries are posted.
     """
-    embed = None
 
-    try:
-        message: discord.Message = await MessageConverter().convert(ctx, message_link)
-    except MessageNotFound:
-        mod_logs_channel = ctx.bot.get_channel(Channels.mod_log)
+    def __init__(self, bot: Bot) -> None:
+        self.bot = bot
 
-        last_100_logs: list[discord.Message] = [message async for message in mod_logs_channel.history(limit=100)]
+        self._embeds: OrderedDict[int, discord.Embed] = OrderedDict()
+        self._deletion_logs: OrderedDict[int, str] = OrderedDict()  # Deleted message ID -> log entry jump URL.
+        self._history_indexed = False
+        self._history_lock = asyncio.Lock()
 
-        for log_entry in last_100_logs:
-            if not log_entry.embeds:
-                continue
+    def index_deletion_log(self, log_entry: discord.Message) -> None:
+        """Index `log_entry` by the ID of the deleted message, if it is a message deletion log entry."""
+        if not log_entry.embeds:
+            return
+
+        log_embed = log_entry.embeds[0]
+        if log_embed.author.name != "Message deleted" or not log_embed.description:
+            return
+
+        if match := DELETED_MESSAGE_ID_RE.search(log_embed.description):
+            self._deletion_logs[int(match[1])] = log_entry.jump_url
+            if len(self._deletion_logs) > DELETION_LOG_INDEX_SIZE:
+                self._deletion_logs.popitem(last=False)
+
+    async def find_deletion_log(self, message_id: int) -> str | None:
+        """
+        Return the jump URL of the deletion log entry for `message_id`, if one is indexed.
+
+        Entries posted before the cog was loaded are indexed from the channel history on the first lookup.
+        """
+        if not self._history_indexed:
+            async with self._history_lock:
+                if not self._history_indexed:
+                    log.trace("Indexing message deletion log entries from the message change log history.")
+                    message_log = self.bot.get_channel(Channels.message_log)
+                    entries = [entry async for entry in message_log.history(limit=DELETION_LOG_HISTORY_LIMIT)]
+                    # Index the oldest entries first, so that they're the first to be evicted.
+                    for log_entry in reversed(entries):
+                        self.index_deletion_log(log_entry)
+                    self._history_indexed = True
+
+        return self._deletion_logs.get(message_id)
+
+    async def resolve(self, ctx: Context, message_link: str) -> discord.Embed | None:
+        """Return the embed for `message_link`, from the cache if it has been resolved recently."""
+        message_id = int(message_link.rsplit("/", 1)[-1])
+        if (embed := self._embeds.get(message_id)) is not None:
+            log.trace(f"Using cached message link embed for message {message_id}.")
+            self._embeds.move_to_end(message_id)
+            return embed
+
+        return await self.make_message_link_embed(ctx, message_link)
+
+    def _cache_embed(self, message_id: int, embed: discord.Embed) -> None:
+        """Cache `embed` for `message_id`, evicting the least recently used embed if the cache is full."""
+        self._embeds[message_id] = embed
+        if len(self._embeds) > MESSAGE_LINK_CACHE_SIZE:
+            self._embeds.popitem(last=False)
+
+    async def make_message_link_embed(self, ctx: Context, message_link: str) -> discord.Embed | None:
+        """
+        Create an embedded representation of the discord message link contained in the incident report.
 
-            log_embed: discord.Embed = log_entry.embeds[0]
-            if (
-                    log_embed.author.name == "Message deleted"
-                    and f"[Jump to message]({message_link})" in log_embed.description
-            ):
+        The Embed would contain the following information -->
+            Author: @Jason Terror ♦ (736234578745884682)
+            Channel: Special/#bot-commands (814190307980607493)
+            Content: This is a very important message!
+
+        Embeds of found and deleted messages are cached. A message which wasn't found isn't, as its
+        deletion may not have been logged yet.
+        """
+        embed = None
+        message_id = int(message_link.rsplit("/", 1)[-1])
+
+        try:
+            message: discord.Message = await MessageConverter().convert(ctx, message_link)
+        except MessageNotFound:
+            if log_entry_url := await self.find_deletion_log(message_id):
                 embed = discord.Embed(
                     colour=discord.Colour.dark_gold(),
                     title="Deleted Message Link",
                     description=(
-                        f"Found <#{Channels.mod_log}> entry for deleted message: "
-                        f"[Jump to message]({log_entry.jump_url})."
+                        f"Found <#{Channels.message_log}> entry for deleted message: "
+                        f"[Jump to message]({log_entry_url})."
                     )
                 )
-        if not embed:
+                self._cache_embed(message_id, embed)
+            else:
+                embed = discord.Embed(
+                    colour=discord.Colour.red(),
+                    title="Bad Message Link",
+                    description=f"Message {message_link} not found."
+                )
+        except discord.DiscordException as e:
+            log.exception(f"Failed to make message link embed for '{message_link}', raised exception: {e}")
+        else:
+            channel = message.channel
+            if not channel.permissions_for(channel.guild.get_role(Roles.helpers)).view_channel:
+                log.info(
+                    f"Helpers don't have read permissions in #{channel.name},"
+                    f" not sending message link embed for {message_link}"
+                )
+                return None
+
             embed = discord.Embed(
-                colour=discord.Colour.red(),
-                title="Bad Message Link",
-                description=f"Message {message_link} not found."
+                colour=discord.Colour.gold(),
+                description=(
+                    f"**Author:** {format_user(message.author)}\n"
+                    f"**Channel:** {channel.mention} ({channel.category}"
+                    f"{f'/#{channel.parent.name} - ' if isinstance(channel, discord.Thread) else '/#'}"
+                    f"{channel.name})\n"
+                ),
+                timestamp=message.created_at
             )
-    except discord.DiscordException as e:
-        log.exception(f"Failed to make message link embed for '{message_link}', raised exception: {e}")
-    else:
-        channel = message.channel
-        if not channel.permissions_for(channel.guild.get_role(Roles.helpers)).view_channel:
-            log.info(
-                f"Helpers don't have read permissions in #{channel.name},"
-                f" not sending message link embed for {message_link}"
+            embed.set_author(name=message.author, icon_url=message.author.display_avatar.url)
+            embed.add_field(
+                name="Content",
+                value=shorten_text(message.content) if message.content else "[No Message Content]"
             )
-            return None
+            embed.set_footer(text=f"Message ID: {message.id}")
 
-        embed = discord.Embed(
-            colour=discord.Colour.gold(),
-            description=(
-                f"**Author:** {format_user(message.author)}\n"
-                f"**Channel:** {channel.mention} ({channel.category}"
-                f"{f'/#{channel.parent.name} - ' if isinstance(channel, discord.Thread) else '/#'}"
-                f"{channel.name})\n"
-            ),
-            timestamp=message.created_at
-        )
-        embed.set_author(name=message.author, icon_url=message.author.display_avatar.url)
-        embed.add_field(
-            name="Content",
-            value=shorten_text(message.content) if message.content else "[No Message Content]"
-        )
-        embed.set_footer(text=f"Message ID: {message.id}")
+            if message.attachments:
+                embed.set_image(url=message.attachments[0].url)
 
-        if message.attachments:
-            embed.set_image(url=message.attachments[0].url)
+            self._cache_embed(message_id, embed)
 
-    return embed
+        return embed
 
 
 async def add_signals(incident: discord.Message) -> None:
@@ -318,6 +391,7 @@ class Incidents(Cog):
         """Prepare `event_lock` and schedule `crawl_task` on start-up."""
         self.bot = bot
         self.incidents_webhook = None
+        self.link_resolver = MessageLinkResolver(bot)
 
         scheduling.create_task(self.fetch_webhook())
 
@@ -574,7 +648,13 @@ class Incidents(Cog):
         These message link embeds are then sent into the channel.
 
         Also passes the message into `add_signals` if the message is an incident.
+
+        Message deletion log entries posted by the bot are indexed, so that links to deleted messages can be resolved.
         """
+        if message.channel.id == Channels.message_log and message.author.id == self.bot.user.id:
+            self.link_resolver.index_deletion_log(message)
+            return
+
         if not is_incident(message):
             return
 
@@ -599,8 +679,7 @@ class Incidents(Cog):
         """
         Check if there's any message links in the text content.
 
-        Then pass the message_link into `make_message_link_embed` to format an
-        embed for it containing information about the link.
+        Then resolve the message links concurrently into embeds containing information about them.
 
         As Discord only allows a max of 10 embeds in a single webhook, just send the
         first 10 embeds and don't care about the rest.
@@ -614,14 +693,12 @@ class Incidents(Cog):
             )
             return None
 
-        embeds = []
-        for message_link in message_links[:10]:
-            ctx = await self.bot.get_context(message)
-            embed = await make_message_link_embed(ctx, message_link[0])
-            if embed:
-                embeds.append(embed)
+        ctx = await self.bot.get_context(message)
+        embeds = await asyncio.gather(
+            *(self.link_resolver.resolve(ctx, message_link[0]) for message_link in message_links[:10])
+        )
 
-        return embeds
+        return [embed for embed in embeds if embed]
 
     async def send_message_link_embeds(
             self,
@@ -32,12 +32,31 @@ class Superstarify(InfractionScheduler, Cog):
     def __init__(self, bot: Bot):
         super().__init__(bot, supported_infractions={"superstar"})
 
+        # IDs of the users with an active superstar infraction, so that the API is only queried for them.
+        # Until it's loaded, the API is queried for every nickname change.
+        self.superstars: set[int] = set()
+        self.superstars_loaded = False
+
+    async def cog_load(self) -> None:
+        """Load the users with an active superstar infraction, then schedule the infractions' expiration."""
+        await self.bot.wait_until_guild_available()
+
+        log.trace("Loading the users with an active superstar infraction.")
+        infractions = await self.bot.api_client.get("bot/infractions", params={"active": "true", "type": "superstar"})
+        self.superstars = {infraction["user"] for infraction in infractions}
+        self.superstars_loaded = True
+
+        await super().cog_load()
+
     @Cog.listener()
     async def on_member_update(self, before: Member, after: Member) -> None:
         """Revert nickname edits if the user has an active superstarify infraction."""
         if before.display_name == after.display_name:
             return  # User didn't change their nickname. Abort!
 
+        if self.superstars_loaded and before.id not in self.superstars:
+            return  # User isn't in superstar-prison.
+
         log.trace(
             f"{before} ({before.display_name}) is trying to change their nickname to "
             f"{after.display_name}. Checking if the user is in superstar-prison..."
@@ -54,6 +73,7 @@ class Superstarify(InfractionScheduler, Cog):
 
         if not active_superstarifies:
             log.trace(f"{before} has no active superstar infractions.")
+            self.superstars.discard(before.id)
             return
 
         infraction = active_superstarifies[0]
@@ -95,6 +115,7 @@ class Superstarify(InfractionScheduler, Cog):
 
         if active_superstarifies:
             infraction = active_superstarifies[0]
+            self.superstars.add(member.id)
 
             async def action() -> None:
                 await member.edit(
@@ -146,6 +167,7 @@ class Superstarify(InfractionScheduler, Cog):
         infraction_reason = f"Old nickname: {old_nick}. {reason}"
         infraction = await _utils.post_infraction(ctx, member, "superstar", infraction_reason, duration, active=True)
         id_ = infraction["id"]
+        self.superstars.add(member.id)
 
         forced_nick = self.get_nick(id_, member.id)
         expiry_str = time.discord_timestamp(infraction["expires_at"])
@@ -200,6 +222,8 @@ class Superstarify(InfractionScheduler, Cog):
         if infraction["type"] != "superstar":
             return None
 
+        self.superstars.discard(infraction["user"])
+
         guild = self.bot.get_guild(constants.Guild.id)
         user = await get_or_fetch_member(guild, infraction["user"])
 
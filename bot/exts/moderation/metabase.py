@@ -1,10 +1,18 @@
+import asyncio
 import csv
 import json
+import sys
+import textwrap
+import time
+from collections import OrderedDict
+from collections.abc import Iterator, MutableMapping, Sequence
 from datetime import timedelta
-from io import StringIO
-from typing import Literal
+from io import TextIOWrapper
+from tempfile import SpooledTemporaryFile
+from typing import Literal, overload
 
 import arrow
+from aiohttp import ClientResponse
 from aiohttp.client_exceptions import ClientResponseError
 from arrow import Arrow
 from async_rediscache import RedisCache
@@ -23,6 +31,290 @@ BASE_HEADERS = {
     "Content-Type": "application/json"
 }
 
+# Exports are dropped once they're this old, or once they use more than this much memory in total.
+EXPORT_TTL = timedelta(hours=6)
+EXPORT_MEMORY_BUDGET = 64 * 1024 * 1024
+# Response bodies larger than this are spilled to a temporary file rather than kept in memory.
+SPOOL_MAX_SIZE = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+# The number of characters of a JSON export read at a time while parsing its rows.
+JSON_READ_SIZE = 64 * 1024
+
+
+class Export(Sequence[dict]):
+    """
+    The result of a question, stored as a list of values per column rather than as a dict per row.
+
+    It behaves as a sequence of row dicts, which are built on access. The response body is kept as it was received,
+    spilled to a temporary file if it's large, so that it can be uploaded without being serialised again.
+    """
+
+    def __init__(
+        self,
+        columns: dict[str, list],
+        body: SpooledTemporaryFile,
+        body_size: int,
+        extension: Literal["csv", "json"] = "csv",
+    ):
+        self.columns = columns
+        self.extension = extension
+        self._body = body
+        self._body_size = body_size
+        self._length = max((len(values) for values in columns.values()), default=0)
+        self.created_at = time.monotonic()
+        self.memory_size = self._estimate_memory_size()
+
+    @classmethod
+    def from_body(cls, body: SpooledTemporaryFile, body_size: int, extension: Literal["csv", "json"]) -> Export:
+        """Parse the response `body` of a question into columns."""
+        body.seek(0)
+        text = TextIOWrapper(body, encoding="utf-8", newline="")
+        try:
+            columns = cls._parse_csv(text) if extension == "csv" else cls._parse_json(text)
+        finally:
+            # Don't close the body along with the wrapper.
+            text.detach()
+        return cls(columns, body, body_size, extension)
+
+    @staticmethod
+    def _parse_csv(text: TextIOWrapper) -> dict[str, list]:
+        """
+        Parse CSV rows into columns, one row at a time.
+
+        Columns sharing a name are suffixed with a number, e.g. `id` and `id_2`, so their values are all kept.
+        Raise ValueError if a row doesn't have as many values as there are columns.
+        """
+        reader = csv.reader(text)
+        columns = {name: [] for name in Export._unique_names(next(reader, []))}
+        values = list(columns.values())
+        for row in reader:
+            try:
+                for column, value in zip(values, row, strict=True):
+                    column.append(value)
+            except ValueError:
+                raise ValueError(
+                    f"row {reader.line_num} has {len(row)} values, but there are {len(values)} columns"
+                ) from None
+        return columns
+
+    @staticmethod
+    def _unique_names(names: list[str]) -> list[str]:
+        """Return `names` with the duplicates suffixed with a number, so that no values are overwritten."""
+        unique_names = []
+        seen = set(names)
+        counts = {}
+        for name in names:
+            counts[name] = counts.get(name, 0) + 1
+            if counts[name] > 1:
+                suffix = counts[name]
+                while f"{name}_{suffix}" in seen:
+                    suffix += 1
+                name = f"{name}_{suffix}"
+                seen.add(name)
+            unique_names.append(name)
+        return unique_names
+
+    @staticmethod
+    def _iter_json_rows(text: TextIOWrapper) -> Iterator[dict]:
+        """
+        Parse a JSON list of row objects one row at a time, reading `JSON_READ_SIZE` characters of it at a time.
+
+        Raise ValueError if the text isn't a JSON list of objects.
+        """
+        decoder = json.JSONDecoder()
+        buffer = ""
+        position = 0
+        exhausted = False
+
+        def read_more() -> None:
+            """Read more of the text, dropping what was already parsed."""
+            nonlocal buffer, position, exhausted
+            chunk = text.read(JSON_READ_SIZE)
+            buffer = buffer[position:] + chunk
+            position = 0
+            exhausted = not chunk
+
+        def next_char() -> str:
+            """Skip the whitespace before the next character and return it, or an empty string at the end."""
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position < len(buffer) or exhausted:
+                    return buffer[position:position + 1]
+                read_more()
+
+        if next_char() != "[":
+            raise ValueError("the export isn't a list of rows")
+        position += 1
+
+        index = 0
+        while (char := next_char()) != "]":
+            if index:
+                if char != ",":
+                    raise ValueError(f"expected a comma after row {index}")
+                position += 1
+                next_char()
+
+            while True:
+                try:
+                    row, position = decoder.raw_decode(buffer, position)
+                    break
+                except json.JSONDecodeError as e:
+                    if exhausted:
+                        raise ValueError(f"row {index + 1} isn't valid JSON: {e.msg}") from None
+                    read_more()
+
+            index += 1
+            if not isinstance(row, dict):
+                raise ValueError(f"row {index} isn't an object")
+            yield row
+
+        position += 1
+        if next_char():
+            raise ValueError("the export has data after its list of rows")
+
+    @staticmethod
+    def _parse_json(text: TextIOWrapper) -> dict[str, list]:
+        """Parse a JSON list of row objects into columns, one row at a time."""
+        columns = {}
+        for i, row in enumerate(Export._iter_json_rows(text)):
+            for name, value in row.items():
+                columns.setdefault(name, [None] * i).append(value)
+            # Pad the columns missing from this row.
+            for values in columns.values():
+                if len(values) == i:
+                    values.append(None)
+        return columns
+
+    def _estimate_memory_size(self) -> int:
+        """Estimate the memory used by the columns, and the body if it wasn't spilled to disk."""
+        size = sum(
+            sys.getsizeof(values) + sum(sys.getsizeof(value) for value in values)
+            for values in self.columns.values()
+        )
+        if self._body_size <= SPOOL_MAX_SIZE:
+            size += self._body_size
+        return size
+
+    def column(self, name: str) -> list:
+        """Return the values of the column `name`."""
+        return self.columns[name]
+
+    def read_body(self) -> str:
+        """Return the response body that the export was parsed from."""
+        self._body.seek(0)
+        return self._body.read().decode("utf-8")
+
+    def format_body(self) -> str:
+        """Return the response body formatted for human eyes, indenting JSON and sorting its keys."""
+        if self.extension != "json":
+            return self.read_body()
+
+        self._body.seek(0)
+        text = TextIOWrapper(self._body, encoding="utf-8", newline="")
+        try:
+            # The same as dumping the whole list with an indent, without holding all the parsed rows at once.
+            rows = [
+                textwrap.indent(json.dumps(row, indent=4, sort_keys=True), "    ")
+                for row in self._iter_json_rows(text)
+            ]
+        finally:
+            text.detach()
+        return "[\n" + ",\n".join(rows) + "\n]" if rows else "[]"
+
+    def close(self) -> None:
+        """Release the response body."""
+        self._body.close()
+
+    @overload
+    def __getitem__(self, index: int) -> dict: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[dict]: ...
+
+    def __getitem__(self, index: int | slice) -> dict | list[dict]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("export row index out of range")
+        return {name: values[index] for name, values in self.columns.items()}
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"<Export rows={self._length} columns={list(self.columns)}>"
+
+
+class ExportCache(MutableMapping[int, Export]):
+    """
+    A mapping of question IDs to their latest export, bounded in age and memory.
+
+    The least recently used exports are evicted once their total estimated size exceeds `memory_budget`.
+    Evicted exports aren't closed, as they may still be used in internal eval; they're released once unreferenced.
+    """
+
+    def __init__(self, ttl: timedelta = EXPORT_TTL, memory_budget: int = EXPORT_MEMORY_BUDGET):
+        self.ttl = ttl.total_seconds()
+        self.memory_budget = memory_budget
+        self._exports: OrderedDict[int, Export] = OrderedDict()
+        self._memory_size = 0
+
+    def __getitem__(self, question_id: int) -> Export:
+        self._evict_expired()
+        export = self._exports[question_id]
+        self._exports.move_to_end(question_id)
+        return export
+
+    def __setitem__(self, question_id: int, export: Export) -> None:
+        self._remove(question_id)
+        self._exports[question_id] = export
+        self._memory_size += export.memory_size
+
+        self._evict_expired()
+        # Always keep the newest export, even if it's over the budget by itself.
+        while self._memory_size > self.memory_budget and len(self._exports) > 1:
+            oldest = next(iter(self._exports))
+            log.debug(f"Evicting the export of question {oldest} to stay within the memory budget.")
+            self._remove(oldest)
+
+    def __delitem__(self, question_id: int) -> None:
+        if question_id not in self._exports:
+            raise KeyError(question_id)
+        self._remove(question_id)
+
+    def __iter__(self) -> Iterator[int]:
+        self._evict_expired()
+        return iter(list(self._exports))
+
+    def __contains__(self, question_id: int) -> bool:
+        self._evict_expired()
+        return question_id in self._exports
+
+    def __len__(self) -> int:
+        self._evict_expired()
+        return len(self._exports)
+
+    def clear(self) -> None:
+        """Remove all exports."""
+        self._exports.clear()
+        self._memory_size = 0
+
+    def _evict_expired(self) -> None:
+        """Remove the exports older than the TTL."""
+        cutoff = time.monotonic() - self.ttl
+        for question_id, export in list(self._exports.items()):
+            if export.created_at < cutoff:
+                self._remove(question_id)
+
+    def _remove(self, question_id: int) -> None:
+        """Remove the export of `question_id`, if there's one."""
+        if (export := self._exports.pop(question_id, None)) is not None:
+            self._memory_size -= export.memory_size
+
 
 class Metabase(Cog):
     """Commands for admins to interact with metabase."""
@@ -37,7 +329,7 @@ class Metabase(Cog):
         self.session_expiry: float | None = None  # session_info["session_expiry"]: UtcPosixTimestamp
         self.headers = BASE_HEADERS
 
-        self.exports: dict[int, list[dict]] = {}  # Saves the output of each question, so internal eval can access it
+        self.exports = ExportCache()  # Saves the output of each question, so internal eval can access it
 
     async def cog_command_error(self, ctx: Context, error: Exception) -> None:
         """Handle ClientResponseError errors locally to invalidate token if needed."""
@@ -128,21 +420,18 @@ class Metabase(Cog):
         url = f"{MetabaseConfig.base_url}/api/card/{question_id}/query/{extension}"
 
         async with self.bot.http_session.post(url, headers=self.headers, raise_for_status=True) as resp:
-            if extension == "csv":
-                extension = "text"  # paste site doesn't support csv as a lexer
-                out = await resp.text(encoding="utf-8")
-                # Save the output for use with int e
-                self.exports[question_id] = list(csv.DictReader(StringIO(out)))
-
-            elif extension == "json":
-                out = await resp.json(encoding="utf-8")
-                # Save the output for use with int e
-                self.exports[question_id] = out
-
-                # Format it nicely for human eyes
-                out = json.dumps(out, indent=4, sort_keys=True)
-
-        file = PasteFile(content=out, lexer=extension)
+            try:
+                export = await self._read_export(resp, extension)
+            except ValueError as e:
+                log.warning(f"Failed to parse the {extension} export of question {question_id}: {e}")
+                await ctx.send(f":x: {ctx.author.mention} The export of that question couldn't be parsed: {e}.")
+                return
+        # Save the output for use with int e
+        self.exports[question_id] = export
+
+        # paste site doesn't support csv as a lexer
+        content = await asyncio.to_thread(export.format_body)
+        file = PasteFile(content=content, lexer="text" if extension == "csv" else extension)
         try:
             resp = await send_to_paste_service(
                 files=[file],
@@ -161,6 +450,21 @@ class Metabase(Cog):
             f"`bot.get_cog('Metabase').exports[{question_id}]`"
         )
 
+    @staticmethod
+    async def _read_export(resp: ClientResponse, extension: Literal["csv", "json"]) -> Export:
+        """Stream the body of `resp` into a temporary file, and parse it into an export."""
+        body = SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)  # noqa: SIM115
+        body_size = 0
+        try:
+            async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                body.write(chunk)
+                body_size += len(chunk)
+            # Parsing large exports can take a while, so don't block the event loop.
+            return await asyncio.to_thread(Export.from_body, body, body_size, extension)
+        except BaseException:
+            body.close()
+            raise
+
     @metabase_group.command(name="publish", aliases=("share",))
     async def metabase_publish(self, ctx: Context, question_id: int) -> None:
         """Publically shares the given question and posts the link."""
@@ -183,8 +487,9 @@ class Metabase(Cog):
         return all(checks)
 
     async def cog_unload(self) -> None:
-        """Cancel all scheduled tasks."""
+        """Cancel all scheduled tasks, and drop the stored exports."""
         self._session_scheduler.cancel_all()
+        self.exports.clear()
 
 
 async def setup(bot: Bot) -> None:
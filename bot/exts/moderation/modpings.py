@@ -1,13 +1,15 @@
 import asyncio
 import datetime
+from collections.abc import Iterable
+from typing import NamedTuple
 
 import arrow
 from async_rediscache import RedisCache
 from dateutil.parser import isoparse, parse as dateutil_parse
 from discord import Member
 from discord.ext.commands import Cog, Context, group, has_any_role
+from pydis_core.utils import scheduling
 from pydis_core.utils.members import get_or_fetch_member
-from pydis_core.utils.scheduling import Scheduler
 
 from bot.bot import Bot
 from bot.constants import Emojis, Guild, MODERATION_ROLES, Roles
@@ -19,6 +21,67 @@ log = get_logger(__name__)
 
 MAXIMUM_WORK_LIMIT = 16
 
+# The number of moderators whose roles are edited, or who are fetched, at once.
+MAX_CONCURRENT_ROLE_EDITS = 5
+
+SCHEDULE_PERIOD = datetime.timedelta(days=1)
+
+# How long to wait before retrying to reconcile the role of a moderator, after failing to edit it or to reconcile it.
+RECONCILE_RETRY_DELAY = datetime.timedelta(minutes=1)
+
+
+class RoleState(NamedTuple):
+    """Whether a moderator should have the pingable role, and when that could next change."""
+
+    pingable: bool | None  # None when nothing decides whether they should have the role yet.
+    next_change: datetime.datetime | None
+
+
+class Reconciliation(NamedTuple):
+    """The outcome of a reconciliation of the moderators' roles."""
+
+    edited: int
+    skipped: int
+
+
+def _as_utc(timestamp: datetime.datetime) -> datetime.datetime:
+    """Return `timestamp` as an aware datetime, assuming it's in UTC if it's naïve."""
+    return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=datetime.UTC)
+
+
+def parse_schedule(schedule: str) -> tuple[datetime.datetime, float]:
+    """Return the start and the work time in seconds of a schedule, as stored in the cache."""
+    start_timestamp, work_time = schedule.split("|")
+    return datetime.datetime.fromtimestamp(float(start_timestamp), tz=datetime.UTC), float(work_time)
+
+
+def role_state(
+    now: datetime.datetime,
+    pings_off_until: datetime.datetime | None,
+    schedule: tuple[datetime.datetime, float] | None,
+) -> RoleState:
+    """
+    Return whether a moderator should have the pingable role at `now`, and when that could next change.
+
+    Turning pings off takes precedence over the schedule. Without either, the moderator should have the role.
+    A schedule only decides whether the moderator should have the role once it has first started.
+    """
+    if pings_off_until is not None and pings_off_until > now:
+        return RoleState(False, pings_off_until)
+
+    if schedule is None:
+        return RoleState(True, None)
+
+    start, work_time = schedule
+    if now < start:
+        return RoleState(None, start)
+
+    elapsed = (now - start) % SCHEDULE_PERIOD
+    work_time = datetime.timedelta(seconds=work_time)
+    if elapsed < work_time:
+        return RoleState(True, now - elapsed + work_time)
+    return RoleState(False, now - elapsed + SCHEDULE_PERIOD)
+
 
 class ModPings(Cog):
     """Commands for a moderator to turn moderator pings on and off."""
@@ -35,104 +98,185 @@ class ModPings(Cog):
 
     def __init__(self, bot: Bot):
         self.bot = bot
-        self._role_scheduler = Scheduler("ModPingsOnOff")
-        self._modpings_scheduler = Scheduler("ModPingsSchedule")
+
+        # The next time at which each moderator's role could need to change, all driven by a single timer.
+        self._next_changes: dict[int, datetime.datetime] = {}
+        self._timer: asyncio.Task | None = None
+        self._edit_semaphore = asyncio.Semaphore(MAX_CONCURRENT_ROLE_EDITS)
 
         self.guild = None
         self.moderators_role = None
 
     async def cog_load(self) -> None:
-        """Schedule both when to reapply role and all mod ping schedules."""
-        # await self.reschedule_modpings_schedule()
-        await self.reschedule_roles()
+        """Bring the moderators' roles in line with their pings off periods and schedules."""
+        await self.reconcile_roles()
+
+    async def _get_state(self) -> tuple[dict[int, datetime.datetime], dict[int, tuple[datetime.datetime, float]]]:
+        """Return the pings off periods and the schedules of the moderators, parsed from the caches."""
+        pings_off = await self.pings_off_mods.to_dict()
+        schedules = await self.modpings_schedule.to_dict()
+        return (
+            {mod_id: _as_utc(isoparse(expiry)) for mod_id, expiry in pings_off.items()},
+            {mod_id: parse_schedule(schedule) for mod_id, schedule in schedules.items()},
+        )
+
+    async def _fetch_mods(self, mod_ids: Iterable[int]) -> dict[int, Member | None]:
+        """Fetch the members with `mod_ids` concurrently, mapping the IDs of those who aren't moderators to None."""
+        async def fetch(mod_id: int) -> Member | None:
+            async with self._edit_semaphore:
+                mod = await get_or_fetch_member(self.guild, mod_id)
+            return mod if mod is not None and mod.get_role(Roles.mod_team) is not None else None
+
+        mod_ids = list(mod_ids)
+        return dict(zip(mod_ids, await asyncio.gather(*map(fetch, mod_ids)), strict=True))
 
-    async def reschedule_roles(self) -> None:
-        """Reschedule moderators role re-apply times."""
+    async def reconcile_roles(self) -> Reconciliation:
+        """
+        Bring the roles of the whole mod team in line with their pings off periods and schedules.
+
+        Moderators who have the pingable role despite being in the pings off cache are assumed to have been given
+        the role manually while the bot was down, so they're removed from the cache.
+        """
         await self.bot.wait_until_guild_available()
         self.guild = self.bot.get_guild(Guild.id)
         self.moderators_role = self.guild.get_role(Roles.moderators)
 
-        mod_team = self.guild.get_role(Roles.mod_team)
-        pings_on = self.moderators_role.members
-        pings_off = await self.pings_off_mods.to_dict()
+        pings_off, schedules = await self._get_state()
+        mods = {mod.id: mod for mod in self.guild.get_role(Roles.mod_team).members}
+
+        # The discord.py cache could be missing members, or the IDs could belong to former moderators.
+        missing = (pings_off.keys() | schedules.keys()) - mods.keys()
+        for mod_id, mod in (await self._fetch_mods(missing)).items():
+            if mod is not None:
+                mods[mod_id] = mod
+            elif mod_id in pings_off:
+                await self.pings_off_mods.delete(mod_id)
+                del pings_off[mod_id]
+
+        for mod in mods.values():
+            if mod.id in pings_off and mod.get_role(Roles.moderators) is not None:
+                await self.pings_off_mods.delete(mod.id)
+                del pings_off[mod.id]
+
+        return await self._reconcile(mods.values(), pings_off, schedules)
+
+    async def _reconcile(
+        self,
+        mods: Iterable[Member],
+        pings_off: dict[int, datetime.datetime],
+        schedules: dict[int, tuple[datetime.datetime, float]],
+    ) -> Reconciliation:
+        """
+        Apply the roles `mods` should have, only editing those which differ, and re-arm the timer.
 
-        log.trace("Applying the moderators role to the mod team where necessary.")
-        for mod in mod_team.members:
-            if mod in pings_on:  # Make sure that on-duty mods aren't in the redis cache.
-                if mod.id in pings_off:
+        Expired pings off periods are removed from the cache once the role is restored. Failed edits are retried
+        after `RECONCILE_RETRY_DELAY`, and the expired periods of those moderators are kept until then.
+        """
+        now = arrow.utcnow().datetime
+        edited_mods = []
+        edits = []
+        skipped = 0
+
+        for mod in mods:
+            state = role_state(now, pings_off.get(mod.id), schedules.get(mod.id))
+            if state.next_change is None:
+                self._next_changes.pop(mod.id, None)
+            else:
+                self._next_changes[mod.id] = state.next_change
+
+            if state.pingable is None or state.pingable == (mod.get_role(Roles.moderators) is not None):
+                skipped += 1
+                if mod.id in pings_off and pings_off[mod.id] <= now:
                     await self.pings_off_mods.delete(mod.id)
-                continue
+            else:
+                edited_mods.append(mod)
+                edits.append(self._edit_role(mod, pingable=state.pingable, scheduled=mod.id in schedules))
+
+        failed = 0
+        retry_at = now + RECONCILE_RETRY_DELAY
+        for mod, result in zip(edited_mods, await asyncio.gather(*edits, return_exceptions=True), strict=True):
+            if isinstance(result, Exception):
+                log.error(f"Failed to edit the moderators role of {mod} ({mod.id}), retrying later.", exc_info=result)
+                failed += 1
+                self._next_changes[mod.id] = min(self._next_changes.get(mod.id, retry_at), retry_at)
+            elif mod.id in pings_off and pings_off[mod.id] <= now:
+                await self.pings_off_mods.delete(mod.id)
+
+        reconciliation = Reconciliation(edited=len(edits) - failed, skipped=skipped)
+        log.info(
+            f"Reconciled the moderators role: {reconciliation.edited} role edits made, "
+            f"{reconciliation.skipped} skipped."
+        )
 
-            # Keep the role off only for those in the redis cache.
-            if mod.id not in pings_off:
-                await self.reapply_role(mod)
+        self._arm_timer()
+        return reconciliation
+
+    async def _edit_role(self, mod: Member, *, pingable: bool, scheduled: bool) -> None:
+        """Add or remove the moderators role of `mod`."""
+        async with self._edit_semaphore:
+            if pingable:
+                log.trace(f"Applying moderator role to mod with ID {mod.id}")
+                reason = "Moderator scheduled time started!" if scheduled else "Pings off period expired."
+                await mod.add_roles(self.moderators_role, reason=reason)
             else:
-                expiry = isoparse(pings_off[mod.id])
-                self._role_scheduler.schedule_at(expiry, mod.id, self.reapply_role(mod))
+                log.trace(f"Removing moderator role from mod with ID {mod.id}")
+                reason = "Moderator schedule time expired." if scheduled else "Pings off period started."
+                await mod.remove_roles(self.moderators_role, reason=reason)
 
-        # At this stage every entry in `pings_off` is expected to have a scheduled task, but that might not be the case
-        # if the discord.py cache is missing members, or if the ID belongs to a former moderator.
-        for mod_id, expiry_iso in pings_off.items():
-            if mod_id not in self._role_scheduler:
-                mod = await get_or_fetch_member(self.guild, mod_id)
-                # Make sure the member is still a moderator and doesn't have the pingable role.
-                if mod is None or mod.get_role(Roles.mod_team) is None or mod.get_role(Roles.moderators) is not None:
-                    await self.pings_off_mods.delete(mod_id)
-                else:
-                    self._role_scheduler.schedule_at(isoparse(expiry_iso), mod_id, self.reapply_role(mod))
-
-    async def reschedule_modpings_schedule(self) -> None:
-        """Reschedule moderators schedule ping."""
-        await self.bot.wait_until_guild_available()
-        schedule_cache = await self.modpings_schedule.to_dict()
-
-        log.info("Scheduling modpings schedule for applicable moderators found in cache.")
-        for mod_id, schedule in schedule_cache.items():
-            start_timestamp, work_time = schedule.split("|")
-            start = datetime.datetime.fromtimestamp(float(start_timestamp), tz=datetime.UTC)
-
-            mod = await self.bot.fetch_user(mod_id)
-            self._modpings_scheduler.schedule_at(
-                start,
-                mod_id,
-                self.add_role_schedule(mod, work_time, start)
-            )
+    def _arm_timer(self) -> None:
+        """Start the timer for the earliest next change of any moderator's role, replacing the current one."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
 
-    async def remove_role_schedule(self, mod: Member, work_time: int, schedule_start: datetime.datetime) -> None:
-        """Removes the moderator's role to the given moderator."""
-        log.trace(f"Removing moderator role from mod with ID {mod.id}")
-        await mod.remove_roles(self.moderators_role, reason="Moderator schedule time expired.")
-
-        # Remove the task before scheduling it again
-        self._modpings_scheduler.cancel(mod.id)
-
-        # Add the task again
-        log.trace(f"Adding mod pings schedule task again for mod with ID {mod.id}")
-        schedule_start += datetime.timedelta(days=1)
-        self._modpings_scheduler.schedule_at(
-            schedule_start,
-            mod.id,
-            self.add_role_schedule(mod, work_time, schedule_start)
-        )
+        if self._next_changes:
+            self._timer = scheduling.create_task(self._wait_for_change(min(self._next_changes.values())))
 
-    async def add_role_schedule(self, mod: Member, work_time: int, schedule_start: datetime.datetime) -> None:
-        """Adds the moderator's role to the given moderator."""
-        # If the moderator has pings off, then skip adding role
-        if mod.id in await self.pings_off_mods.to_dict():
-            log.trace(f"Skipping adding moderator role to mod with ID {mod.id} - found in pings off cache.")
-        else:
-            log.trace(f"Applying moderator role to mod with ID {mod.id}")
-            await mod.add_roles(self.moderators_role, reason="Moderator scheduled time started!")
+    async def _wait_for_change(self, at: datetime.datetime) -> None:
+        """
+        Wait until `at`, and reconcile the roles of the moderators whose role could change by then.
 
-        log.trace(f"Sleeping for {work_time} seconds, worktime for mod with ID {mod.id}")
-        await asyncio.sleep(work_time)
-        await self.remove_role_schedule(mod, work_time, schedule_start)
+        If the reconciliation fails, it's retried for those moderators after `RECONCILE_RETRY_DELAY`.
+        """
+        await asyncio.sleep((at - arrow.utcnow().datetime).total_seconds())
+        # This task is done with the timer, so re-arming it mustn't cancel this task.
+        self._timer = None
+
+        now = arrow.utcnow().datetime
+        due = [mod_id for mod_id, next_change in self._next_changes.items() if next_change <= now]
+        for mod_id in due:
+            del self._next_changes[mod_id]
+
+        try:
+            mods = [mod for mod in (await self._fetch_mods(due)).values() if mod is not None]
+            pings_off, schedules = await self._get_state()
+            await self._reconcile(mods, pings_off, schedules)
+        except Exception:
+            log.exception(f"Failed to reconcile the moderators role of {len(due)} moderators, retrying later.")
+            # Moderators whose next change was set again in the meantime already have a valid one.
+            retry_at = now + RECONCILE_RETRY_DELAY
+            for mod_id in due:
+                self._next_changes.setdefault(mod_id, retry_at)
+        finally:
+            # A successful reconciliation has already re-armed the timer.
+            if self._timer is None:
+                self._arm_timer()
+
+    async def _update_next_change(self, mod_id: int) -> None:
+        """Update the time at which the role of the moderator with `mod_id` could next change, after a command."""
+        pings_off_until = await self.pings_off_mods.get(mod_id)
+        schedule = await self.modpings_schedule.get(mod_id)
+        state = role_state(
+            arrow.utcnow().datetime,
+            _as_utc(isoparse(pings_off_until)) if pings_off_until else None,
+            parse_schedule(schedule) if schedule else None,
+        )
 
-    async def reapply_role(self, mod: Member) -> None:
-        """Reapply the moderator's role to the given moderator."""
-        log.trace(f"Re-applying role to mod with ID {mod.id}.")
-        await mod.add_roles(self.moderators_role, reason="Pings off period expired.")
-        await self.pings_off_mods.delete(mod.id)
+        if state.next_change is None:
+            self._next_changes.pop(mod_id, None)
+        else:
+            self._next_changes[mod_id] = state.next_change
+        self._arm_timer()
 
     @group(name="modpings", aliases=("modping",), invoke_without_command=True)
     @has_any_role(*MODERATION_ROLES)
@@ -171,11 +315,7 @@ class ModPings(Cog):
         await mod.remove_roles(self.moderators_role, reason=f"Turned pings off until {until_date}.")
 
         await self.pings_off_mods.set(mod.id, duration.isoformat())
-
-        # Allow rescheduling the task without cancelling it separately via the `on` command.
-        if mod.id in self._role_scheduler:
-            self._role_scheduler.cancel(mod.id)
-        self._role_scheduler.schedule_at(duration, mod.id, self.reapply_role(mod))
+        await self._update_next_change(mod.id)
 
         await ctx.send(
             f"{Emojis.check_mark} Moderators role has been removed "
@@ -194,9 +334,7 @@ class ModPings(Cog):
         await mod.add_roles(self.moderators_role, reason="Pings off period canceled.")
 
         await self.pings_off_mods.delete(mod.id)
-
-        # We assume the task exists. Lack of it may indicate a bug.
-        self._role_scheduler.cancel(mod.id)
+        await self._update_next_change(mod.id)
 
         await ctx.send(f"{Emojis.check_mark} Moderators role has been re-applied.")
 
@@ -228,15 +366,7 @@ class ModPings(Cog):
         work_time = (end - start).total_seconds()
 
         await self.modpings_schedule.set(ctx.author.id, f"{start.timestamp()}|{work_time}")
-
-        if ctx.author.id in self._modpings_scheduler:
-            self._modpings_scheduler.cancel(ctx.author.id)
-
-        self._modpings_scheduler.schedule_at(
-            start,
-            ctx.author.id,
-            self.add_role_schedule(ctx.author, work_time, start)
-        )
+        await self._update_next_change(ctx.author.id)
 
         await ctx.send(
             f"{Emojis.ok_hand} {ctx.author.mention} Scheduled mod pings from "
@@ -247,15 +377,15 @@ class ModPings(Cog):
     @schedule_modpings.command(name="delete", aliases=("del", "d"))
     async def modpings_schedule_delete(self, ctx: Context) -> None:
         """Delete your modpings schedule."""
-        self._modpings_scheduler.cancel(ctx.author.id)
         await self.modpings_schedule.delete(ctx.author.id)
+        await self._update_next_change(ctx.author.id)
         await ctx.send(f"{Emojis.ok_hand} {ctx.author.mention} Deleted your modpings schedule!")
 
     async def cog_unload(self) -> None:
-        """Cancel role tasks when the cog unloads."""
-        log.trace("Cog unload: cancelling all scheduled tasks.")
-        self._role_scheduler.cancel_all()
-        self._modpings_scheduler.cancel_all()
+        """Cancel the timer for role changes when the cog unloads."""
+        log.trace("Cog unload: cancelling the role change timer.")
+        if self._timer is not None:
+            self._timer.cancel()
 
 
 async def setup(bot: Bot) -> None:
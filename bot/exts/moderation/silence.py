@@ -1,10 +1,14 @@
+import asyncio
 import json
 from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Iterable
 from contextlib import suppress
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
+from time import perf_counter
 
 from async_rediscache import RedisCache
-from discord import Guild, PermissionOverwrite, TextChannel, Thread, VoiceChannel
+from discord import Guild, Member, PermissionOverwrite, TextChannel, Thread, VoiceChannel
 from discord.ext import commands, tasks
 from discord.ext.commands import Context
 from discord.utils import MISSING
@@ -34,6 +38,11 @@ MSG_UNSILENCE_SUCCESS = f"{constants.Emojis.check_mark} unsilenced {{channel}}."
 
 TextOrVoiceChannel = TextChannel | VoiceChannel
 
+# The maximum number of members being moved between voice channels at the same time.
+# discord.py waits out rate limits, so this mostly bounds how many requests queue up behind one.
+MAX_CONCURRENT_VOICE_MOVES = 5
+MODERATION_ROLE_IDS = frozenset(constants.MODERATION_ROLES)
+
 VOICE_CHANNELS = {
     constants.Channels.code_help_voice_0: constants.Channels.code_help_chat_0,
     constants.Channels.code_help_voice_1: constants.Channels.code_help_chat_1,
@@ -43,6 +52,55 @@ VOICE_CHANNELS = {
 }
 
 
+@dataclass
+class VoiceMoveResult:
+    """The outcome of moving the members of a voice channel."""
+
+    moved: int = 0
+    failed: list[Member] = field(default_factory=list)
+
+
+def _is_moderator(member: Member) -> bool:
+    """Return True if `member` has any of the moderation roles."""
+    return not MODERATION_ROLE_IDS.isdisjoint(role.id for role in member.roles)
+
+
+async def _move_members(
+    members: Iterable[Member],
+    move: Callable[[Member], Awaitable[None]],
+    description: str,
+) -> VoiceMoveResult:
+    """
+    Concurrently `move` each of the non-staff `members`, up to `MAX_CONCURRENT_VOICE_MOVES` at a time.
+
+    Failures are logged in aggregate, rather than interrupting the other moves.
+    """
+    members = [member for member in members if not _is_moderator(member)]
+    result = VoiceMoveResult()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_VOICE_MOVES)
+    start = perf_counter()
+
+    async def move_member(member: Member) -> None:
+        async with semaphore:
+            try:
+                await move(member)
+            except Exception as e:
+                log.debug(f"Failed to move {member.name}. Reason: {e}")
+                result.failed.append(member)
+            else:
+                result.moved += 1
+
+    await asyncio.gather(*(move_member(member) for member in members))
+
+    log.debug(
+        f"{description}: moved {result.moved}/{len(members)} members in {perf_counter() - start:.2f}s, "
+        f"{len(result.failed)} failed."
+    )
+    if result.failed:
+        log.info(f"{description}: failed to move {', '.join(member.name for member in result.failed)}.")
+    return result
+
+
 class SilenceNotifier(tasks.Loop):
     """Loop notifier for posting notices to `alert_channel` containing added channels."""
 
@@ -191,9 +249,15 @@ class Silence(commands.Cog):
 
         if isinstance(channel, VoiceChannel):
             if kick:
-                await self._kick_voice_members(channel)
+                result = await self._kick_voice_members(channel)
             else:
-                await self._force_voice_sync(channel)
+                result = await self._force_voice_sync(channel)
+
+            if result.failed:
+                await ctx.send(
+                    f"{constants.Emojis.cross_mark} Failed to move {len(result.failed)} member(s) "
+                    f"out of {len(result.failed) + result.moved} in {channel.mention}."
+                )
 
         await self._schedule_unsilence(ctx, channel, duration)
 
@@ -388,25 +452,17 @@ class Silence(commands.Cog):
         return afk_channel
 
     @staticmethod
-    async def _kick_voice_members(channel: VoiceChannel) -> None:
+    async def _kick_voice_members(channel: VoiceChannel) -> VoiceMoveResult:
         """Remove all non-staff members from a voice channel."""
         log.debug(f"Removing all non staff members from #{channel.name} ({channel.id}).")
 
-        for member in channel.members:
-            # Skip staff
-            if any(role.id in constants.MODERATION_ROLES for role in member.roles):
-                continue
-
-            try:
-                await member.move_to(None, reason="Kicking member from voice channel.")
-                log.trace(f"Kicked {member.name} from voice channel.")
-            except Exception as e:
-                log.debug(f"Failed to move {member.name}. Reason: {e}")
-                continue
+        async def kick(member: Member) -> None:
+            await member.move_to(None, reason="Kicking member from voice channel.")
+            log.trace(f"Kicked {member.name} from voice channel.")
 
-        log.debug("Removed all members.")
+        return await _move_members(channel.members, kick, f"Kicking members from #{channel.name}")
 
-    async def _force_voice_sync(self, channel: VoiceChannel) -> None:
+    async def _force_voice_sync(self, channel: VoiceChannel) -> VoiceMoveResult:
         """
         Move all non-staff members from `channel` to a temporary channel and back to force toggle role mute.
 
@@ -416,23 +472,16 @@ class Silence(commands.Cog):
         delete_channel = channel.guild.afk_channel is None
         afk_channel = await self._get_afk_channel(channel.guild)
 
-        try:
-            # Move all members to temporary channel and back
-            for member in channel.members:
-                # Skip staff
-                if any(role.id in constants.MODERATION_ROLES for role in member.roles):
-                    continue
+        async def sync(member: Member) -> None:
+            await member.move_to(afk_channel, reason="Muting VC member.")
+            log.trace(f"Moved {member.name} to afk channel.")
 
-                try:
-                    await member.move_to(afk_channel, reason="Muting VC member.")
-                    log.trace(f"Moved {member.name} to afk channel.")
-
-                    await member.move_to(channel, reason="Muting VC member.")
-                    log.trace(f"Moved {member.name} to original voice channel.")
-                except Exception as e:
-                    log.debug(f"Failed to move {member.name}. Reason: {e}")
-                    continue
+            await member.move_to(channel, reason="Muting VC member.")
+            log.trace(f"Moved {member.name} to original voice channel.")
 
+        try:
+            # Move all members to temporary channel and back
+            return await _move_members(channel.members, sync, f"Syncing members of #{channel.name}")
         finally:
             # Delete VC channel if it was created.
             if delete_channel:
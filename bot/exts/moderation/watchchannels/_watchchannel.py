@@ -2,8 +2,9 @@ import asyncio
 import re
 import textwrap
 from abc import abstractmethod
-from collections import defaultdict, deque
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
+from time import monotonic
 from typing import Any
 
 import discord
@@ -28,16 +29,30 @@ log = get_logger(__name__)
 
 URL_RE = re.compile(r"(https?://[^\s]+)")
 
+# Maximum number of watched users whose messages are being relayed at once.
+MAX_CONCURRENT_LANES = 4
+
+# Seconds for which the display name of an actor is cached for the header embeds.
+ACTOR_CACHE_TTL = 60 * 60
+
 
 @dataclass
 class MessageHistory:
-    """Represents a watch channel's message history."""
+    """Represents the history of the messages relayed to the watch channel since the last header."""
 
     last_author: int | None = None
     last_channel: int | None = None
     message_count: int = 0
 
 
+@dataclass
+class RelayLane:
+    """The messages of a watched user waiting to be relayed, along with the time they were queued."""
+
+    messages: deque[tuple[float, Message]] = field(default_factory=deque)
+    task: asyncio.Task | None = None
+
+
 class WatchChannel(metaclass=CogABCMeta):
     """ABC with functionality for relaying users' messages to a certain channel."""
 
@@ -61,33 +76,29 @@ class WatchChannel(metaclass=CogABCMeta):
         self.api_default_params = api_default_params  # E.g., {'active': 'true', 'type': 'watch'}
         self.log = logger  # Logger of the child cog for a correct name in the logs
 
-        self._consume_task = None
         self.watched_users = {}
-        self.message_queue = defaultdict(lambda: defaultdict(deque))
-        self.consumption_queue = {}
+        self.lanes: dict[int, RelayLane] = {}  # Watched user ID -> the user's messages waiting to be relayed.
+        self._lane_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LANES)
+        # Held while sending a message to the webhook, along with its header and attachments,
+        # so that another user's message can't come between a message and what belongs with it.
+        self._webhook_lock = asyncio.Lock()
+        self.message_history = MessageHistory()
+        self._actor_names: dict[int, tuple[float, str]] = {}
         self.retries = 5
         self.retry_delay = 10
         self.channel = None
         self.webhook = None
-        self.message_history = MessageHistory()
         self.disable_header = disable_header
 
     @property
-    def consuming_messages(self) -> bool:
-        """Checks if a consumption task is currently running."""
-        if self._consume_task is None:
-            return False
-
-        if self._consume_task.done():
-            exc = self._consume_task.exception()
-            if exc:
-                self.log.exception(
-                    "The message queue consume task has failed with:",
-                    exc_info=exc
-                )
-            return False
+    def queue_depth(self) -> int:
+        """Return the number of messages waiting to be relayed."""
+        return sum(len(lane.messages) for lane in self.lanes.values())
 
-        return True
+    @property
+    def metrics_prefix(self) -> str:
+        """Return the prefix of the watch channel's metrics."""
+        return f"watchchannels.{self.__class__.__name__.lower()}"
 
     async def cog_load(self) -> None:
         """Starts the watch channel by getting the channel, webhook, and user cache ready."""
@@ -164,45 +175,52 @@ class WatchChannel(metaclass=CogABCMeta):
 
     @Cog.listener()
     async def on_message(self, msg: Message) -> None:
-        """Queues up messages sent by watched users."""
+        """Queues up messages sent by watched users in their lane."""
         if msg.author.id in self.watched_users:
-            if not self.consuming_messages:
-                self._consume_task = scheduling.create_task(self.consume_messages())
-
             self.log.trace(f"Received message: {msg.content} ({len(msg.attachments)} attachments)")
-            self.message_queue[msg.author.id][msg.channel.id].append(msg)
 
-    async def consume_messages(self, delay_consumption: bool = True) -> None:
-        """Consumes the message queues to log watched users' messages."""
-        if delay_consumption:
-            self.log.trace(f"Sleeping {BigBrotherConfig.log_delay} seconds before consuming message queue")
-            await asyncio.sleep(BigBrotherConfig.log_delay)
+            lane = self.lanes.setdefault(msg.author.id, RelayLane())
+            lane.messages.append((monotonic(), msg))
+            # If the previous consumption of the lane failed, its remaining messages are consumed with the new ones.
+            if lane.task is None or lane.task.done():
+                lane.task = scheduling.create_task(self.consume_lane(msg.author.id, lane))
 
-        self.log.trace("Started consuming the message queue")
+            self.bot.metrics.gauge(f"{self.metrics_prefix}.queue_depth", self.queue_depth)
 
-        # If the previous consumption Task failed, first consume the existing comsumption_queue
-        if not self.consumption_queue:
-            self.consumption_queue = self.message_queue.copy()
-            self.message_queue.clear()
+    async def consume_lane(self, user_id: int, lane: RelayLane) -> None:
+        """
+        Relay the messages in the lane of the watched user with `user_id`, in the order they were sent.
 
-        for user_id, channel_queues in self.consumption_queue.items():
-            for channel_queue in channel_queues.values():
-                while channel_queue:
-                    msg = channel_queue.popleft()
+        The lanes of different users are consumed concurrently, up to `MAX_CONCURRENT_LANES` at once, each taking
+        a turn of up to a header's worth of messages so that a busy user doesn't hold up the others for too long.
+        The webhook is only held while relaying each message, so the users' messages may be interleaved;
+        a header is sent whenever the author changes, so each message is attributed to the right user.
+        """
+        self.log.trace(f"Sleeping {BigBrotherConfig.log_delay} seconds before consuming the lane of {user_id}")
+        await asyncio.sleep(BigBrotherConfig.log_delay)
 
-                    if watch_info := self.watched_users.get(user_id, None):
-                        self.log.trace(f"Consuming message {msg.id} ({len(msg.attachments)} attachments)")
-                        await self.relay_message(msg, watch_info)
-                    else:
-                        self.log.trace(f"Not consuming message {msg.id} as user {user_id} is no longer watched.")
+        while lane.messages:
+            async with self._lane_semaphore:
+                if not (watch_info := self.watched_users.get(user_id)):
+                    self.log.trace(f"Not consuming the messages of {user_id}, who is no longer watched.")
+                    lane.messages.clear()
+                    break
 
-        self.consumption_queue.clear()
+                if not self.disable_header:
+                    # Look the actor up before the header is sent, so that the webhook isn't held while it's fetched.
+                    await self.get_actor_name(watch_info["actor"])
 
-        if self.message_queue:
-            self.log.trace("Channel queue not empty: Continuing consuming queues")
-            self._consume_task = scheduling.create_task(self.consume_messages(delay_consumption=False))
-        else:
-            self.log.trace("Done consuming messages.")
+                for _ in range(min(len(lane.messages), BigBrotherConfig.header_message_limit)):
+                    queued_at, msg = lane.messages.popleft()
+                    self.log.trace(f"Consuming message {msg.id} ({len(msg.attachments)} attachments)")
+                    await self.relay_message(msg, watch_info)
+                    self.bot.metrics.timing(f"{self.metrics_prefix}.relay_lag", (monotonic() - queued_at) * 1000)
+
+            self.bot.metrics.gauge(f"{self.metrics_prefix}.queue_depth", self.queue_depth)
+
+        # Messages queued from now on will start a new lane.
+        del self.lanes[user_id]
+        self.log.trace(f"Done consuming the lane of {user_id}.")
 
     async def webhook_send(
         self,
@@ -222,18 +240,12 @@ class WatchChannel(metaclass=CogABCMeta):
             )
 
     async def relay_message(self, msg: Message, watch_info: dict) -> None:
-        """Relays the message to the relevant watch channel."""
-        limit = BigBrotherConfig.header_message_limit
-
-        if (
-            msg.author.id != self.message_history.last_author
-            or msg.channel.id != self.message_history.last_channel
-            or self.message_history.message_count >= limit
-        ):
-            self.message_history = MessageHistory(last_author=msg.author.id, last_channel=msg.channel.id)
-
-            await self.send_header(msg, watch_info)
+        """
+        Relays the message to the relevant watch channel.
 
+        A header is sent whenever the previous relayed message was of another user or from another channel,
+        and once `header_message_limit` messages were relayed since the last one.
+        """
         if DiscordTokenFilter.find_token_in_message(msg.content) or WEBHOOK_URL_RE.search(msg.content):
             cleaned_content = "Content is censored because it contains a bot or webhook token."
         elif cleaned_content := msg.clean_content:
@@ -243,42 +255,52 @@ class WatchChannel(metaclass=CogABCMeta):
                 if url not in media_urls:
                     cleaned_content = cleaned_content.replace(url, f"`{url}`")
 
-        if cleaned_content:
-            await self.webhook_send(
-                cleaned_content,
-                username=msg.author.display_name,
-                avatar_url=msg.author.display_avatar.url
-            )
-
-        if msg.attachments:
-            try:
-                await messages.send_attachments(msg, self.webhook)
-            except (errors.Forbidden, errors.NotFound):
-                e = Embed(
-                    description=":x: **This message contained an attachment, but it could not be retrieved**",
-                    color=Color.red()
-                )
+        async with self._webhook_lock:
+            history = self.message_history
+            if (
+                msg.author.id != history.last_author
+                or msg.channel.id != history.last_channel
+                or history.message_count >= BigBrotherConfig.header_message_limit
+            ):
+                history.last_author = msg.author.id
+                history.last_channel = msg.channel.id
+                history.message_count = 0
+                await self.send_header(msg, watch_info)
+
+            if cleaned_content:
                 await self.webhook_send(
-                    embed=e,
+                    cleaned_content,
                     username=msg.author.display_name,
                     avatar_url=msg.author.display_avatar.url
                 )
-            except discord.HTTPException as exc:
-                self.log.exception(
-                    "Failed to send an attachment to the webhook",
-                    exc_info=exc
-                )
 
-        self.message_history.message_count += 1
+            if msg.attachments:
+                try:
+                    await messages.send_attachments(msg, self.webhook)
+                except (errors.Forbidden, errors.NotFound):
+                    e = Embed(
+                        description=":x: **This message contained an attachment, but it could not be retrieved**",
+                        color=Color.red()
+                    )
+                    await self.webhook_send(
+                        embed=e,
+                        username=msg.author.display_name,
+                        avatar_url=msg.author.display_avatar.url
+                    )
+                except discord.HTTPException as exc:
+                    self.log.exception(
+                        "Failed to send an attachment to the webhook",
+                        exc_info=exc
+                    )
+
+            history.message_count += 1
 
     async def send_header(self, msg: Message, watch_info: dict) -> None:
         """Sends a header embed with information about the relayed messages to the watch channel."""
         if self.disable_header:
             return
 
-        guild = self.bot.get_guild(GuildConfig.id)
-        actor = await get_or_fetch_member(guild, watch_info["actor"])
-        actor = actor.display_name if actor else watch_info["actor"]
+        actor = await self.get_actor_name(watch_info["actor"])
 
         inserted_at = watch_info["inserted_at"]
         time_delta = time.format_relative(inserted_at)
@@ -297,6 +319,18 @@ class WatchChannel(metaclass=CogABCMeta):
 
         await self.webhook_send(embed=embed, username=msg.author.display_name, avatar_url=msg.author.display_avatar.url)
 
+    async def get_actor_name(self, actor_id: int) -> str:
+        """Return the display name of the member with `actor_id`, or the ID if they aren't a member."""
+        if (cached := self._actor_names.get(actor_id)) and monotonic() - cached[0] < ACTOR_CACHE_TTL:
+            return cached[1]
+
+        guild = self.bot.get_guild(GuildConfig.id)
+        actor = await get_or_fetch_member(guild, actor_id)
+        name = actor.display_name if actor else str(actor_id)
+
+        self._actor_names[actor_id] = (monotonic(), name)
+        return name
+
     async def list_watched_users(
         self, ctx: Context, oldest_first: bool = False, update_cache: bool = True
     ) -> None:
@@ -370,17 +404,11 @@ class WatchChannel(metaclass=CogABCMeta):
         self.watched_users.pop(user_id, None)
 
     async def cog_unload(self) -> None:
-        """Takes care of unloading the cog and canceling the consumption task."""
+        """Takes care of unloading the cog and canceling the consumption tasks."""
         self.log.trace("Unloading the cog")
-        if self._consume_task and not self._consume_task.done():
-            def done_callback(task: asyncio.Task) -> None:
-                """Send exception when consuming task have been cancelled."""
-                try:
-                    task.result()
-                except asyncio.CancelledError:
-                    self.log.info(
-                        f"The consume task of {type(self).__name__} was canceled. Messages may be lost."
-                    )
+        if queue_depth := self.queue_depth:
+            self.log.info(f"The lanes of {type(self).__name__} were cancelled. {queue_depth} messages are lost.")
 
-            self._consume_task.add_done_callback(done_callback)
-            self._consume_task.cancel()
+        for lane in self.lanes.values():
+            lane.task.cancel()
+        self.lanes.clear()
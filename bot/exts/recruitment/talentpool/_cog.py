@@ -5,7 +5,17 @@ from io import StringIO
 
 import discord
 from async_rediscache import RedisCache
-from discord import Color, Embed, Member, PartialMessage, RawReactionActionEvent, User, app_commands
+from discord import (
+    Color,
+    Embed,
+    Member,
+    PartialMessage,
+    RawBulkMessageDeleteEvent,
+    RawMessageDeleteEvent,
+    RawReactionActionEvent,
+    User,
+    app_commands,
+)
 from discord.ext import commands, tasks
 from discord.ext.commands import BadArgument, Cog, Context, group, has_any_role
 from pydis_core.site_api import ResponseCodeError
@@ -17,7 +27,7 @@ from bot.bot import Bot
 from bot.constants import Bot as BotConfig, Channels, Emojis, Guild, MODERATION_ROLES, Roles, STAFF_ROLES
 from bot.converters import MemberOrUser, UnambiguousMemberOrUser
 from bot.exts.recruitment.talentpool._api import Nomination, NominationAPI
-from bot.exts.recruitment.talentpool._review import Reviewer
+from bot.exts.recruitment.talentpool._review import Reviewer, TICKET_EMOJI
 from bot.log import get_logger
 from bot.pagination import LinePaginator
 from bot.utils import time
@@ -857,10 +867,37 @@ class TalentPool(Cog, name="Talentpool"):
         message: PartialMessage = self.bot.get_channel(payload.channel_id).get_partial_message(payload.message_id)
         emoji = str(payload.emoji)
 
-        if emoji in {Emojis.incident_actioned, Emojis.incident_unactioned}:
+        if emoji == TICKET_EMOJI:
+            await self.reviewer.mark_ticketed(message.id)
+        elif emoji in {Emojis.incident_actioned, Emojis.incident_unactioned}:
             log.info(f"Archiving nomination {message.id}")
             await self.reviewer.archive_vote(message, emoji == Emojis.incident_actioned)
 
+    @Cog.listener()
+    async def on_raw_reaction_remove(self, payload: RawReactionActionEvent) -> None:
+        """Update the state of a review in #nomination-voting when a ticket reaction is removed from it."""
+        if payload.channel_id != Channels.nomination_voting or str(payload.emoji) != TICKET_EMOJI:
+            return
+
+        message = self.bot.get_channel(payload.channel_id).get_partial_message(payload.message_id)
+        await self.reviewer.refresh_ticketed(message)
+
+    @Cog.listener()
+    async def on_raw_message_delete(self, payload: RawMessageDeleteEvent) -> None:
+        """Stop tracking reviews deleted from #nomination-voting."""
+        if payload.channel_id != Channels.nomination_voting:
+            return
+
+        await self.reviewer.forget_reviews(payload.message_id)
+
+    @Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: RawBulkMessageDeleteEvent) -> None:
+        """Stop tracking reviews bulk deleted from #nomination-voting."""
+        if payload.channel_id != Channels.nomination_voting:
+            return
+
+        await self.reviewer.forget_reviews(*payload.message_ids)
+
     async def end_nomination(self, user_id: int, reason: str) -> bool:
         """End the active nomination of a user with the given reason and return True on success."""
         active_nominations = await self.api.get_nominations(user_id, active=True)
@@ -44,6 +44,11 @@ RECENT_ACTIVITY_DAYS = 7
 # The higher this is, the lower the effect of review age. At 1, age and number of entries are weighted equally.
 REVIEW_SCORE_WEIGHT = 1.5
 
+# The reaction which marks a review as ticketed, meaning that it's no longer ongoing.
+TICKET_EMOJI = "\N{TICKET}"
+# The maximum number of users which can be looked up in a single gateway request.
+MEMBER_QUERY_LIMIT = 100
+
 # Regex for finding a nomination, and extracting the nominee.
 NOMINATION_MESSAGE_REGEX = re.compile(
     r"<@!?(\d+)> \(.+(#\d{4})?\) for Helper!\n\n",
@@ -59,9 +64,16 @@ class Reviewer:
     # ]
     status_cache = RedisCache()
 
+    # RedisCache[message_id: int, is_ticketed: bool]
+    # The review messages in the voting channel, and whether they have been ticketed.
+    review_messages = RedisCache()
+
     def __init__(self, bot: Bot, nomination_api: NominationAPI):
         self.bot = bot
         self.api = nomination_api
+        # Whether `review_messages` was synced from the voting channel's history since the cog was loaded.
+        # Events missed while the bot was offline would otherwise leave it out of date for good.
+        self._reviews_synced = False
 
     async def maybe_review_user(self) -> bool:
         """
@@ -87,8 +99,6 @@ class Reviewer:
          - The current number of reviews is lower than `MAX_ONGOING_REVIEWS`.
          - The most recent review was sent less than `MIN_REVIEW_INTERVAL` ago.
         """
-        voting_channel = self.bot.get_channel(Channels.nomination_voting)
-
         last_vote_timestamp = await self.status_cache.get("last_vote_date")
         if last_vote_timestamp:
             last_vote_date = datetime.fromtimestamp(last_vote_timestamp, tz=UTC)
@@ -100,9 +110,37 @@ class Reviewer:
         else:
             log.info("Date of last vote not found in cache, a vote may be sent early")
 
-        ongoing_count = 0
-        total_count = 0
+        reviews = await self.get_review_states()
+        total_count = len(reviews)
+        ongoing_count = sum(not is_ticketed for is_ticketed in reviews.values())
+
+        if ongoing_count >= MAX_ONGOING_REVIEWS or total_count >= MAX_TOTAL_REVIEWS:
+            log.debug(
+                "There are %s ongoing and %s total reviews, above thresholds of %s and %s",
+                ongoing_count, total_count,
+                MAX_ONGOING_REVIEWS, MAX_TOTAL_REVIEWS
+            )
+            return False
+
+        return True
 
+    async def get_review_states(self) -> dict[int, bool]:
+        """
+        Return the review messages in the voting channel, mapped to whether they've been ticketed.
+
+        The state is kept up to date as reviews are posted, reacted to, and deleted, so the channel's history is only
+        read once after the cog is loaded, to catch up on the changes made while the bot was offline.
+        """
+        if not self._reviews_synced:
+            await self._sync_review_states()
+        return await self.review_messages.to_dict()
+
+    async def _sync_review_states(self) -> None:
+        """Replace the review state with the one read from the history of the voting channel."""
+        log.info("Syncing the state of ongoing reviews from the voting channel's history.")
+        voting_channel = self.bot.get_channel(Channels.nomination_voting)
+
+        reviews = {}
         async for msg in voting_channel.history():
             # Try and filter out any non-review messages. We also only want to count
             # one message from reviews split over multiple messages. We use fixed text
@@ -110,25 +148,36 @@ class Reviewer:
             if not msg.author.bot or "for Helper!" not in msg.content:
                 continue
 
-            total_count += 1
+            reviews[msg.id] = any(reaction.emoji == TICKET_EMOJI for reaction in msg.reactions)
 
-            is_ticketed = False
-            for reaction in msg.reactions:
-                if reaction.emoji == "\N{TICKET}":
-                    is_ticketed = True
+        await self.review_messages.clear()
+        if reviews:
+            await self.review_messages.update(reviews)
+        self._reviews_synced = True
 
-            if not is_ticketed:
-                ongoing_count += 1
+    async def mark_ticketed(self, message_id: int) -> None:
+        """Mark the review with `message_id` as ticketed, if it's a review."""
+        if await self.review_messages.contains(message_id):
+            await self.review_messages.set(message_id, True)
 
-            if ongoing_count >= MAX_ONGOING_REVIEWS or total_count >= MAX_TOTAL_REVIEWS:
-                log.debug(
-                    "There are %s ongoing and %s total reviews, above thresholds of %s and %s",
-                    ongoing_count, total_count,
-                    MAX_ONGOING_REVIEWS, MAX_TOTAL_REVIEWS
-                )
-                return False
+    async def refresh_ticketed(self, message: PartialMessage) -> None:
+        """Update whether the review `message` is ticketed from its reactions, e.g. after a ticket was removed."""
+        if not await self.review_messages.contains(message.id):
+            return
 
-        return True
+        try:
+            message = await message.fetch()
+        except NotFound:
+            await self.forget_reviews(message.id)
+            return
+
+        is_ticketed = any(reaction.emoji == TICKET_EMOJI for reaction in message.reactions)
+        await self.review_messages.set(message.id, is_ticketed)
+
+    async def forget_reviews(self, *message_ids: int) -> None:
+        """Stop tracking the reviews with the given message IDs, ignoring those which aren't reviews."""
+        for message_id in message_ids:
+            await self.review_messages.delete(message_id)
 
     @staticmethod
     def is_nomination_old_enough(nomination: Nomination, now: datetime) -> bool:
@@ -141,7 +190,7 @@ class Reviewer:
         """Check if a user's message count is enough for them to be autoreviewed."""
         return user_message_count > 0
 
-    async def is_nomination_ready_for_review(
+    def is_nomination_ready_for_review(
         self,
         nomination: Nomination,
         user_message_count: int,
@@ -154,9 +203,9 @@ class Reviewer:
          - They have not already been reviewed.
          - They have been nominated for longer than `MIN_NOMINATION_TIME`.
          - They have sent at least one message in the server recently.
-         - They are still a member of the server.
+
+        Whether they're still a member of the server is checked separately, for all nominations at once.
         """
-        guild = self.bot.get_guild(Guild.id)
         return (
             # Must be an active nomination
             nomination.active and
@@ -165,11 +214,26 @@ class Reviewer:
             # ... and has been nominated for long enough
             self.is_nomination_old_enough(nomination, now) and
             # ... and is for a user that has been active recently
-            self.is_user_active_enough(user_message_count) and
-            # ... and is currently a member of the server
-            await get_or_fetch_member(guild, nomination.user_id) is not None
+            self.is_user_active_enough(user_message_count)
         )
 
+    async def get_present_member_ids(self, user_ids: list[int]) -> set[int]:
+        """
+        Return the IDs of the users in `user_ids` who are members of the guild.
+
+        The member cache is used if it's complete. Otherwise, the users who aren't cached are queried in batches.
+        """
+        guild = self.bot.get_guild(Guild.id)
+        present = {user_id for user_id in user_ids if guild.get_member(user_id) is not None}
+        if guild.chunked:
+            return present
+
+        missing = [user_id for user_id in user_ids if user_id not in present]
+        for i in range(0, len(missing), MEMBER_QUERY_LIMIT):
+            members = await guild.query_members(user_ids=missing[i:i + MEMBER_QUERY_LIMIT])
+            present.update(member.id for member in members)
+        return present
+
     async def sort_nominations_to_review(self, nominations: list[Nomination], now: datetime) -> list[Nomination]:
         """
         Sorts a list of nominations by priority for review.
@@ -217,7 +281,14 @@ class Reviewer:
         )
         possible_nominations = [
             nomination for nomination in nominations
-            if await self.is_nomination_ready_for_review(nomination, messages_per_user[nomination.user_id], now)
+            if self.is_nomination_ready_for_review(nomination, messages_per_user[nomination.user_id], now)
+        ]
+        # ... and is for a user that's currently a member of the server
+        present_member_ids = await self.get_present_member_ids(
+            [nomination.user_id for nomination in possible_nominations]
+        )
+        possible_nominations = [
+            nomination for nomination in possible_nominations if nomination.user_id in present_member_ids
         ]
         if not possible_nominations:
             log.info("No nominations are ready to review")
@@ -237,6 +308,7 @@ class Reviewer:
 
         log.info(f"Posting the review of {nominee} ({nominee.id})")
         vote_message = await channel.send(review)
+        await self.review_messages.set(vote_message.id, False)
 
         if reviewed_emoji:
             for reaction in (reviewed_emoji, "\N{THUMBS UP SIGN}", "\N{THUMBS DOWN SIGN}"):
@@ -379,6 +451,7 @@ class Reviewer:
         ))
 
         await message.delete()
+        await self.forget_reviews(message.id)
 
         if nomination_thread:
             with contextlib.suppress(NotFound):
@@ -3,6 +3,7 @@ import inspect
 import pprint
 import re
 import textwrap
+import time
 import traceback
 from collections import Counter
 from io import StringIO
@@ -261,6 +262,25 @@ async def func():  # (None,) -> Any
 
         await ctx.send(embed=stats_embed)
 
+    @internal_group.command(name="listeners", aliases=("listener",))
+    @has_any_role(Roles.admins, Roles.owners, Roles.core_developers)
+    async def listeners(self, ctx: Context, count: int = 10) -> None:
+        """Show the event listeners which used the most CPU time."""
+        running_s = time.time() - self.bot.listener_stats.since
+        # Any more rows wouldn't fit in a single message.
+        top = self.bot.listener_stats.top(min(count, 15))
+
+        lines = [f"{'Listener':<40} {'Event':<24} {'Calls':>8} {'CPU (s)':>8} {'Avg wall':>9} {'Max step':>9}"]
+        for name, event_name, timings in top:
+            average_wall = timings.wall_time / timings.calls * 1000
+            lines.append(
+                f"{name[:40]:<40} {event_name[:24]:<24} {timings.calls:>8,} {timings.cpu_time:>8.2f} "
+                f"{average_wall:>7.1f}ms {timings.longest_step * 1000:>7.1f}ms"
+            )
+
+        table = "\n".join(lines)
+        await ctx.send(f"Listener timings over the last {running_s / 3600:.1f} hours:\n```\n{table}\n```")
+
 
 async def setup(bot: Bot) -> None:
     """Load the Internal cog."""
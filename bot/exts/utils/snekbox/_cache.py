@@ -0,0 +1,151 @@
+"""Short-lived reuse of snekbox results for identical jobs."""
+
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+import regex
+from pydis_core.async_stats import AsyncStatsClient
+
+from bot.exts.utils.snekbox._eval import EvalJob, EvalResult
+from bot.log import get_logger
+
+log = get_logger(__name__)
+
+# Names which suggest that the output of the code may differ between runs, such as modules dealing
+# with time, randomness, the environment or concurrency, and builtins exposing memory addresses or
+# hash-randomised ordering. This is deliberately broad; a false positive only means a job is re-run.
+NON_DETERMINISTIC_REGEX = regex.compile(
+    r"\b(?:"
+    r"random|secrets|uuid|time|datetime|zoneinfo|calendar|timeit|perf_counter|monotonic"
+    r"|os|sys|platform|socket|subprocess|tempfile|pathlib|glob|shutil"
+    r"|threading|multiprocessing|concurrent|asyncio|gc|tracemalloc|resource"
+    r"|id|hash|set|frozenset|object|input|open|exec|eval|__import__|importlib"
+    r")\b"
+)
+
+# Results with files larger than this in total aren't kept, to bound the memory used by the cache.
+MAX_CACHED_FILES_SIZE = 1024 * 1024
+
+
+def job_key(job: EvalJob) -> str:
+    """Return a key identifying the arguments, files and Python version of `job`."""
+    data = json.dumps(job.to_dict(), sort_keys=True)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def is_deterministic(job: EvalJob) -> bool:
+    """Return True if the output of `job` is expected to be the same every time it runs."""
+    if job.name == "timeit":
+        return False
+
+    texts = [*job.args, *(file.content.decode("utf-8", errors="replace") for file in job.files)]
+    return not any(NON_DETERMINISTIC_REGEX.search(text) for text in texts)
+
+
+class ResultCache:
+    """
+    Reuse the results of identical jobs that finished recently, and coalesce identical jobs that are running.
+
+    Jobs whose output could differ between runs aren't cached; see `is_deterministic`.
+    """
+
+    def __init__(self, ttl: float, max_size: int, stats: AsyncStatsClient):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.stats = stats
+
+        self.hits = 0
+        self.misses = 0
+
+        self._results: OrderedDict[str, tuple[float, EvalResult]] = OrderedDict()
+        self._in_flight: dict[str, asyncio.Future] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """True if results are cached at all."""
+        return self.ttl > 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the ratio of cacheable jobs that didn't have to be run."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    async def run(self, job: EvalJob, runner: Callable[[], Awaitable[EvalResult | None]]) -> EvalResult | None:
+        """
+        Return the result of `job`, reusing a cached or in-flight result if there's one, or otherwise `runner`'s.
+
+        The result of `runner` is cached, unless it's None or the job isn't deterministic.
+        """
+        if not self.enabled:
+            return await runner()
+
+        if not is_deterministic(job):
+            self.stats.incr("snekbox.result_cache.uncacheable")
+            return await runner()
+
+        key = job_key(job)
+        while True:
+            if (result := self._get(key)) is not None:
+                log.trace(f"Reusing the cached result of {job.name} job {key}.")
+                self._record_hit("hit")
+                return result
+
+            if (in_flight := self._in_flight.get(key)) is None:
+                break
+
+            # Share the result of the identical running job. If it didn't produce one (e.g. it was cancelled),
+            # check again; this job may then end up running by itself.
+            if (result := await asyncio.shield(in_flight)) is not None:
+                log.trace(f"Reusing the result of in-flight {job.name} job {key}.")
+                self._record_hit("coalesced")
+                return result
+
+        self.misses += 1
+        self.stats.incr("snekbox.result_cache.miss")
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        result = None
+        try:
+            result = await runner()
+        finally:
+            del self._in_flight[key]
+            future.set_result(result)
+
+        if result is not None:
+            self._set(key, result)
+        return result
+
+    def _record_hit(self, kind: str) -> None:
+        """Count a job which didn't have to be run."""
+        self.hits += 1
+        self.stats.incr(f"snekbox.result_cache.{kind}")
+        self.stats.gauge("snekbox.result_cache.hit_ratio", self.hit_ratio)
+
+    def _get(self, key: str) -> EvalResult | None:
+        """Return the cached result for `key`, or None if there's none or it has expired."""
+        if (entry := self._results.get(key)) is None:
+            return None
+
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del self._results[key]
+            return None
+
+        self._results.move_to_end(key)
+        return result
+
+    def _set(self, key: str, result: EvalResult) -> None:
+        """Cache `result` under `key`, evicting the least recently used results if the cache is full."""
+        if sum(file.size for file in result.files) > MAX_CACHED_FILES_SIZE:
+            return
+
+        self._results[key] = (time.monotonic() + self.ttl, result)
+        self._results.move_to_end(key)
+        while len(self._results) > self.max_size:
+            self._results.popitem(last=False)
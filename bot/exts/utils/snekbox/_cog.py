@@ -1,11 +1,25 @@
 import contextlib
+import time
 from collections.abc import Iterable
+from datetime import timedelta
 from functools import partial
 from operator import attrgetter
 from textwrap import dedent
 from typing import NamedTuple, TYPE_CHECKING, get_args
 
-from discord import AllowedMentions, HTTPException, Interaction, Message, NotFound, Reaction, User, enums, ui
+from discord import (
+    AllowedMentions,
+    HTTPException,
+    Interaction,
+    Message,
+    NotFound,
+    RawMessageDeleteEvent,
+    RawMessageUpdateEvent,
+    Reaction,
+    User,
+    enums,
+    ui,
+)
 from discord.ext.commands import Cog, Command, Context, Converter, command, guild_only
 from pydis_core.utils import interactions, paste_service
 from pydis_core.utils.paste_service import PasteFile, send_to_paste_service
@@ -16,21 +30,26 @@ from bot.constants import BaseURLs, Channels, Emojis, MODERATION_ROLES, Roles, U
 from bot.decorators import redirect_output
 from bot.exts.filtering._filter_lists.extension import TXT_LIKE_FILES
 from bot.exts.help_channels._channel import is_help_forum_post
+from bot.exts.utils.snekbox._cache import ResultCache
 from bot.exts.utils.snekbox._constants import (
     ANSI_REGEX,
     DEFAULT_PYTHON_VERSION,
     ESCAPE_REGEX,
+    MAX_CONCURRENT_JOBS,
     MAX_OUTPUT_BLOCK_CHARS,
     MAX_OUTPUT_BLOCK_LINES,
     NO_SNEKBOX_CATEGORIES,
     NO_SNEKBOX_CHANNELS,
     REDO_EMOJI,
     REDO_TIMEOUT,
+    RESULT_CACHE_MAX_SIZE,
+    RESULT_CACHE_TTL,
     SNEKBOX_ROLES,
     SupportedPythonVersions,
 )
 from bot.exts.utils.snekbox._eval import EvalJob, EvalResult
 from bot.exts.utils.snekbox._io import FileAttachment
+from bot.exts.utils.snekbox._queue import JobCancelledError, JobQueue
 from bot.log import get_logger
 from bot.utils.lock import LockedResourceError, lock_arg
 
@@ -164,6 +183,8 @@ class Snekbox(Cog):
     def __init__(self, bot: Bot):
         self.bot = bot
         self.jobs = {}
+        self.job_queue = JobQueue(MAX_CONCURRENT_JOBS)
+        self.result_cache = ResultCache(RESULT_CACHE_TTL, RESULT_CACHE_MAX_SIZE, bot.stats)
 
     def build_python_version_switcher_view(
         self,
@@ -190,7 +211,57 @@ class Snekbox(Cog):
         data = job.to_dict()
 
         async with self.bot.http_session.post(URLs.snekbox_eval_api, json=data, raise_for_status=True) as resp:
-            return EvalResult.from_dict(await resp.json())
+            return await EvalResult.from_response(resp)
+
+    async def queue_job(self, ctx: Context, job: EvalJob) -> EvalResult | None:
+        """
+        Wait for the job to be admitted by the job queue, then post it to snekbox and return the results.
+
+        If the job has to wait, the user is told their position in the queue.
+        Return None if the job was cancelled while waiting, due to the invoking message being edited or deleted.
+        """
+        queued_job = self.job_queue.submit(ctx.author.id, ctx.channel.id, ctx.message.id)
+        self.bot.metrics.gauge("snekbox.queue.depth", len(self.job_queue))
+
+        queue_message = None
+        try:
+            if not queued_job.is_admitted:
+                position = self.job_queue.position(queued_job)
+                log.trace(f"{ctx.author}'s {job.name} job is queued at position {position}.")
+                with contextlib.suppress(HTTPException):
+                    queue_message = await ctx.send(
+                        f":hourglass: Your {job.version} {job.name} job is queued at position {position}, "
+                        "it will run as soon as possible.",
+                        reference=ctx.message.to_reference(fail_if_not_exists=False),
+                        allowed_mentions=AllowedMentions.none(),
+                    )
+
+            await self.job_queue.wait(queued_job)
+        except JobCancelledError as e:
+            log.info(f"{ctx.author}'s {job.name} job was cancelled because {e.reason}.")
+            self.bot.metrics.incr("snekbox.queue.cancelled")
+            if queue_message:
+                with contextlib.suppress(HTTPException):
+                    await queue_message.edit(content=f":x: Your {job.version} {job.name} job was cancelled "
+                                                     f"because {e.reason}.")
+            return None
+        except BaseException:
+            self.job_queue.withdraw(queued_job)
+            raise
+
+        started_at = time.monotonic()
+        self.bot.metrics.timing("snekbox.queue.wait_time", timedelta(seconds=started_at - queued_job.queued_at))
+
+        # The job holds a slot from here on, so anything awaited has to be covered by its release.
+        try:
+            if queue_message:
+                with contextlib.suppress(HTTPException):
+                    await queue_message.delete()
+
+            return await self.post_job(job)
+        finally:
+            self.job_queue.release(queued_job)
+            self.bot.metrics.timing("snekbox.execution_time", timedelta(seconds=time.monotonic() - started_at))
 
     async def upload_output(self, output: str) -> str | None:
         """Upload the job's output to a paste service and return a URL to it if successful."""
@@ -368,14 +439,18 @@ class Snekbox(Cog):
         return FilteredFiles(allowed, blocked)
 
     @lock_arg("snekbox.send_job", "ctx", attrgetter("author.id"), raise_error=True)
-    async def send_job(self, ctx: Context, job: EvalJob) -> Message:
+    async def send_job(self, ctx: Context, job: EvalJob) -> Message | None:
         """
         Evaluate code, format it, and send the output to the corresponding channel.
 
-        Return the bot response.
+        Return the bot response, or None if the job was cancelled before it could run.
         """
         async with ctx.typing():
-            result = await self.post_job(job)
+            # Re-runs of identical jobs, e.g. when switching back and forth between versions, may reuse a result.
+            result = await self.result_cache.run(job, partial(self.queue_job, ctx, job))
+            if result is None:
+                return None
+
             # Collect stats of job fails + successes
             if result.returncode != 0:
                 self.bot.stats.incr("snekbox.python.fail")
@@ -551,6 +626,9 @@ class Snekbox(Cog):
                 )
                 return
 
+            if response is None:
+                return
+
             # Store the bot's response message id per invocation, to ensure the `wait_for`s in `continue_job`
             # don't trigger if the response has already been replaced by a new response.
             # This can happen when a button is pressed and then original code is edited and re-run.
@@ -561,6 +639,22 @@ class Snekbox(Cog):
                 break
             log.info(f"Re-evaluating code from message {ctx.message.id}:\n{job}")
 
+    @Cog.listener()
+    async def on_raw_message_delete(self, payload: RawMessageDeleteEvent) -> None:
+        """Cancel the queued job of a deleted invoking message."""
+        self.job_queue.cancel(payload.message_id, "the invoking message was deleted")
+
+    @Cog.listener()
+    async def on_raw_message_edit(self, payload: RawMessageUpdateEvent) -> None:
+        """Cancel the queued job of an invoking message whose content was edited."""
+        # Edits are also dispatched when Discord adds embeds to a message, which don't change the code.
+        if "content" not in payload.data:
+            return
+        if payload.cached_message and payload.cached_message.content == payload.data["content"]:
+            return
+
+        self.job_queue.cancel(payload.message_id, "the invoking message was edited")
+
     @command(
         name="eval",
         aliases=("e", "exec"),
@@ -1,7 +1,7 @@
 import re
 from typing import Literal
 
-from bot.constants import Channels, Roles
+from bot.constants import Channels, Roles, Snekbox
 
 ANSI_REGEX = re.compile(r"\N{ESC}\[[0-9;:]*m")
 ESCAPE_REGEX = re.compile("[`\u202E\u200B]{3,}")
@@ -16,6 +16,14 @@ NO_SNEKBOX_CHANNELS = (Channels.python_general,)
 NO_SNEKBOX_CATEGORIES = ()
 SNEKBOX_ROLES = (Roles.helpers, Roles.moderators, Roles.admins, Roles.owners, Roles.python_community)
 
+# The maximum number of jobs that are sent to snekbox at the same time; any further jobs are queued.
+MAX_CONCURRENT_JOBS = Snekbox.max_concurrent_jobs
+
+# How long the result of a job is reused for identical jobs, in seconds. Caching is disabled if 0.
+RESULT_CACHE_TTL = Snekbox.result_cache_ttl
+# The maximum number of results kept in the cache.
+RESULT_CACHE_MAX_SIZE = 64
+
 REDO_EMOJI = "\U0001f501"  # :repeat:
 REDO_TIMEOUT = 30
 
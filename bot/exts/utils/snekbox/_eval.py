@@ -1,12 +1,22 @@
 import contextlib
+import json
+from collections.abc import Callable
 from dataclasses import dataclass, field
+from functools import partial
 from signal import Signals
 
+from aiohttp import ClientResponse
 from discord.utils import escape_markdown, escape_mentions
 
 from bot.constants import Emojis
 from bot.exts.utils.snekbox._constants import DEFAULT_PYTHON_VERSION, SupportedPythonVersions
-from bot.exts.utils.snekbox._io import FILE_COUNT_LIMIT, FILE_SIZE_LIMIT, FileAttachment, sizeof_fmt
+from bot.exts.utils.snekbox._io import (
+    FILE_COUNT_LIMIT,
+    FILE_SIZE_LIMIT,
+    FileAttachment,
+    b64_decoded_size,
+    sizeof_fmt,
+)
 from bot.log import get_logger
 
 log = get_logger(__name__)
@@ -14,6 +24,29 @@ log = get_logger(__name__)
 SIGKILL = 9
 
 
+def _make_file_pruner() -> Callable[[dict], dict]:
+    """
+    Return a JSON object hook which drops the content of files that can't be uploaded while parsing.
+
+    The content of files exceeding the size limit, or past the file count limit, is discarded as soon as it's
+    parsed, instead of being kept alive until the whole response is processed.
+    """
+    files_seen = 0
+
+    def prune(obj: dict) -> dict:
+        nonlocal files_seen
+        if "path" not in obj or "content" not in obj:
+            return obj
+
+        files_seen += 1
+        size = max(b64_decoded_size(obj["content"]), obj.get("size") or 0)
+        if files_seen > FILE_COUNT_LIMIT or size > FILE_SIZE_LIMIT:
+            return {"path": obj["path"], "size": size, "content": ""}
+        return obj
+
+    return prune
+
+
 @dataclass(frozen=True)
 class EvalJob:
     """Job to be evaluated by snekbox."""
@@ -162,6 +195,15 @@ class EvalResult:
 
         return msg
 
+    @classmethod
+    async def from_response(cls, response: ClientResponse) -> EvalResult:
+        """
+        Create an EvalResult from a snekbox response.
+
+        The content of files which can't be uploaded is dropped while the response is parsed.
+        """
+        return cls.from_dict(await response.json(loads=partial(json.loads, object_hook=_make_file_pruner())))
+
     @classmethod
     def from_dict(cls, data: dict[str, str | int | list[dict[str, str]]]) -> EvalResult:
         """Create an EvalResult from a dict."""
@@ -174,6 +216,7 @@ class EvalResult:
         for i, file in enumerate(files):
             # Limit to FILE_COUNT_LIMIT files
             if i >= FILE_COUNT_LIMIT:
+                res.failed_files.append(file["path"])
                 res.failed_files.extend(file["path"] for file in files)
                 break
             try:
@@ -1,7 +1,6 @@
 """I/O File protocols for snekbox."""
 
 from base64 import b64decode, b64encode
-from dataclasses import dataclass
 from io import BytesIO
 from pathlib import PurePosixPath
 
@@ -36,6 +35,11 @@ def sizeof_fmt(num: int | float, suffix: str = "B") -> str:
     return f"{num_str} Yi{suffix}"
 
 
+def b64_decoded_size(encoded: str) -> int:
+    """Return the number of bytes the padded base64 string `encoded` decodes to, without decoding it."""
+    return len(encoded) * 3 // 4 - encoded[-2:].count("=")
+
+
 def normalize_discord_file_name(name: str) -> str:
     """Return a normalized valid discord file name."""
     # Discord file names only allow A-Z, a-z, 0-9, underscores, dashes, and dots
@@ -48,18 +52,64 @@ def normalize_discord_file_name(name: str) -> str:
     return name
 
 
-@dataclass(frozen=True)
 class FileAttachment:
-    """File Attachment from Snekbox eval."""
+    """
+    File Attachment from Snekbox eval.
+
+    Files returned by snekbox keep their base64-encoded content until it is first needed,
+    so that files which are never sent (e.g. because they're blocked) are never decoded.
+    """
+
+    __slots__ = ("_content", "_encoded_content", "filename")
 
-    filename: str
-    content: bytes
+    def __init__(self, filename: str, content: bytes | None = None, *, encoded_content: str | None = None):
+        if (content is None) == (encoded_content is None):
+            raise TypeError("Exactly one of content and encoded_content must be given.")
+
+        self.filename = filename
+        self._content = content
+        self._encoded_content = encoded_content
 
     def __repr__(self) -> str:
         """Return the content as a string."""
-        content = f"{self.content[:10]}..." if len(self.content) > 10 else self.content
+        if self._content is None:
+            return f"FileAttachment(path={self.filename!r}, size={self.size}, encoded)"
+
+        content = f"{self._content[:10]}..." if len(self._content) > 10 else self._content
         return f"FileAttachment(path={self.filename!r}, content={content})"
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FileAttachment):
+            return NotImplemented
+        if self.filename != other.filename or self.size != other.size:
+            return False
+        if self._encoded_content is not None and other._encoded_content is not None:
+            return self._encoded_content == other._encoded_content
+        return self.content == other.content
+
+    def __hash__(self) -> int:
+        return hash((self.filename, self.size))
+
+    @property
+    def content(self) -> bytes:
+        """Return the file's content, decoding it first if needed."""
+        if self._content is None:
+            self._content = b64decode(self._encoded_content)
+            self._encoded_content = None
+        return self._content
+
+    @property
+    def is_decoded(self) -> bool:
+        """True if the content is held decoded in memory."""
+        return self._content is not None
+
+    @property
+    def size(self) -> int:
+        """Return the size of the file's content in bytes, without decoding it."""
+        if self._content is not None:
+            return len(self._content)
+        return b64_decoded_size(self._encoded_content)
+
     @property
     def suffix(self) -> str:
         """Return the file suffix."""
@@ -72,27 +122,33 @@ class FileAttachment:
 
     @classmethod
     def from_dict(cls, data: dict, size_limit: int = FILE_SIZE_LIMIT) -> FileAttachment:
-        """Create a FileAttachment from a dict response."""
+        """Create a FileAttachment from a dict response, without decoding its content."""
         size = data.get("size")
-        if (size and size > size_limit) or (len(data["content"]) > size_limit):
+        if size and size > size_limit:
             raise ValueError("File size exceeds limit")
 
-        content = b64decode(data["content"])
+        encoded_content = data["content"]
+        if len(encoded_content) % 4:
+            raise ValueError("File content is not valid base64")
 
-        if len(content) > size_limit:
+        if b64_decoded_size(encoded_content) > size_limit:
             raise ValueError("File size exceeds limit")
 
-        return cls(data["path"], content)
+        return cls(data["path"], encoded_content=encoded_content)
 
     def to_dict(self) -> dict[str, str]:
         """Convert the attachment to a json dict."""
-        content = self.content
-        if isinstance(content, str):
-            content = content.encode("utf-8")
+        if self._encoded_content is not None:
+            encoded_content = self._encoded_content
+        else:
+            content = self._content
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            encoded_content = b64encode(content).decode("ascii")
 
         return {
             "path": self.filename,
-            "content": b64encode(content).decode("ascii"),
+            "content": encoded_content,
         }
 
     def to_file(self) -> File:
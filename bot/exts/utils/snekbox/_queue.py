@@ -0,0 +1,170 @@
+"""Admission control for snekbox jobs."""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from bot.log import get_logger
+
+log = get_logger(__name__)
+
+
+class JobCancelledError(Exception):
+    """Raised when a job is cancelled while it's waiting in the queue."""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Job was cancelled because {reason}.")
+
+        self.reason = reason
+
+
+@dataclass(eq=False)
+class QueuedJob:
+    """A ticket representing a job that is waiting in a `JobQueue` or running."""
+
+    user_id: int
+    channel_id: int
+    message_id: int
+    admitted: asyncio.Future = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+    queued_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def is_admitted(self) -> bool:
+        """True if the job was allowed to run."""
+        return self.admitted.done() and not self.admitted.cancelled() and self.admitted.exception() is None
+
+
+class JobQueue:
+    """
+    Limit the number of jobs sent to snekbox at the same time, queuing the rest.
+
+    Waiting jobs are admitted fairly: channels take turns, and within a channel users take turns,
+    so that a single busy channel or user can't starve everyone else of evaluations.
+    """
+
+    def __init__(self, max_concurrent_jobs: int):
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.running = 0
+
+        # Waiting jobs grouped by channel, then by user. Dicts keep insertion order, which is used
+        # for the round-robin: once a job is admitted, its channel and user are moved to the back.
+        self._waiting: dict[int, dict[int, deque[QueuedJob]]] = {}
+        self._jobs_by_message: dict[int, QueuedJob] = {}
+
+    def __len__(self) -> int:
+        """Return the number of jobs waiting to be admitted."""
+        return sum(len(jobs) for users in self._waiting.values() for jobs in users.values())
+
+    def submit(self, user_id: int, channel_id: int, message_id: int) -> QueuedJob:
+        """Add a job to the queue and return its ticket, which is admitted straight away if there's room."""
+        job = QueuedJob(user_id, channel_id, message_id)
+        self._jobs_by_message[message_id] = job
+
+        users = self._waiting.setdefault(channel_id, {})
+        users.setdefault(user_id, deque()).append(job)
+        self._admit_next()
+
+        return job
+
+    async def wait(self, job: QueuedJob) -> None:
+        """
+        Wait until `job` is admitted.
+
+        Raise `JobCancelledError` if the job was cancelled while waiting.
+        """
+        try:
+            await asyncio.shield(job.admitted)
+        except asyncio.CancelledError:
+            # The waiting task itself was cancelled, so the job should give up its place.
+            self.withdraw(job)
+            raise
+
+    def release(self, job: QueuedJob) -> None:
+        """Free the slot of an admitted `job` that has finished running."""
+        self.running -= 1
+        self._forget(job)
+        self._admit_next()
+
+    def withdraw(self, job: QueuedJob) -> None:
+        """Give up the place of `job`, whether it's still waiting or has already been admitted."""
+        if job.is_admitted:
+            self.release(job)
+        elif not job.admitted.done():
+            self._remove(job)
+            job.admitted.cancel()
+
+    def cancel(self, message_id: int, reason: str) -> bool:
+        """
+        Cancel the waiting job invoked by the message with the given ID.
+
+        Return True if a job was cancelled, or False if there was no such job or if it's already running.
+        """
+        job = self._jobs_by_message.get(message_id)
+        if job is None or job.admitted.done():
+            return False
+
+        log.trace(f"Cancelling queued snekbox job of message {message_id}: {reason}.")
+        self._remove(job)
+        job.admitted.set_exception(JobCancelledError(reason))
+        # Mark the exception as retrieved in case nothing is waiting on the job anymore.
+        job.admitted.exception()
+        return True
+
+    def position(self, job: QueuedJob) -> int:
+        """Return the 1-indexed position at which `job` will be admitted, or 0 if it's already admitted."""
+        if job.admitted.done():
+            return 0
+
+        # Replay the round-robin on a copy of the queue until the job comes up.
+        waiting = {channel_id: {user_id: deque(jobs) for user_id, jobs in users.items()}
+                   for channel_id, users in self._waiting.items()}
+        position = 0
+        while waiting:
+            position += 1
+            if self._pop_next(waiting) is job:
+                return position
+
+        return 0
+
+    @staticmethod
+    def _pop_next(waiting: dict[int, dict[int, deque[QueuedJob]]]) -> QueuedJob:
+        """Pop the next job to admit from `waiting`, and move its channel and user to the back of the queue."""
+        channel_id, users = next(iter(waiting.items()))
+        user_id, jobs = next(iter(users.items()))
+        job = jobs.popleft()
+
+        del users[user_id]
+        if jobs:
+            users[user_id] = jobs
+
+        del waiting[channel_id]
+        if users:
+            waiting[channel_id] = users
+
+        return job
+
+    def _admit_next(self) -> None:
+        """Admit waiting jobs for as long as there are free slots."""
+        while self._waiting and self.running < self.max_concurrent_jobs:
+            job = self._pop_next(self._waiting)
+            self.running += 1
+            job.admitted.set_result(None)
+
+    def _remove(self, job: QueuedJob) -> None:
+        """Remove a waiting `job` from the queue."""
+        users = self._waiting.get(job.channel_id, {})
+        jobs = users.get(job.user_id, ())
+        if job in jobs:
+            jobs.remove(job)
+            if not jobs:
+                del users[job.user_id]
+            if not users:
+                del self._waiting[job.channel_id]
+
+        self._forget(job)
+
+    def _forget(self, job: QueuedJob) -> None:
+        """Stop tracking `job` by its message ID, unless the ID was taken by a newer job."""
+        if self._jobs_by_message.get(job.message_id) is job:
+            del self._jobs_by_message[job.message_id]
@@ -1,3 +1,5 @@
+import asyncio
+import time
 
 import discord
 import sentry_sdk
@@ -13,6 +15,9 @@ from bot.pagination import LinePaginator
 log = get_logger(__name__)
 THREAD_BUMP_ENDPOINT = "bot/bumped-threads"
 
+# The number of bumped threads fetched or reconciled with Discord and site at once.
+MAX_CONCURRENT_RECONCILIATIONS = 10
+
 
 class ThreadBumper(commands.Cog):
     """Cog that allow users to add the current thread to a list that get reopened on archive."""
@@ -36,61 +41,94 @@ class ThreadBumper(commands.Cog):
             # A status other than 204/404 is undefined behaviour from site. Raise error for investigation.
             raise ResponseCodeError(response, response.text())
 
-    async def unarchive_threads_not_manually_archived(self, threads: list[discord.Thread]) -> None:
+    async def get_manually_archived_thread_ids(self) -> set[int]:
         """
-        Iterate through and unarchive any threads that weren't manually archived recently.
-
-        This is done by extracting the manually archived threads from the audit log.
+        Return the IDs of the threads which were manually archived recently, according to the audit log.
 
         Only the last 200 thread_update logs are checked,
         as this is assumed to be more than enough to cover bot downtime.
         """
         guild = self.bot.get_guild(constants.Guild.id)
 
-        recent_manually_archived_thread_ids = []
+        manually_archived_thread_ids = set()
         async for thread_update in guild.audit_logs(limit=200, action=discord.AuditLogAction.thread_update):
             if getattr(thread_update.after, "archived", False):
-                recent_manually_archived_thread_ids.append(thread_update.target.id)
-
-        for thread in threads:
-            if thread.id in recent_manually_archived_thread_ids:
-                log.info(
-                    "#%s (%d) was manually archived. Leaving archived, and removing from bumped threads.",
-                    thread.name,
-                    thread.id
-                )
-                await self.bot.api_client.delete(f"{THREAD_BUMP_ENDPOINT}/{thread.id}")
-            else:
-                await thread.edit(archived=False)
+                manually_archived_thread_ids.add(thread_update.target.id)
+        return manually_archived_thread_ids
 
-    async def cog_load(self) -> None:
-        """Ensure bumped threads are active, since threads could have been archived while the bot was down."""
-        await self.bot.wait_until_guild_available()
+    async def unarchive_threads_not_manually_archived(self, threads: list[discord.Thread]) -> None:
+        """
+        Unarchive any threads that weren't manually archived recently, and remove the others from the bump list.
 
-        threads_to_maybe_bump = []
-        with sentry_sdk.start_span(description="Fetch threads to bump from site"):
-            bumped_threads_from_site = await self.bot.api_client.get(THREAD_BUMP_ENDPOINT)
+        The threads are reconciled concurrently, up to `MAX_CONCURRENT_RECONCILIATIONS` at a time.
+        """
+        manually_archived_thread_ids = await self.get_manually_archived_thread_ids()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_RECONCILIATIONS)
+
+        async def reconcile(thread: discord.Thread) -> None:
+            async with semaphore:
+                if thread.id in manually_archived_thread_ids:
+                    log.info(
+                        "#%s (%d) was manually archived. Leaving archived, and removing from bumped threads.",
+                        thread.name,
+                        thread.id
+                    )
+                    await self.bot.api_client.delete(f"{THREAD_BUMP_ENDPOINT}/{thread.id}")
+                else:
+                    await thread.edit(archived=False)
+
+        await asyncio.gather(*(reconcile(thread) for thread in threads))
+
+    async def fetch_bumped_threads(self, thread_ids: list[int]) -> list[discord.Thread]:
+        """
+        Fetch the bumped threads with the given IDs concurrently, up to `MAX_CONCURRENT_RECONCILIATIONS` at a time.
 
-        with sentry_sdk.start_span(description="Sync bumped threads in site with current guild state"):
-            for thread_id in bumped_threads_from_site:
+        IDs of channels which were deleted or aren't threads are removed from the bump list.
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_RECONCILIATIONS)
+
+        async def fetch(thread_id: int) -> discord.Thread | None:
+            async with semaphore:
                 try:
                     thread = await get_or_fetch_channel(self.bot, thread_id)
                 except discord.NotFound:
                     log.info("Thread %d has been deleted, removing from bumped threads.", thread_id)
-                    await self.bot.api_client.delete(f"{THREAD_BUMP_ENDPOINT}/{thread_id}")
-                    continue
+                    thread = None
 
                 if not isinstance(thread, discord.Thread):
                     await self.bot.api_client.delete(f"{THREAD_BUMP_ENDPOINT}/{thread_id}")
-                    continue
+                    return None
+                return thread
+
+        threads = await asyncio.gather(*(fetch(thread_id) for thread_id in thread_ids))
+        return [thread for thread in threads if thread is not None]
+
+    async def cog_load(self) -> None:
+        """Ensure bumped threads are active, since threads could have been archived while the bot was down."""
+        await self.bot.wait_until_guild_available()
+        start = time.perf_counter()
+
+        with sentry_sdk.start_span(name="Fetch threads to bump from site"):
+            bumped_threads_from_site = await self.bot.api_client.get(THREAD_BUMP_ENDPOINT)
 
-                if thread.archived:
-                    threads_to_maybe_bump.append(thread)
+        with sentry_sdk.start_span(name="Sync bumped threads in site with current guild state"):
+            threads = await self.fetch_bumped_threads(bumped_threads_from_site)
+            threads_to_maybe_bump = [thread for thread in threads if thread.archived]
 
-        with sentry_sdk.start_span(description="Unarchive threads that should be bumped"):
+        with sentry_sdk.start_span(name="Unarchive threads that should be bumped"):
             if threads_to_maybe_bump:
                 await self.unarchive_threads_not_manually_archived(threads_to_maybe_bump)
 
+        elapsed = time.perf_counter() - start
+        log.info(
+            "Reconciled %d bumped threads in %.2fs: %d removed, %d archived.",
+            len(bumped_threads_from_site),
+            elapsed,
+            len(bumped_threads_from_site) - len(threads),
+            len(threads_to_maybe_bump),
+        )
+        self.bot.stats.timing("thread_bumper.reconciliation_time", elapsed * 1000)
+
     @commands.group(name="bump")
     async def thread_bump_group(self, ctx: commands.Context) -> None:
         """A group of commands to manage the bumping of threads."""
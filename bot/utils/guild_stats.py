@@ -0,0 +1,106 @@
+from collections import Counter
+
+from discord import Guild, Member
+from discord.abc import GuildChannel
+
+from bot.log import get_logger
+from bot.utils.channel import is_staff_channel
+
+log = get_logger(__name__)
+
+
+def channel_type_key(channel: GuildChannel) -> str:
+    """Return the name under which `channel` is counted: "staff" for staff channels, or otherwise its type."""
+    return "staff" if is_staff_channel(channel) else str(channel.type)
+
+
+class GuildStatistics:
+    """
+    Counters of the members of each role, and of each type of channel, in a guild.
+
+    Looking up the members of a role in discord.py scans every cached member of the guild, so the counters are
+    instead kept up to date from member and channel events. `recount` rebuilds them from the guild's cache;
+    it's used to initialise the counters, and periodically as a consistency check.
+
+    The counters are only meaningful once `ready` is True.
+    """
+
+    def __init__(self):
+        self.ready = False
+
+        self._role_counts: Counter[int] = Counter()
+        self._channel_types: dict[int, str] = {}
+        self._channel_type_counts: Counter[str] = Counter()
+
+    def role_member_count(self, *role_ids: int) -> int:
+        """Return the total number of members of the roles with `role_ids`."""
+        return sum(self._role_counts[role_id] for role_id in role_ids)
+
+    def channel_type_counts(self) -> dict[str, int]:
+        """Return the number of channels of each type, with staff channels counted separately."""
+        return {channel_type: count for channel_type, count in self._channel_type_counts.items() if count > 0}
+
+    def add_member(self, member: Member) -> None:
+        """Count the roles of a member who joined."""
+        self._role_counts.update(role.id for role in member.roles)
+
+    def remove_member(self, member: Member) -> None:
+        """Stop counting the roles of a member who left."""
+        self._role_counts.subtract(role.id for role in member.roles)
+
+    def update_member(self, before: Member, after: Member) -> None:
+        """Apply the difference between the roles of a member `before` and `after` an update."""
+        if before.roles == after.roles:
+            return
+
+        before_roles = {role.id for role in before.roles}
+        after_roles = {role.id for role in after.roles}
+        self._role_counts.update(after_roles - before_roles)
+        self._role_counts.subtract(before_roles - after_roles)
+
+    def remove_role(self, role_id: int) -> None:
+        """Forget the count of a deleted role."""
+        self._role_counts.pop(role_id, None)
+
+    def add_channel(self, channel: GuildChannel) -> None:
+        """Count a newly created channel, or re-count an updated one whose type may have changed."""
+        self.remove_channel(channel)
+        channel_type = channel_type_key(channel)
+        self._channel_types[channel.id] = channel_type
+        self._channel_type_counts[channel_type] += 1
+
+    def remove_channel(self, channel: GuildChannel) -> None:
+        """Stop counting a deleted channel."""
+        if (channel_type := self._channel_types.pop(channel.id, None)) is not None:
+            self._channel_type_counts[channel_type] -= 1
+
+    def recount(self, guild: Guild) -> None:
+        """
+        Rebuild all counters from the cache of `guild`.
+
+        This takes a single pass over the guild's members. Any difference from the incrementally maintained counters
+        is logged, since it means an event was missed.
+        """
+        role_counts = Counter()
+        for member in guild.members:
+            role_counts.update(role.id for role in member.roles)
+
+        channel_types = {channel.id: channel_type_key(channel) for channel in guild.channels}
+        channel_type_counts = Counter(channel_types.values())
+
+        if self.ready:
+            self._log_drift("role", self._role_counts, role_counts)
+            self._log_drift("channel type", self._channel_type_counts, channel_type_counts)
+
+        self._role_counts = role_counts
+        self._channel_types = channel_types
+        self._channel_type_counts = channel_type_counts
+        self.ready = True
+
+    @staticmethod
+    def _log_drift(kind: str, counted: Counter, actual: Counter) -> None:
+        """Log the counters in `counted` which differ from those in `actual`."""
+        keys = counted.keys() | actual.keys()
+        drift = {key: counted[key] - actual[key] for key in keys if counted[key] != actual[key]}
+        if drift:
+            log.info(f"Corrected drift in the {kind} counters of the guild statistics: {drift}")
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+from typing import Any, Literal
+
+from aiohttp import ClientSession
+from async_rediscache.types.base import RedisObject
+from yarl import URL
+
+from bot.log import get_logger
+
+log = get_logger(__name__)
+
+DAY_SECONDS = int(timedelta(days=1).total_seconds())
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """The body of a response along with the validators needed to revalidate it."""
+
+    body: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+
+    @property
+    def size(self) -> int:
+        """Return the approximate size of the cached body."""
+        return len(self.body)
+
+
+class _RedisResponseStore(RedisObject):
+    """Persist cached responses in Redis, so that they survive restarts."""
+
+    async def get(self, key: str) -> CachedResponse | None:
+        """Return the response stored under `key`, if any."""
+        value = await self.redis_session.client.get(f"{self.namespace}:{key}")
+        if value is None:
+            return None
+        return CachedResponse(**json.loads(value))
+
+    async def set(self, key: str, response: CachedResponse, ttl: int) -> None:
+        """Store `response` under `key`, expiring after `ttl` seconds."""
+        await self.redis_session.client.set(f"{self.namespace}:{key}", json.dumps(asdict(response)), ex=ttl)
+
+
+class HTTPCache:
+    """
+    A cache of HTTP GET responses, which are revalidated with conditional requests.
+
+    Responses carrying an `ETag` or `Last-Modified` header are kept, and requested again with
+    `If-None-Match` or `If-Modified-Since`. If the server answers with 304 Not Modified, the cached body is used.
+    For APIs such as GitHub's, such requests don't count against the rate limit.
+
+    Responses are kept in memory in LRU order, bounded by both their count and total size.
+    If `redis_namespace` is given, responses up to `max_redis_entry_size` are also persisted in Redis.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 512,
+        max_size: int = 16 * 1024 * 1024,
+        redis_namespace: str | None = None,
+        redis_ttl: int = DAY_SECONDS,
+        max_redis_entry_size: int = 512 * 1024,
+    ):
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.redis_ttl = redis_ttl
+        self.max_redis_entry_size = max_redis_entry_size
+
+        self._responses: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._size = 0
+        self._redis_store = _RedisResponseStore(namespace=redis_namespace) if redis_namespace else None
+
+    async def get(
+        self,
+        session: ClientSession,
+        url: str,
+        response_format: Literal["text", "json"] = "text",
+        *,
+        headers: dict[str, str] | None = None,
+        max_age: float = 0,
+        **kwargs,
+    ) -> Any:
+        """
+        Send a GET request to `url` using `session`, and return the text or JSON body of the response.
+
+        A cached response younger than `max_age` seconds is returned without any request being made.
+        Otherwise, it's revalidated with a conditional request. Other `kwargs` are passed to `session.get`.
+
+        Raise `aiohttp.ClientResponseError` if the response has an error status.
+        """
+        headers = dict(headers or {})
+        key = self._key(url, headers, kwargs.get("params"))
+        cached = await self._get_cached(key)
+
+        if cached is not None and time.time() - cached.fetched_at < max_age:
+            log.trace(f"Using cached response for {url} without revalidating it.")
+            return self._format(cached.body, response_format)
+
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        async with session.get(url, headers=headers, **kwargs) as response:
+            if cached is not None and response.status == 304:
+                log.trace(f"Cached response for {url} is still valid.")
+                body = cached.body
+                cached = CachedResponse(body, cached.etag, cached.last_modified, time.time())
+                await self._store(key, cached, persist=False)
+                return self._format(body, response_format)
+
+            response.raise_for_status()
+            body = await response.text()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+
+        if etag or last_modified:
+            await self._store(key, CachedResponse(body, etag, last_modified, time.time()), persist=True)
+
+        return self._format(body, response_format)
+
+    def clear(self) -> None:
+        """Remove all responses from the in-memory cache."""
+        self._responses.clear()
+        self._size = 0
+
+    @staticmethod
+    def _key(url: str, headers: dict[str, str], params: Any = None) -> str:
+        """Return the cache key of a request, taking into account its query and the headers which may change it."""
+        if params:
+            # Build the URL the way aiohttp does, so that the same request gets the same key however it's written.
+            url = str(URL(url).extend_query(params))
+        varying_headers = (headers.get("Accept", ""), headers.get("Authorization", ""))
+        return hashlib.sha256(json.dumps([url, *varying_headers]).encode()).hexdigest()
+
+    @staticmethod
+    def _format(body: str, response_format: Literal["text", "json"]) -> Any:
+        """Return `body` in the requested format."""
+        if response_format == "json":
+            return json.loads(body)
+        return body
+
+    async def _get_cached(self, key: str) -> CachedResponse | None:
+        """Return the cached response for `key` from memory, or from Redis if it's enabled."""
+        if (cached := self._responses.get(key)) is not None:
+            self._responses.move_to_end(key)
+            return cached
+
+        if self._redis_store is not None and (cached := await self._redis_store.get(key)) is not None:
+            self._remember(key, cached)
+
+        return cached
+
+    async def _store(self, key: str, response: CachedResponse, *, persist: bool) -> None:
+        """Cache `response` in memory, and in Redis too if `persist` is True and it's enabled."""
+        self._remember(key, response)
+
+        if persist and self._redis_store is not None and response.size <= self.max_redis_entry_size:
+            await self._redis_store.set(key, response, self.redis_ttl)
+
+    def _remember(self, key: str, response: CachedResponse) -> None:
+        """Cache `response` in memory, evicting the least recently used responses to stay within the bounds."""
+        if response.size > self.max_size:
+            return
+
+        if (previous := self._responses.pop(key, None)) is not None:
+            self._size -= previous.size
+
+        self._responses[key] = response
+        self._size += response.size
+
+        while len(self._responses) > self.max_entries or self._size > self.max_size:
+            _, evicted = self._responses.popitem(last=False)
+            self._size -= evicted.size
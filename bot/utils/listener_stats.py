@@ -0,0 +1,138 @@
+import time
+from collections import defaultdict
+from collections.abc import Callable, Coroutine, Generator
+from dataclasses import dataclass
+from typing import Any
+
+from discord.ext.commands import Cog
+
+from bot.log import get_logger
+from bot.utils.metrics import AggregatingStats
+
+log = get_logger(__name__)
+
+# Seconds a listener may run without yielding to the event loop before a warning is logged.
+# This matches the threshold asyncio uses for slow callbacks in debug mode.
+SLOW_STEP_DURATION = 0.1
+
+
+def listener_owner(listener: Callable) -> str:
+    """Return the name of the cog which `listener` belongs to, or of its class or module if it isn't a cog's."""
+    owner = getattr(listener, "__self__", None)
+    if isinstance(owner, Cog):
+        return owner.qualified_name
+    if owner is not None:
+        return type(owner).__name__
+    return listener.__module__
+
+
+@dataclass(slots=True)
+class ListenerTimings:
+    """The timings of a listener for an event, accumulated over all its calls."""
+
+    calls: int = 0
+    wall_time: float = 0  # Seconds from the start of each call until it returned, including any awaits.
+    cpu_time: float = 0  # CPU seconds spent running the listener's code.
+    longest_step: float = 0  # The longest time the listener held the event loop without yielding.
+
+    def add(self, wall_time: float, cpu_time: float, longest_step: float) -> None:
+        """Add the timings of a call."""
+        self.calls += 1
+        self.wall_time += wall_time
+        self.cpu_time += cpu_time
+        self.longest_step = max(self.longest_step, longest_step)
+
+
+class _TimedCoroutine:
+    """
+    An awaitable driving `coro` step by step, and timing each step.
+
+    A step is the code a coroutine runs between two suspensions, during which the event loop is blocked.
+    Timing the steps, rather than the whole coroutine, excludes the time other tasks ran while it was suspended.
+    """
+
+    __slots__ = ("_coro", "cpu_time", "longest_step")
+
+    def __init__(self, coro: Coroutine):
+        self._coro = coro
+        self.cpu_time = 0.0
+        self.longest_step = 0.0
+
+    def __await__(self) -> Generator[Any, Any, Any]:
+        value, error = None, None
+        while True:
+            start, cpu_start = time.perf_counter(), time.thread_time()
+            try:
+                yielded = self._coro.send(value) if error is None else self._coro.throw(error)
+            except StopIteration as e:
+                return e.value
+            finally:
+                self.cpu_time += time.thread_time() - cpu_start
+                self.longest_step = max(self.longest_step, time.perf_counter() - start)
+
+            try:
+                value, error = (yield yielded), None
+            except BaseException as e:
+                # Pass cancellations and other errors thrown in by the task on to the coroutine.
+                value, error = None, e
+
+
+class ListenerStats:
+    """
+    Timings of the event listeners run by the bot, per listener and event.
+
+    The timings are sent to statsd through `metrics` under `listeners.<event>.<owner>.<listener>`, once per flush
+    rather than once per call, so the number of packets doesn't grow with the rate of events. Each flush reports
+    the number of calls, their mean wall time and CPU time, and the longest step. A warning naming the listener
+    and its cog is logged when a listener blocks the event loop for longer than `SLOW_STEP_DURATION`.
+    """
+
+    def __init__(self, metrics: AggregatingStats):
+        self._metrics = metrics
+        self.timings: defaultdict[tuple[str, str], ListenerTimings] = defaultdict(ListenerTimings)
+        self.since = time.time()
+
+        # The timings of each listener since they were last reported, by stat name.
+        self._unreported: defaultdict[str, ListenerTimings] = defaultdict(ListenerTimings)
+        metrics.add_flush_callback(self._report)
+
+    def instrument(self, listener: Callable[..., Coroutine], event_name: str) -> Callable[..., Coroutine]:
+        """Return a wrapper of `listener` which times its calls for `event_name`."""
+        owner = listener_owner(listener)
+        name = f"{owner}.{listener.__name__}"
+        stat = f"listeners.{event_name}.{name.replace(' ', '_')}"
+
+        async def timed_listener(*args, **kwargs) -> Any:
+            timed = _TimedCoroutine(listener(*args, **kwargs))
+            start = time.perf_counter()
+            try:
+                return await timed
+            finally:
+                self._record(event_name, name, stat, time.perf_counter() - start, timed)
+
+        return timed_listener
+
+    def top(self, count: int) -> list[tuple[str, str, ListenerTimings]]:
+        """Return the `count` listeners which used the most CPU time, along with their events and timings."""
+        top = sorted(self.timings.items(), key=lambda item: item[1].cpu_time, reverse=True)[:count]
+        return [(name, event_name, timings) for (event_name, name), timings in top]
+
+    def _record(self, event_name: str, name: str, stat: str, wall_time: float, timed: _TimedCoroutine) -> None:
+        """Add the timings of a listener's call to its totals, and to those to be reported with the next flush."""
+        self.timings[event_name, name].add(wall_time, timed.cpu_time, timed.longest_step)
+        self._unreported[stat].add(wall_time, timed.cpu_time, timed.longest_step)
+        # Counters are summed until the flush, which this schedules if it isn't already.
+        self._metrics.incr(f"{stat}.calls")
+
+        if timed.longest_step > SLOW_STEP_DURATION:
+            log.warning(
+                f"Listener {name} for {event_name} blocked the event loop for {timed.longest_step * 1000:.0f}ms."
+            )
+
+    def _report(self) -> None:
+        """Report the mean and longest timings of each listener since the last flush."""
+        for stat, timings in self._unreported.items():
+            self._metrics.timing(f"{stat}.wall", timings.wall_time / timings.calls * 1000)
+            self._metrics.timing(f"{stat}.cpu", timings.cpu_time / timings.calls * 1000)
+            self._metrics.gauge(f"{stat}.longest_step", timings.longest_step * 1000)
+        self._unreported.clear()
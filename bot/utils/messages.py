@@ -1,10 +1,13 @@
+import asyncio
+import json
 import random
 import re
-from collections.abc import Callable, Iterable, Sequence
+import zlib
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from datetime import UTC, datetime
 from functools import partial
 from io import BytesIO
-from itertools import zip_longest
+from tempfile import TemporaryFile
 
 import discord
 from discord import Message
@@ -19,6 +22,9 @@ from bot.log import get_logger
 
 log = get_logger(__name__)
 
+# The size of the chunks in which a deleted messages log's JSON is serialised, and compressed if enabled.
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
 
 def reaction_check(
     reaction: discord.Reaction,
@@ -180,6 +186,35 @@ async def send_attachments(
     return urls
 
 
+async def _get_reaction_users(reaction: discord.Reaction) -> list[discord.abc.User]:
+    """Return the users who added `reaction`."""
+    return [user async for user in reaction.users()]
+
+
+async def get_unique_reaction_users(
+    message: discord.Message,
+    reaction_predicate: Callable[[discord.Reaction], bool] = lambda _: True,
+    user_predicate: Callable[[discord.User], bool] = lambda _: True,
+    count_bots: bool = True
+) -> dict[int, discord.abc.User]:
+    """
+    Return the unique users who reacted to the message, by ID.
+
+    The users of all reactions which pass `reaction_predicate` are fetched concurrently, and only the users who
+    pass `user_predicate` are returned, along with bots if `count_bots` is True.
+    """
+    reactions = [reaction for reaction in message.reactions if reaction_predicate(reaction)]
+    # A message can have at most 20 different reactions, so fetching them all at once is bounded already.
+    reaction_users = await asyncio.gather(*(_get_reaction_users(reaction) for reaction in reactions))
+
+    return {
+        user.id: user
+        for users in reaction_users
+        for user in users
+        if (count_bots or not user.bot) and user_predicate(user)
+    }
+
+
 async def count_unique_users_reaction(
     message: discord.Message,
     reaction_predicate: Callable[[discord.Reaction], bool] = lambda _: True,
@@ -192,15 +227,7 @@ async def count_unique_users_reaction(
     A reaction_predicate function can be passed to check if this reaction should be counted,
     another user_predicate to check if the user should also be counted along with a count_bot flag.
     """
-    unique_users = set()
-
-    for reaction in message.reactions:
-        if reaction_predicate(reaction):
-            async for user in reaction.users():
-                if (count_bots or not user.bot) and user_predicate(user):
-                    unique_users.add(user.id)
-
-    return len(unique_users)
+    return len(await get_unique_reaction_users(message, reaction_predicate, user_predicate, count_bots))
 
 
 def sub_clyde(username: str | None) -> str | None:
@@ -243,45 +270,94 @@ def format_channel(channel: discord.abc.Messageable) -> str:
     return formatted
 
 
+def _serialise_deleted_message(message: Message, attachments: list[str]) -> dict:
+    """Return the representation of a deleted `message` for the site."""
+    return {
+        "id": message.id,
+        "author": message.author.id,
+        "channel_id": message.channel.id,
+        "content": message.content.replace("\0", ""),  # Null chars cause 400.
+        "embeds": [embed.to_dict() for embed in message.embeds],
+        "attachments": attachments,
+    }
+
+
+def _iter_deleted_messages_body(
+    messages: Iterable[Message],
+    actor_id: int,
+    attachments: dict[int, list[str]] | None,
+    *,
+    compress: bool,
+) -> Iterator[bytes]:
+    """
+    Serialise the deleted messages log incrementally, yielding its JSON in chunks of about `UPLOAD_CHUNK_SIZE`.
+
+    Only one message and one chunk are held in memory at a time, so this is flat in the number of messages.
+    If `compress` is True, the chunks are gzip compressed.
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if compress else None
+    creation = json.dumps(datetime.now(UTC).isoformat())
+    buffer = [f'{{"actor": {actor_id}, "creation": {creation}, "deletedmessage_set": ['.encode()]
+    buffered = len(buffer[0])
+
+    def flush() -> bytes:
+        nonlocal buffered
+        chunk = b"".join(buffer)
+        buffer.clear()
+        buffered = 0
+        return compressor.compress(chunk) if compressor else chunk
+
+    for index, message in enumerate(messages):
+        message_attachments = attachments.get(message.id, []) if attachments else []
+        serialised = json.dumps(_serialise_deleted_message(message, message_attachments)).encode()
+        if index:
+            serialised = b", " + serialised
+
+        buffer.append(serialised)
+        buffered += len(serialised)
+        if buffered >= UPLOAD_CHUNK_SIZE:
+            chunk = flush()
+            if chunk:
+                yield chunk
+
+    buffer.append(b"]}")
+    chunk = flush()
+    if compressor:
+        chunk += compressor.flush()
+    yield chunk
+
+
 async def upload_log(
     messages: Iterable[Message],
     actor_id: int,
     attachments: dict[int, list[str]] | None = None,
 ) -> str:
-    """Upload message logs to the database and return a URL to a page for viewing the logs."""
-    if attachments is None:
-        attachments = []
-    else:
-        attachments = [attachments.get(message.id, []) for message in messages]
-
-    deletedmessage_set = [
-        {
-            "id": message.id,
-            "author": message.author.id,
-            "channel_id": message.channel.id,
-            "content": message.content.replace("\0", ""),  # Null chars cause 400.
-            "embeds": [embed.to_dict() for embed in message.embeds],
-            "attachments": attachment,
-        }
-        for message, attachment in zip_longest(messages, attachments, fillvalue=[])
-    ]
+    """
+    Upload message logs to the database and return a URL to a page for viewing the logs.
 
-    try:
-        response = await bot.instance.api_client.post(
-            "bot/deleted-messages",
-            json={
-                "actor": actor_id,
-                "creation": datetime.now(UTC).isoformat(),
-                "deletedmessage_set": deletedmessage_set,
-            }
-        )
-    except ResponseCodeError as e:
-        add_breadcrumb(
-            category="api_error",
-            message=str(e),
-            level="error",
-            data=deletedmessage_set,
-        )
-        raise
+    The log is serialised incrementally to a temporary file, and compressed if the site accepts gzip, which is then
+    streamed to the site. Only a chunk of the log is held in memory at a time, however many messages it has.
+    """
+    messages = list(messages)
+    headers = {"Content-Type": "application/json"}
+    if URLs.site_api_gzip:
+        headers["Content-Encoding"] = "gzip"
+
+    # The site isn't known to accept chunked request bodies, so the log is sent from a file, which has a length.
+    with TemporaryFile() as body:
+        chunks = _iter_deleted_messages_body(messages, actor_id, attachments, compress=URLs.site_api_gzip)
+        await asyncio.to_thread(body.writelines, chunks)
+        body.seek(0)
+
+        try:
+            response = await bot.instance.api_client.post("bot/deleted-messages", data=body, headers=headers)
+        except ResponseCodeError as e:
+            add_breadcrumb(
+                category="api_error",
+                message=str(e),
+                level="error",
+                data={"actor": actor_id, "message_ids": [message.id for message in messages]},
+            )
+            raise
 
     return f"{URLs.site_logs_view}/{response['id']}"
@@ -0,0 +1,128 @@
+import asyncio
+from collections import defaultdict
+from collections.abc import Callable
+from datetime import timedelta
+
+from statsd.client.base import StatsClientBase
+
+from bot.log import get_logger
+
+log = get_logger(__name__)
+
+# The largest statsd packet which fits in a single Ethernet frame, after the IP and UDP headers.
+MAX_PACKET_SIZE = 1432
+
+
+class AggregatingStats:
+    """
+    A layer over the bot's statsd client which buffers metrics in memory and sends them in batches.
+
+    Counters are summed and gauges keep their latest value until they're flushed, every `flush_interval` seconds.
+    Each flush packs the metrics into as few multi-metric packets as possible, so the number of datagrams sent
+    doesn't grow with the rate of events. Use it for metrics reported from hot paths, such as message events.
+
+    `get_client` is called on each flush, since the bot replaces its statsd client when it (re)connects.
+    Callbacks added with `add_flush_callback` are called at the start of each flush, to report metrics which
+    are aggregated elsewhere.
+    """
+
+    def __init__(self, get_client: Callable[[], StatsClientBase | None], flush_interval: float = 5):
+        self._get_client = get_client
+        self.flush_interval = flush_interval
+
+        self._counters: defaultdict[str, int] = defaultdict(int)
+        self._gauges: dict[str, float] = {}
+        self._timings: defaultdict[str, list[float]] = defaultdict(list)
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_callbacks: list[Callable[[], None]] = []
+
+    def add_flush_callback(self, callback: Callable[[], None]) -> None:
+        """Call `callback` at the start of each flush, so that the metrics it reports are sent with it."""
+        self._flush_callbacks.append(callback)
+
+    def incr(self, stat: str, count: int = 1) -> None:
+        """Increment the counter `stat` by `count`."""
+        self._counters[stat] += count
+        self._schedule_flush()
+
+    def decr(self, stat: str, count: int = 1) -> None:
+        """Decrement the counter `stat` by `count`."""
+        self.incr(stat, -count)
+
+    def gauge(self, stat: str, value: float) -> None:
+        """Set the gauge `stat` to `value`."""
+        self._gauges[stat] = value
+        self._schedule_flush()
+
+    def timing(self, stat: str, delta: timedelta | float) -> None:
+        """Record a timing of `delta`, either a timedelta or a number of milliseconds."""
+        if isinstance(delta, timedelta):
+            delta = delta.total_seconds() * 1000
+        self._timings[stat].append(delta)
+        self._schedule_flush()
+
+    def flush(self) -> None:
+        """Send all buffered metrics to statsd."""
+        # The callbacks run while the flush is still scheduled, so the metrics they report don't schedule another.
+        for callback in self._flush_callbacks:
+            callback()
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        client = self._get_client()
+        if client is None:
+            # The bot hasn't connected to statsd yet; the metrics will be sent with the next flush.
+            return
+
+        lines = []
+        for stat, count in self._counters.items():
+            lines.append(client._prepare(stat, f"{count}|c", 1))
+        for stat, value in self._gauges.items():
+            if value < 0:
+                # A negative value would be interpreted as a decrement, so the gauge has to be reset first.
+                lines.append(client._prepare(stat, "0|g", 1))
+            lines.append(client._prepare(stat, f"{value}|g", 1))
+        for stat, deltas in self._timings.items():
+            lines.extend(client._prepare(stat, f"{delta:0.6f}|ms", 1) for delta in deltas)
+
+        self._counters.clear()
+        self._gauges.clear()
+        self._timings.clear()
+
+        for packet in self._pack(lines):
+            client._send(packet)
+
+    @staticmethod
+    def _pack(lines: list[str]) -> list[str]:
+        """Join `lines` into packets no larger than `MAX_PACKET_SIZE`."""
+        packets = []
+        packet = []
+        size = 0
+        for line in lines:
+            # Account for the newline separating the line from the previous one.
+            if packet and size + 1 + len(line) > MAX_PACKET_SIZE:
+                packets.append("\n".join(packet))
+                packet = []
+                size = 0
+            size += len(line) + bool(packet)
+            packet.append(line)
+
+        if packet:
+            packets.append("\n".join(packet))
+        return packets
+
+    def _schedule_flush(self) -> None:
+        """Schedule a flush after `flush_interval` seconds, unless one is already scheduled."""
+        if self._flush_handle is not None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            log.trace("No running event loop to schedule a flush of the buffered metrics; flushing now.")
+            self.flush()
+            return
+
+        self._flush_handle = loop.call_later(self.flush_interval, self.flush)
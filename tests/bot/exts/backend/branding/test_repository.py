@@ -0,0 +1,93 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from bot.exts.backend.branding import _repository
+from bot.exts.backend.branding._repository import BRANDING_URL, BrandingRepository
+from tests.helpers import MockBot
+
+META = b"---\nstart_date: July 1\nend_date: July 31\n---\nAn event."
+
+
+def remote_object(path: str, type_: str, sha: str = "sha") -> dict:
+    return {
+        "sha": sha,
+        "name": path.rsplit("/", 1)[-1],
+        "path": path,
+        "type": type_,
+        "download_url": f"https://raw.example/{path}" if type_ == "file" else None,
+    }
+
+
+class FakeGitHub:
+    """Serves a branding repository with `event_count` events, tracking the number of concurrent requests."""
+
+    def __init__(self, event_count: int):
+        self.listings = {"events": [remote_object(f"events/event_{i}", "dir") for i in range(event_count)]}
+        for i in range(event_count):
+            path = f"events/event_{i}"
+            self.listings[path] = [
+                remote_object(f"{path}/meta.md", "file"),
+                remote_object(f"{path}/server_icons", "dir"),
+                remote_object(f"{path}/banners", "dir"),
+            ]
+            self.listings[f"{path}/server_icons"] = [remote_object(f"{path}/server_icons/icon.png", "file")]
+            self.listings[f"{path}/banners"] = [remote_object(f"{path}/banners/banner.png", "file")]
+
+        self.concurrent = self.max_concurrent = 0
+
+    async def _request(self) -> None:
+        self.concurrent += 1
+        self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        await asyncio.sleep(0)
+        self.concurrent -= 1
+
+    async def get_listing(self, _session, url: str, *_args, **_kwargs) -> list[dict]:
+        await self._request()
+        return self.listings[url.removeprefix(f"{BRANDING_URL}/")]
+
+    def get_file(self, *_args, **_kwargs) -> MagicMock:
+        response = MagicMock(status=200)
+        response.read = AsyncMock(return_value=META)
+
+        async def enter():
+            await self._request()
+            return response
+
+        context_manager = MagicMock()
+        context_manager.__aenter__ = MagicMock(side_effect=enter)
+        context_manager.__aexit__ = AsyncMock(return_value=False)
+        return context_manager
+
+
+class BrandingRepositoryTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.github = FakeGitHub(event_count=20)
+        self.bot = MockBot()
+        self.bot.http_cache.get = AsyncMock(side_effect=self.github.get_listing)
+        self.bot.http_session.get = MagicMock(side_effect=self.github.get_file)
+        self.repository = BrandingRepository(self.bot)
+
+    async def test_events_are_fetched_concurrently_with_a_limit(self):
+        """Event directories should be read concurrently, with a bounded number of requests in flight."""
+        events = await self.repository.get_events()
+
+        self.assertEqual([event.path for event in events], [f"events/event_{i}" for i in range(20)])
+        self.assertEqual(events[0].meta.description, "An event.")
+        self.assertEqual(self.github.max_concurrent, _repository.MAX_CONCURRENT_REQUESTS)
+        self.assertEqual(self.repository.api_calls, 1 + 20 * 4)
+        self.bot.metrics.gauge.assert_called_once_with("branding.discovery_api_calls", 81)
+
+    async def test_unchanged_events_are_reused(self):
+        """Only events whose directory SHA changed should be fetched again."""
+        first = await self.repository.get_events()
+        self.github.listings["events"][3]["sha"] = "changed"
+        del self.github.listings["events"][5]
+
+        second = await self.repository.get_events()
+
+        self.assertEqual(self.repository.api_calls, 81 + 1 + 4)
+        self.assertEqual(len(second), 19)
+        self.assertIs(second[0], first[0])
+        self.assertIsNot(second[3], first[3])
+        self.assertEqual(len(self.repository._events), 19)
@@ -0,0 +1,99 @@
+import time
+import unittest
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+
+from bot import constants
+from bot.exts.fun import duck_pond
+from bot.exts.fun.duck_pond import DuckPond
+from tests.helpers import MockBot, MockGuild, MockMember, MockMessage, MockReaction, MockRole, MockTextChannel
+
+THRESHOLD = constants.DuckPond.threshold
+DUCK = discord.PartialEmoji(name="🦆")
+
+
+class DuckPondTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.bot = MockBot()
+        self.cog = DuckPond(self.bot)
+        self.cog.locked_relay = AsyncMock()
+
+        staff_role = MockRole(id=constants.STAFF_ROLES[0])
+        self.staff = [MockMember(id=i, roles=[staff_role], bot=False) for i in range(1, THRESHOLD + 2)]
+        self.author = MockMember(id=1000, roles=[staff_role], bot=False)
+        members = {member.id: member for member in (*self.staff, self.author)}
+
+        self.channel = MockTextChannel(id=1)
+        self.channel.fetch_message = AsyncMock()
+        self.guild = MockGuild(id=constants.Guild.id)
+        self.guild.get_member = MagicMock(side_effect=members.get)
+        self.guild.get_channel_or_thread = MagicMock(return_value=self.channel)
+        self.bot.get_guild.return_value = self.guild
+        self.bot.cached_messages = []
+
+    @staticmethod
+    def message_id(created_at: datetime) -> int:
+        return discord.utils.time_snowflake(created_at)
+
+    def payload(self, message_id: int, member: MockMember, emoji: discord.PartialEmoji = DUCK) -> MagicMock:
+        return MagicMock(
+            guild_id=constants.Guild.id,
+            channel_id=self.channel.id,
+            message_id=message_id,
+            message_author_id=self.author.id,
+            user_id=member.id,
+            member=member,
+            emoji=emoji,
+        )
+
+    async def test_new_message_is_relayed_without_fetching_reactions(self):
+        """Ducks on a new message should be tallied from the events alone, and relayed once at the threshold."""
+        message_id = self.message_id(datetime.now(tz=UTC))
+        self.bot.cached_messages = [MockMessage(id=message_id)]
+
+        for member in self.staff:
+            await self.cog.on_raw_reaction_add(self.payload(message_id, member))
+
+        self.channel.fetch_message.assert_not_awaited()
+        self.cog.locked_relay.assert_awaited_once_with(self.bot.cached_messages[0])
+        self.assertIn(message_id, self.cog.ducked_messages)
+        self.assertEqual(len(self.cog.duck_tallies[message_id].ducks), THRESHOLD + 1)
+
+    async def test_removed_ducks_are_untallied(self):
+        """A staff member should only be untallied once they removed all their duck reactions."""
+        message_id = self.message_id(datetime.now(tz=UTC))
+        ducky = discord.PartialEmoji(name="ducky_yellow", id=123)
+
+        await self.cog.on_raw_reaction_add(self.payload(message_id, self.staff[0]))
+        await self.cog.on_raw_reaction_add(self.payload(message_id, self.staff[0], ducky))
+        await self.cog.on_raw_reaction_remove(self.payload(message_id, self.staff[0]))
+        self.assertEqual(self.cog.duck_tallies[message_id].ducks, {self.staff[0].id: {123}})
+
+        await self.cog.on_raw_reaction_remove(self.payload(message_id, self.staff[0], ducky))
+        self.assertEqual(self.cog.duck_tallies[message_id].ducks, {})
+
+    async def test_old_message_tally_is_built_from_reactions_once(self):
+        """A message sent before the cog was loaded should have its tally built from its reactions, only once."""
+        message_id = self.message_id(datetime.now(tz=UTC) - timedelta(days=1))
+        users = [*self.staff[:2], MockMember(id=2000, bot=False)]
+        reaction = MockReaction(emoji="🦆", users=users)
+        self.channel.fetch_message.return_value = MockMessage(id=message_id, guild=self.guild, reactions=[reaction])
+
+        await self.cog.on_raw_reaction_add(self.payload(message_id, self.staff[0]))
+        await self.cog.on_raw_reaction_add(self.payload(message_id, self.staff[2]))
+
+        self.channel.fetch_message.assert_awaited_once()
+        self.assertEqual(set(self.cog.duck_tallies[message_id].ducks), {member.id for member in self.staff[:3]})
+
+    async def test_tallies_expire(self):
+        """Tallies which weren't updated within the window should be removed."""
+        message_id = self.message_id(datetime.now(tz=UTC))
+        await self.cog.on_raw_reaction_add(self.payload(message_id, self.staff[0]))
+
+        later = time.monotonic() + duck_pond.DUCK_TALLY_WINDOW.total_seconds() + 1
+        with patch.object(duck_pond.time, "monotonic", return_value=later):
+            self.cog._expire_duck_tallies()
+
+        self.assertNotIn(message_id, self.cog.duck_tallies)
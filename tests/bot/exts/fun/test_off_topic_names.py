@@ -0,0 +1,75 @@
+import random
+import string
+import time
+import unittest
+from unittest.mock import AsyncMock
+
+from bot.converters import OffTopicName
+from bot.exts.fun.off_topic_names import OffTopicNameIndex, OffTopicNames
+from tests.helpers import MockBot, MockContext
+
+
+class OffTopicNameIndexTests(unittest.TestCase):
+    def setUp(self):
+        # Names are stored as they're converted by `OffTopicName`, with apostrophes replaced by lookalikes.
+        self.pond = OffTopicName.translate_name("python's-pond")
+        self.index = OffTopicNameIndex([self.pond, "snake-pit", "ducky-dumpling", "lemon-drop", "spam-and-eggs"])
+
+    def test_names_containing_query_are_found(self):
+        """Names containing the query should be found, however the query is written."""
+        self.assertEqual(self.index.search("pond"), [self.pond])
+        self.assertEqual(self.index.search(OffTopicName.translate_name("PYTHON's")), [self.pond])
+        self.assertEqual(self.index.search("d"), ["ducky-dumpling", "lemon-drop", self.pond, "spam-and-eggs"])
+
+    def test_similar_names_are_found(self):
+        """Names similar to the query should be found."""
+        self.assertEqual(self.index.search("snake-pits"), ["snake-pit"])
+        self.assertEqual(self.index.search("lemon-drops"), ["lemon-drop"])
+        self.assertEqual(self.index.search("zebra-crossing"), [])
+
+    def test_search_is_fast_for_many_names(self):
+        """Searching tens of thousands of names should take no more than a few milliseconds."""
+        rng = random.Random(0)
+        names = ["-".join("".join(rng.choices(string.ascii_lowercase, k=6)) for _ in range(3)) for _ in range(30_000)]
+        index = OffTopicNameIndex(names)
+
+        timings = []
+        for name in names[:100]:
+            start = time.perf_counter()
+            self.assertIn(name, index.search(name[:8]))
+            timings.append(time.perf_counter() - start)
+        # The median is used, so that a busy machine pausing the test doesn't fail it.
+        elapsed = sorted(timings)[len(timings) // 2]
+
+        self.assertLess(elapsed, 0.01)
+
+
+class OffTopicNamesSearchTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.bot = MockBot()
+        self.bot.api_client.get = AsyncMock(return_value=["snake-pit"])
+        self.cog = OffTopicNames(self.bot)
+        self.addAsyncCleanup(self.cog.cog_unload)
+        self.ctx = MockContext(bot=self.bot)
+
+    async def test_names_are_fetched_once(self):
+        """The names should only be fetched from the site for the first search."""
+        for _ in range(3):
+            await self.cog.search_command(self.cog, self.ctx, query="snake")
+
+        self.bot.api_client.get.assert_awaited_once_with("bot/off-topic-channel-names")
+
+    async def test_index_is_invalidated_by_changes(self):
+        """Adding, deleting, activating or deactivating a name should cause the names to be fetched again."""
+        changes = (
+            self.cog._add_name(self.ctx, "new-name"),
+            self.cog.delete_command(self.cog, self.ctx, name="snake-pit"),
+            self.cog.activate_ot_name(self.cog, self.ctx, "snake-pit"),
+            self.cog.de_activate_ot_name(self.cog, self.ctx, "snake-pit"),
+        )
+        for change in changes:
+            await self.cog.get_name_index()
+            await change
+            self.assertIsNone(self.cog._name_index)
+
+        self.assertEqual(self.bot.api_client.get.await_count, 4)
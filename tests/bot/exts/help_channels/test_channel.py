@@ -0,0 +1,152 @@
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import arrow
+import discord
+
+from bot import constants
+from bot.exts.help_channels import _caches, _channel, _stats
+from tests.base import RedisTestCase
+
+OWNER_ID = 1
+HELPER_ID = 2
+OPENED_AT = datetime(2024, 1, 1, 12, tzinfo=UTC)
+
+
+class PostActivityTests(RedisTestCase):
+    """Tests for the closing time of help posts, as determined from their tracked activity or their history."""
+
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        _channel._fully_tracked_posts.clear()
+        _channel._last_bot_messages.clear()
+        self.addCleanup(_channel._fully_tracked_posts.clear)
+        self.addCleanup(_channel._last_bot_messages.clear)
+
+        self.history = []
+        self.post = MagicMock(
+            id=discord.utils.time_snowflake(OPENED_AT),
+            owner_id=OWNER_ID,
+            created_at=OPENED_AT,
+            last_message_id=None,
+            starter_message=None,
+        )
+        self.post.fetch_message.side_effect = discord.NotFound(MagicMock(status=404), "Unknown Message")
+        self.post.history.side_effect = self.iter_history
+
+    async def iter_history(self, **_kwargs):
+        for message in reversed(self.history):
+            yield message
+
+    def message(self, author_id: int, minutes: int, *, bot: bool = False) -> SimpleNamespace:
+        """Return a message sent in the post `minutes` after it was opened, and add it to the post's history."""
+        created_at = OPENED_AT + timedelta(minutes=minutes)
+        message_id = self.post.id if minutes == 0 else discord.utils.time_snowflake(created_at)
+        message = SimpleNamespace(
+            id=message_id,
+            channel=self.post,
+            created_at=created_at,
+            author=SimpleNamespace(id=author_id, bot=bot),
+        )
+        self.history.append(message)
+        self.post.last_message_id = message_id
+        return message
+
+    @staticmethod
+    def idle_at(minutes: int) -> arrow.Arrow:
+        return arrow.Arrow.fromdatetime(OPENED_AT + timedelta(minutes=minutes + constants.HelpChannels.idle_minutes))
+
+    async def test_tracked_activity_is_used(self):
+        """The activity of a post opened since the bot started should be taken from its events."""
+        _channel._fully_tracked_posts.add(self.post.id)
+        for message in (self.message(OWNER_ID, 0), self.message(HELPER_ID, 3), self.message(OWNER_ID, 7)):
+            await _channel.record_post_activity(message)
+
+        closing_time, reason = await _channel.get_closing_time(self.post)
+
+        self.post.history.assert_not_called()
+        self.assertEqual(closing_time, self.idle_at(7))
+        self.assertEqual(reason, _stats.ClosingReason.INACTIVE)
+
+    async def test_activity_missed_while_offline_is_read_from_history(self):
+        """A claimant's follow-up sent while the bot was offline shouldn't get the post closed as deleted."""
+        self.message(OWNER_ID, 0)
+        self.message(OWNER_ID, 2)
+        # Only the later reply is seen, after the bot restarted.
+        await _channel.record_post_activity(self.message(HELPER_ID, 5))
+
+        closing_time, reason = await _channel.get_closing_time(self.post)
+
+        self.post.history.assert_called_once()
+        self.assertEqual(closing_time, self.idle_at(5))
+        self.assertEqual(reason, _stats.ClosingReason.INACTIVE)
+
+    async def test_tracked_activity_older_than_last_message_is_outdated(self):
+        """The history should be read if the post's last message is newer than the tracked activity."""
+        _channel._fully_tracked_posts.add(self.post.id)
+        await _channel.record_post_activity(self.message(OWNER_ID, 0))
+        self.message(OWNER_ID, 4)
+
+        closing_time, reason = await _channel.get_closing_time(self.post)
+
+        self.post.history.assert_called_once()
+        self.assertEqual(closing_time, self.idle_at(4))
+        self.assertEqual(reason, _stats.ClosingReason.INACTIVE)
+
+    async def test_untracked_post_falls_back_to_history_once(self):
+        """A post without tracked activity should have its history read, and be tracked from then on."""
+        self.message(OWNER_ID, 0)
+        self.message(HELPER_ID, 1)
+
+        closing_time, reason = await _channel.get_closing_time(self.post)
+        self.assertEqual(reason, _stats.ClosingReason.DELETED)
+        self.assertEqual(
+            closing_time,
+            arrow.Arrow.fromdatetime(OPENED_AT + timedelta(minutes=constants.HelpChannels.deleted_idle_minutes)),
+        )
+
+        await _channel.record_post_activity(self.message(OWNER_ID, 9))
+        closing_time, reason = await _channel.get_closing_time(self.post)
+
+        self.post.history.assert_called_once()
+        self.assertEqual(closing_time, self.idle_at(9))
+        self.assertEqual(reason, _stats.ClosingReason.INACTIVE)
+
+    async def test_bot_messages_are_not_tracked(self):
+        """The bot's closing message shouldn't bring back the activity cleared when the post was closed."""
+        _channel._fully_tracked_posts.add(self.post.id)
+        await _channel.record_post_activity(self.message(OWNER_ID, 0))
+        await _channel._clear_post_activity(self.post.id)
+
+        await _channel.record_post_activity(self.message(HELPER_ID, 60, bot=True))
+
+        self.assertEqual(await _caches.posts_last_message_times.to_dict(), {})
+        self.assertNotIn(self.post.id, _channel._fully_tracked_posts)
+
+    async def test_bot_opener_as_last_message_keeps_tracked_activity(self):
+        """The tracked activity of an unanswered post shouldn't be outdated by the bot's opener message."""
+        _channel._fully_tracked_posts.add(self.post.id)
+        self.post.starter_message = self.message(OWNER_ID, 0)
+        await _channel.record_post_activity(self.post.starter_message)
+        await _channel.record_post_activity(self.message(HELPER_ID, 1, bot=True))
+
+        closing_time, reason = await _channel.get_closing_time(self.post)
+
+        self.post.history.assert_not_called()
+        self.assertEqual(closing_time, self.idle_at(0))
+        self.assertEqual(reason, _stats.ClosingReason.INACTIVE)
+
+    async def test_history_ignores_bot_messages(self):
+        """Bot messages read from the history shouldn't count as activity, as when tracked from events."""
+        self.message(OWNER_ID, 0)
+        self.message(OWNER_ID, 2)
+        self.message(HELPER_ID, 6, bot=True)
+
+        closing_time, reason = await _channel.get_closing_time(self.post)
+        self.assertEqual(closing_time, self.idle_at(2))
+        self.assertEqual(reason, _stats.ClosingReason.INACTIVE)
+
+        # The post is fully tracked from then on, despite its last message being the bot's.
+        await _channel.get_closing_time(self.post)
+        self.post.history.assert_called_once()
@@ -0,0 +1,101 @@
+import random
+import time
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from bot.exts.info.codeblock import _cog
+from bot.exts.info.codeblock._cog import CodeBlockCog
+from bot.exts.info.codeblock._instructions import get_instructions
+from bot.exts.info.codeblock._parsing import looks_like_prose
+from tests.helpers import MockBot
+
+PROSE = (
+    "hey does anyone know a good tutorial\nfor making discord bots\nI've looked around\nbut can't find any",
+    "I think the issue is with your venv\ntry deleting it\nand creating it again\nthen reinstall everything",
+    "lol\nyeah\nthat's what I thought too\nbut apparently not",
+    "Thanks a lot, that fixed it!\nI had no idea pip worked like that\nyou're a lifesaver\nhave a good one",
+    "has anyone used fastapi before\nI'm deciding between it and flask\nfor a small project\nno strong opinions yet",
+    "‘smart quotes’ from my phone\nshould be fine\nright?\nlet’s hope so",  # noqa: RUF001
+    "check out https://docs.python.org/3/library/asyncio.html\nit explains the event loop\nreally well\nworth a read",
+    "I'm getting an error when I run it\nit says something about a missing module\nwhat should I do\nany ideas?",
+)
+CODE = (
+    "x = 5\ny = 10\nprint(x + y)\nprint(x * y)",
+    "```\ndef add(a, b):\n    return a + b\nprint(add(1, 2))\n```",
+    "```py\nfor i in range(10):\n    print(i)\nprint('done')\n```",
+    "'''python\nimport os\nprint(os.getcwd())\nprint('hi')\n'''",
+    ">>> import this\nThe Zen of Python\n>>> 1 + 1\n2\n>>> print('hi')\nhi",
+    "here's my code\nimport discord\nclient = discord.Client()\nclient.run(TOKEN)",
+)
+
+
+class PrefilterCorpusTests(unittest.TestCase):
+    def test_prefilter_only_skips_messages_without_instructions(self):
+        """Every message the prefilter discards should be one without instructions."""
+        for message in PROSE + CODE:
+            with self.subTest(message=message):
+                if looks_like_prose(message):
+                    self.assertIsNone(get_instructions(message))
+
+        self.assertTrue(all(looks_like_prose(message) for message in PROSE if "https://" not in message))
+        self.assertFalse(any(looks_like_prose(message) for message in CODE))
+
+
+class CodeBlockCogTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cog = CodeBlockCog(MockBot())
+
+    async def test_instructions_are_cached(self):
+        """An unchanged message should only be parsed once."""
+        with patch.object(_cog, "get_instructions", wraps=get_instructions) as parse:
+            first = await self.cog.get_instructions(CODE[0])
+            second = await self.cog.get_instructions(CODE[0])
+
+        self.assertIsNotNone(first)
+        self.assertEqual(first, second)
+        parse.assert_called_once_with(CODE[0])
+
+    @patch.object(_cog, "INSTRUCTIONS_CACHE_SIZE", 2)
+    async def test_cache_is_bounded(self):
+        """The least recently used instructions should be evicted once the cache is full."""
+        for message in CODE[:3]:
+            await self.cog.get_instructions(message)
+
+        self.assertEqual(len(self.cog.instructions_cache), 2)
+
+    async def test_prose_is_not_parsed_or_cached(self):
+        """Prose shouldn't be parsed, nor take space in the cache."""
+        with patch.object(_cog, "get_instructions") as parse:
+            self.assertIsNone(await self.cog.get_instructions(PROSE[0]))
+
+        parse.assert_not_called()
+        self.assertEqual(len(self.cog.instructions_cache), 0)
+
+    async def test_long_messages_are_parsed_in_thread(self):
+        """Messages longer than the size cap should be parsed in a thread."""
+        long_message = CODE[0] + "\nprint(x)" * _cog.PARSE_IN_THREAD_LENGTH
+        with patch.object(_cog.asyncio, "to_thread", AsyncMock(return_value="instructions")) as to_thread:
+            await self.cog.get_instructions(CODE[0])
+            instructions = await self.cog.get_instructions(long_message)
+
+        to_thread.assert_awaited_once_with(get_instructions, long_message)
+        self.assertEqual(instructions, "instructions")
+
+    async def test_chat_benchmark(self):
+        """Detection over a realistic mix of chat messages and edits should be much faster than parsing them all."""
+        rng = random.Random(0)
+        # Most messages in chat are prose, and edits often leave the content unchanged.
+        corpus = rng.choices(PROSE, k=900) + rng.choices(CODE, k=100)
+        rng.shuffle(corpus)
+
+        start = time.perf_counter()
+        for message in corpus:
+            get_instructions(message)
+        unstaged = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for message in corpus:
+            await self.cog.get_instructions(message)
+        staged = time.perf_counter() - start
+
+        self.assertLess(staged, unstaged / 2)
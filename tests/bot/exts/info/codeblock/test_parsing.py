@@ -151,3 +151,32 @@ class FindFaultyCodeblocksTest(unittest.TestCase):
         faulty_code_blocks = parsing.find_faulty_code_blocks(message)
         self.assertIsNotNone(faulty_code_blocks)
         self.assertEqual(len(faulty_code_blocks), 1)
+
+
+class LooksLikeProseTests(unittest.TestCase):
+    def test_prose_is_recognised(self):
+        """Messages which can't contain Python code or faulty code blocks should be recognised as prose."""
+        messages = (
+            "hey everyone\nI'm trying to learn python\nwhere should I start\nany books you'd recommend?",
+            "‘quoted’ words and “double quoted” words\nare fine\ntoo\nright",  # noqa: RUF001
+            "it's a trap\nisn't it\nwe'll see\nand from what I can tell it is",
+        )
+        for message in messages:
+            with self.subTest(message=message):
+                self.assertTrue(parsing.looks_like_prose(message))
+
+    def test_possible_code_is_not_prose(self):
+        """Messages which could contain Python code or faulty code blocks shouldn't be recognised as prose."""
+        messages = (
+            "```\nprint(1)\nprint(2)\nprint(3)\n```",
+            "x = 1\ny = 2\nz = 3\nprint(x)",
+            "for i in range(3):\n    print(i)\nhi\nthere",
+            "import os\nimport sys\nos.getcwd()\nsys.path",
+            "a\rimport b\nc\nd",
+            "''py\nprint(1)\nprint(2)\nprint(3)\n''",
+            ">>> 1 + 1\n2\n>>> 2 + 2\n4",
+            "print(1)\n  \x00pass\nprint(2)\nprint(3)",
+        )
+        for message in messages:
+            with self.subTest(message=message):
+                self.assertFalse(parsing.looks_like_prose(message))
@@ -24,6 +24,8 @@ class InformationCogTests(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
         """Sets up fresh objects for each test."""
         self.bot = helpers.MockBot()
+        # The Stats cog isn't loaded, so member counts are taken from the roles.
+        self.bot.get_cog.return_value = None
 
         self.cog = information.Information(self.bot)
 
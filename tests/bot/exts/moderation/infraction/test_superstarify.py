@@ -0,0 +1,76 @@
+from unittest.mock import AsyncMock, patch
+
+from bot.exts.moderation.infraction.superstarify import Superstarify
+from tests.base import RedisTestCase
+from tests.helpers import MockBot, MockMember
+
+
+class StubAPIClient:
+    """An API client serving the given active superstar infractions, and recording its requests."""
+
+    def __init__(self, infractions: list[dict]):
+        self.infractions = infractions
+        self.requests = []
+
+    async def get(self, endpoint: str, params: dict) -> list[dict]:
+        self.requests.append((endpoint, params))
+        if "user__id" in params:
+            return [infraction for infraction in self.infractions if str(infraction["user"]) == str(params["user__id"])]
+        return self.infractions
+
+
+class SuperstarRegistryTests(RedisTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.bot = MockBot()
+        self.superstar = {"id": 1, "user": 42, "type": "superstar", "expires_at": "2100-01-01T00:00:00+00:00"}
+        self.bot.api_client = StubAPIClient([self.superstar])
+        self.cog = Superstarify(self.bot)
+
+        with patch.object(self.cog, "schedule_expiration"):
+            await self.cog.cog_load()
+        self.addAsyncCleanup(self.cog.cog_unload)
+        self.load_requests = len(self.bot.api_client.requests)
+
+    @staticmethod
+    def nickname_update(member_id: int, update: int = 0) -> tuple[MockMember, MockMember]:
+        before = MockMember(id=member_id, display_name=f"old {update}")
+        return before, MockMember(id=member_id, display_name=f"new {update}")
+
+    @patch("bot.exts.moderation.infraction.superstarify._utils.notify_infraction", new_callable=AsyncMock)
+    async def test_api_is_only_queried_for_superstars(self, _notify_infraction):
+        """Of thousands of nickname updates, only those of superstarified members should query the API."""
+        # Creating thousands of mocks is slow, so the updates of the other members are reused.
+        updates = [self.nickname_update(member_id) for member_id in range(100, 150)]
+        superstar_updates = 0
+        for update in range(5000):
+            if update % 1000 == 0:
+                superstar_updates += 1
+                before, after = self.nickname_update(42, update)
+                await self.cog.on_member_update(before, after)
+                after.edit.assert_awaited_once()
+            else:
+                await self.cog.on_member_update(*updates[update % len(updates)])
+
+        self.assertEqual(self.cog.superstars, {42})
+        self.assertEqual(len(self.bot.api_client.requests), self.load_requests + superstar_updates)
+
+    async def test_registry_is_updated_on_pardon(self):
+        """Pardoned or expired superstars shouldn't be looked up anymore."""
+        self.bot.get_guild.return_value = None
+        with patch("bot.exts.moderation.infraction.superstarify.get_or_fetch_member", AsyncMock(return_value=None)):
+            await self.cog._pardon_action(self.superstar, notify=False)
+
+        await self.cog.on_member_update(*self.nickname_update(42))
+
+        self.assertEqual(self.cog.superstars, set())
+        self.assertEqual(len(self.bot.api_client.requests), self.load_requests)
+
+    async def test_stale_registry_entries_are_removed(self):
+        """A user without an active superstar infraction should be removed from the registry once looked up."""
+        self.bot.api_client.infractions = []
+
+        await self.cog.on_member_update(*self.nickname_update(42))
+        await self.cog.on_member_update(*self.nickname_update(42, 1))
+
+        self.assertEqual(len(self.bot.api_client.requests), self.load_requests + 1)
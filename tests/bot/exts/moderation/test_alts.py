@@ -0,0 +1,100 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+from bot.exts.moderation import alts
+from bot.exts.moderation.alts import AlternateAccounts
+from tests.helpers import MockBot
+
+# Seconds each fake member lookup takes.
+LOOKUP_DELAY = 0.05
+
+
+class FakeMember:
+    """A member which only has a name, since creating mocks would dominate the timings."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __str__(self) -> str:
+        return self.name
+
+
+def make_alts(count: int) -> list[dict]:
+    return [
+        {
+            "target": target,
+            "actor": 1,
+            "context": "Same IP.",
+            "created_at": "2024-01-01T00:00:00+00:00",
+            "updated_at": "2024-01-01T00:00:00+00:00",
+            "alts": [1, 2],
+        }
+        for target in range(100, 100 + count)
+    ]
+
+
+class AltsToStringTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cog = AlternateAccounts(MockBot())
+        self.lookups = []
+        self.concurrent = self.max_concurrent = 0
+
+        async def get_or_fetch_member(_guild, user_id: int) -> FakeMember | None:
+            self.lookups.append(user_id)
+            self.concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self.concurrent)
+            await asyncio.sleep(LOOKUP_DELAY)
+            self.concurrent -= 1
+            # Odd IDs have left the guild.
+            return None if user_id % 2 else FakeMember(f"member{user_id}")
+
+        patcher = patch.object(alts, "get_or_fetch_member", get_or_fetch_member)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def render(self, count: int) -> float:
+        """Return the time taken to render `count` alts whose names aren't cached."""
+        self.cog._alt_names.clear()
+        start = time.perf_counter()
+        await self.cog.alts_to_string(make_alts(count))
+        return time.perf_counter() - start
+
+    async def test_lines_keep_the_order_of_alts(self):
+        """Each line should describe its alt, falling back to the ID for users who aren't members."""
+        lines = await self.cog.alts_to_string(make_alts(4))
+
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith("**Association #0 - member100**"))
+        self.assertTrue(lines[1].startswith("**Association #1 - 101**"))
+        self.assertIn("<@103> - 103", lines[3])
+
+    async def test_wall_time_is_constant_in_the_number_of_alts(self):
+        """Rendering up to the concurrency limit of alts should take about as long as rendering one."""
+        one = await self.render(1)
+        many = await self.render(alts.MAX_CONCURRENT_LOOKUPS)
+
+        # Looking the alts up one by one would take ten times as long. The bounds leave room for a busy machine.
+        self.assertLess(many, one + 3 * LOOKUP_DELAY)
+        self.assertLess(many, alts.MAX_CONCURRENT_LOOKUPS * LOOKUP_DELAY / 2)
+
+    async def test_lookups_are_bounded(self):
+        """Many alts should be looked up in rounds of the concurrency limit, rather than one by one."""
+        count = 5 * alts.MAX_CONCURRENT_LOOKUPS
+        elapsed = await self.render(count)
+
+        self.assertGreaterEqual(elapsed, 5 * LOOKUP_DELAY)
+        self.assertLess(elapsed, count * LOOKUP_DELAY / 2)
+        self.assertEqual(self.max_concurrent, alts.MAX_CONCURRENT_LOOKUPS)
+        self.assertEqual(len(self.lookups), count)
+
+    async def test_names_are_cached(self):
+        """Repeated renders of the same alts within the TTL shouldn't look the members up again."""
+        await self.cog.alts_to_string(make_alts(20))
+        await self.cog.alts_to_string(make_alts(20))
+        self.assertEqual(len(self.lookups), 20)
+
+        with patch.object(alts, "monotonic", return_value=time.monotonic() + alts.ALT_NAME_CACHE_TTL + 1):
+            await self.cog.alts_to_string(make_alts(20))
+        self.assertEqual(len(self.lookups), 40)
@@ -0,0 +1,174 @@
+import asyncio
+import unittest
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from dateutil.relativedelta import relativedelta
+from discord import HTTPException
+
+from bot.exts.moderation import defcon
+from tests.helpers import MockBot, MockMember
+
+
+class DefconRejectionTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the queue in which members with too new accounts are rejected."""
+
+    async def asyncSetUp(self):
+        # The pending rejections are logged when the cog unloads.
+        for name in ("send_log_message", "send_to_paste_service"):
+            patcher = patch(f"bot.exts.moderation.defcon.{name}", new_callable=AsyncMock)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.bot = MockBot()
+        self.cog = defcon.Defcon(self.bot)
+        self.cog.threshold = relativedelta(days=1)
+        self.addAsyncCleanup(self.cog.cog_unload)
+
+        # The bot's loop is mocked, so the workers have to be started on the test's loop.
+        workers = [asyncio.create_task(self.cog._rejection_worker()) for _ in range(defcon.MAX_CONCURRENT_REJECTIONS)]
+        for worker in workers:
+            self.addCleanup(worker.cancel)
+
+    @staticmethod
+    def new_member(member_id: int) -> MockMember:
+        return MockMember(id=member_id, created_at=datetime.now(tz=UTC))
+
+    async def test_old_accounts_are_not_rejected(self):
+        """Members with accounts older than the threshold shouldn't be queued."""
+        member = MockMember(id=1, created_at=datetime(2020, 1, 1, tzinfo=UTC))
+
+        await self.cog.on_member_join(member)
+        await self.cog._rejection_queue.join()
+
+        member.kick.assert_not_awaited()
+        self.assertEqual(self.cog._rejections, [])
+
+    async def test_kicks_are_bounded(self):
+        """No more than the maximum number of members should be rejected concurrently."""
+        concurrent = max_concurrent = 0
+        release = asyncio.Event()
+
+        async def kick(*args, **kwargs) -> None:
+            nonlocal concurrent, max_concurrent
+            concurrent += 1
+            max_concurrent = max(max_concurrent, concurrent)
+            await release.wait()
+            concurrent -= 1
+
+        members = [self.new_member(i) for i in range(20)]
+        for member in members:
+            member.kick.side_effect = kick
+            await self.cog.on_member_join(member)
+
+        await asyncio.sleep(0)
+        self.assertEqual(self.cog._rejection_queue.qsize(), 20 - defcon.MAX_CONCURRENT_REJECTIONS)
+        release.set()
+        await self.cog._rejection_queue.join()
+
+        self.assertEqual(max_concurrent, defcon.MAX_CONCURRENT_REJECTIONS)
+        self.assertEqual(len(self.cog._rejections), 20)
+        self.assertTrue(all(rejection.dm_sent and rejection.kicked for rejection in self.cog._rejections))
+        self.bot.metrics.gauge.assert_any_call("defcon.queue_depth", 0)
+
+    @patch.object(defcon, "MAX_QUEUED_REJECTIONS", 2)
+    async def test_members_are_kicked_right_away_when_the_queue_is_full(self):
+        """Members rejected while the queue is full should be kicked without waiting for a worker."""
+        self.cog._rejection_queue = asyncio.Queue(maxsize=defcon.MAX_QUEUED_REJECTIONS)
+        release = asyncio.Event()
+        members = [self.new_member(i) for i in range(3)]
+        for member in members[:2]:
+            member.kick.side_effect = lambda *_args, **_kwargs: release.wait()
+
+        # The workers were started with the original queue, so the members stay queued.
+        for member in members:
+            await self.cog.on_member_join(member)
+
+        members[2].kick.assert_awaited_once()
+        self.assertEqual([rejection.member_id for rejection in self.cog._rejections], [2])
+        self.assertEqual(self.cog._rejection_queue.qsize(), 2)
+        self.bot.metrics.incr.assert_any_call("defcon.queue_overflows")
+
+    async def test_queued_members_are_logged_on_unload(self):
+        """Members still waiting to be rejected when the cog unloads should be logged, as they won't be kicked."""
+        self.cog._rejection_queue = asyncio.Queue()
+        await self.cog.on_member_join(self.new_member(1))
+
+        with self.assertLogs(defcon.log, "WARNING") as logs:
+            await self.cog.cog_unload()
+
+        self.assertIn("1 members were waiting to be rejected", logs.output[0])
+        self.assertTrue(self.cog._rejection_queue.empty())
+
+    async def test_dms_are_skipped_at_high_join_rate(self):
+        """Rejected members shouldn't be DMed while many members are joining."""
+        for i in range(defcon.DM_SKIP_JOIN_RATE):
+            await self.cog.on_member_join(MockMember(id=i, created_at=datetime(2020, 1, 1, tzinfo=UTC)))
+        member = self.new_member(100)
+
+        await self.cog.on_member_join(member)
+        await self.cog._rejection_queue.join()
+
+        member.send.assert_not_awaited()
+        member.kick.assert_awaited_once()
+        self.assertIsNone(self.cog._rejections[0].dm_sent)
+        self.bot.metrics.gauge.assert_any_call("defcon.join_rate", defcon.DM_SKIP_JOIN_RATE + 1)
+
+    @patch("bot.exts.moderation.defcon.send_log_message", new_callable=AsyncMock)
+    @patch("bot.exts.moderation.defcon.send_to_paste_service", new_callable=AsyncMock)
+    async def test_rejections_are_summarised(self, send_to_paste_service, send_log_message):
+        """Many rejections should be logged in a single embed, with the IDs uploaded to the paste service."""
+        send_to_paste_service.return_value = MagicMock(link="https://paste.example/abc")
+        self.cog._rejections = [
+            defcon.Rejection(i, f"user{i}", f"<@{i}> (`{i}`)", "", dm_sent=True, kicked=True) for i in range(143)
+        ]
+
+        await self.cog.log_rejections()
+
+        send_log_message.assert_awaited_once()
+        title, message = send_log_message.call_args.args[3:5]
+        self.assertEqual(title, "Entries denied")
+        self.assertIn(f"Rejected **143** accounts in the last {defcon.REJECTION_LOG_INTERVAL}s", message)
+        self.assertIn("https://paste.example/abc", message)
+
+        paste = send_to_paste_service.call_args.kwargs["files"][0].content
+        self.assertEqual(len(paste.splitlines()), 143)
+        self.assertEqual(self.cog._rejections, [])
+
+    @patch("bot.exts.moderation.defcon.send_log_message", new_callable=AsyncMock)
+    async def test_single_rejection_is_logged_individually(self, send_log_message):
+        """A single rejection should be logged like before, with the member's avatar."""
+        self.cog._rejections = [defcon.Rejection(1, "user", "<@1> (`1`)", "avatar", dm_sent=False, kicked=True)]
+
+        await self.cog.log_rejections()
+
+        self.assertEqual(send_log_message.call_args.args[3], "Entry denied")
+        self.assertIn("DMs disabled", send_log_message.call_args.args[4])
+        self.assertEqual(send_log_message.call_args.kwargs["thumbnail"], "avatar")
+
+    @patch("bot.exts.moderation.defcon.send_log_message", new_callable=AsyncMock)
+    async def test_rejections_are_kept_if_they_cant_be_logged(self, send_log_message):
+        """Rejections which failed to be logged should be logged along with the next ones."""
+        send_log_message.side_effect = HTTPException(MagicMock(status=500), "Internal Server Error")
+        failed = defcon.Rejection(1, "user1", "<@1> (`1`)", "", dm_sent=True, kicked=True)
+        self.cog._rejections = [failed]
+
+        await self.cog.log_rejections()
+        self.assertEqual(self.cog._rejections, [failed])
+
+        send_log_message.side_effect = None
+        self.cog._rejections.append(defcon.Rejection(2, "user2", "<@2> (`2`)", "", dm_sent=True, kicked=True))
+        await self.cog.log_rejections()
+
+        self.assertEqual(self.cog._rejections, [])
+        self.assertIn("Rejected **2** accounts", send_log_message.call_args.args[4])
+
+    @patch("bot.exts.moderation.defcon.send_log_message", new_callable=AsyncMock)
+    async def test_pending_rejections_are_logged_on_unload(self, send_log_message):
+        """The rejections made since the last iteration shouldn't be lost when the cog unloads."""
+        self.cog._rejections = [defcon.Rejection(1, "user", "<@1> (`1`)", "", dm_sent=True, kicked=True)]
+
+        await self.cog.cog_unload()
+
+        send_log_message.assert_awaited_once()
+        self.assertEqual(self.cog._rejections, [])
@@ -869,3 +869,81 @@ class TestMessageLinkEmbeds(TestIncidents):
             # Check for the embed descriptions
             for embed in embeds:
                 self.assertEqual(embed.description, description)
+
+
+class TestMessageLinkResolver(TestIncidents):
+    """Tests for resolving message links with `MessageLinkResolver`."""
+
+    def setUp(self):
+        super().setUp()
+        self.resolver = self.cog_instance.link_resolver
+        self.message_log = MockTextChannel(id=incidents.Channels.message_log)
+        self.message_log.history = MagicMock(return_value=MockAsyncIterable([]))
+        self.cog_instance.bot.get_channel = MagicMock(return_value=self.message_log)
+
+    @staticmethod
+    def link(message_id: int) -> str:
+        return f"https://discord.com/channels/{'1' * 18}/{'2' * 18}/{message_id}"
+
+    def deletion_log(self, message_id: int) -> MockMessage:
+        embed = discord.Embed(description=f"**Message ID:** `{message_id}`\n")
+        embed.set_author(name="Message deleted")
+        return MockMessage(
+            channel=self.message_log,
+            author=self.cog_instance.bot.user,
+            embeds=[embed],
+            jump_url=f"https://discord.com/log/{message_id}",
+        )
+
+    @patch("bot.exts.moderation.incidents.MessageConverter")
+    async def test_deleted_messages_are_found_in_index(self, converter):
+        """Deletion log entries posted by the bot should be indexed, so that the history is fetched only once."""
+        converter.return_value.convert = AsyncMock(side_effect=discord.ext.commands.MessageNotFound("x"))
+        message_ids = [10**17 + i for i in range(3)]
+        for message_id in message_ids:
+            await self.cog_instance.on_message(self.deletion_log(message_id))
+
+        for message_id in message_ids:
+            embed = await self.resolver.resolve(MagicMock(), self.link(message_id))
+            self.assertEqual(embed.title, "Deleted Message Link")
+            self.assertIn(f"https://discord.com/log/{message_id}", embed.description)
+
+        not_found = await self.resolver.resolve(MagicMock(), self.link(10**17 + 100))
+        self.assertEqual(not_found.title, "Bad Message Link")
+        self.message_log.history.assert_called_once()
+
+    @patch("bot.exts.moderation.incidents.MessageConverter")
+    async def test_resolved_embeds_are_cached(self, converter):
+        """A message link which was resolved recently shouldn't be resolved again."""
+        message = MockMessage(id=10**17, content="Hello", created_at=CURRENT_TIME)
+        converter.return_value.convert = AsyncMock(return_value=message)
+
+        first = await self.resolver.resolve(MagicMock(), self.link(10**17))
+        second = await self.resolver.resolve(MagicMock(), self.link(10**17))
+
+        self.assertIs(first, second)
+        converter.return_value.convert.assert_awaited_once()
+
+    @patch("bot.exts.moderation.incidents.MessageConverter")
+    async def test_links_are_resolved_concurrently(self, converter):
+        """All links in an incident report should be resolved at the same time."""
+        concurrent = max_concurrent = 0
+
+        async def convert(_ctx, link):
+            nonlocal concurrent, max_concurrent
+            concurrent += 1
+            max_concurrent = max(max_concurrent, concurrent)
+            await asyncio.sleep(0)
+            concurrent -= 1
+            message_id = int(link.rsplit("/", 1)[-1])
+            return MockMessage(id=message_id, content="Hello", created_at=CURRENT_TIME)
+
+        converter.return_value.convert = convert
+        self.cog_instance.bot.get_context = AsyncMock()
+        report = MockMessage(content=" ".join(self.link(10**17 + i) for i in range(5)))
+
+        embeds = await self.cog_instance.extract_message_links(report)
+
+        self.assertEqual(len(embeds), 5)
+        self.assertEqual(max_concurrent, 5)
+        self.cog_instance.bot.get_context.assert_awaited_once()
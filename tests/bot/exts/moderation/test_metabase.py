@@ -0,0 +1,164 @@
+import json
+import sys
+import unittest
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from bot.exts.moderation import metabase
+from bot.exts.moderation.metabase import Export, ExportCache, Metabase
+
+
+def fake_response(body: bytes, chunk_size: int = 7) -> MagicMock:
+    """Return a response whose body is streamed in chunks of `chunk_size`."""
+    async def iter_chunked(_size):
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+
+    response = MagicMock()
+    response.content.iter_chunked = iter_chunked
+    return response
+
+
+class ExportTests(unittest.IsolatedAsyncioTestCase):
+    async def test_csv_export(self):
+        """CSV exports should be stored as columns, and still be accessible as rows."""
+        body = b'id,name\n1,joe\n2,"multi\nline"\n'
+        export = await Metabase._read_export(fake_response(body), "csv")
+
+        self.assertEqual(export.columns, {"id": ["1", "2"], "name": ["joe", "multi\nline"]})
+        self.assertEqual(list(export), [{"id": "1", "name": "joe"}, {"id": "2", "name": "multi\nline"}])
+        self.assertEqual(export[-1]["name"], "multi\nline")
+        self.assertEqual(export[:1], [{"id": "1", "name": "joe"}])
+        self.assertEqual(export.read_body(), body.decode())
+
+    async def test_json_export(self):
+        """JSON exports should be stored as columns, with missing values filled with None."""
+        rows = [{"id": 1, "name": "joe"}, {"id": 2}, {"id": 3, "extra": True}]
+        body = json.dumps(rows).encode()
+        export = await Metabase._read_export(fake_response(body), "json")
+
+        self.assertEqual(export.column("id"), [1, 2, 3])
+        self.assertEqual(export.column("name"), ["joe", None, None])
+        self.assertEqual(export.column("extra"), [None, None, True])
+        self.assertEqual(len(export), 3)
+        self.assertEqual(export.read_body(), body.decode())
+
+    @patch.object(metabase, "JSON_READ_SIZE", 5)
+    async def test_json_rows_are_parsed_incrementally(self):
+        """JSON exports should be parsed a row at a time, whatever the size of the parts they're read in."""
+        rows = [{"id": i, "name": f"user {i}", "tags": ["a", "b"]} for i in range(20)]
+        body = json.dumps(rows, indent=2).encode()
+        export = await Metabase._read_export(fake_response(body), "json")
+
+        self.assertEqual(list(export), rows)
+
+    async def test_json_export_is_formatted(self):
+        """JSON exports should be pasted indented and with sorted keys, as when dumped whole."""
+        rows = [{"name": "joe", "id": 1, "extra": {"b": 1, "a": 2}}, {"id": 2}]
+        export = await Metabase._read_export(fake_response(json.dumps(rows).encode()), "json")
+        empty = await Metabase._read_export(fake_response(b"[]"), "json")
+
+        self.assertEqual(export.format_body(), json.dumps(rows, indent=4, sort_keys=True))
+        self.assertEqual(empty.format_body(), "[]")
+
+    async def test_invalid_json_exports_are_rejected(self):
+        """JSON exports which aren't a list of objects should raise a ValueError to be shown to the user."""
+        cases = (
+            (b'{"error": "Query failed"}', "isn't a list of rows"),
+            (b'[{"id": 1}, 2]', "row 2 isn't an object"),
+            (b'[{"id": 1} {"id": 2}]', "expected a comma after row 1"),
+            (b'[{"id": 1}, {"id": ', "row 2 isn't valid JSON"),
+            (b'[{"id": 1}] []', "data after its list of rows"),
+        )
+        for body, message in cases:
+            with self.subTest(body=body), self.assertRaisesRegex(ValueError, message):
+                await Metabase._read_export(fake_response(body), "json")
+
+    async def test_duplicate_csv_columns_are_renamed(self):
+        """Columns sharing a name shouldn't overwrite each other's values."""
+        body = b"id,name,id,id_2,id\n1,joe,2,3,4\n"
+        export = await Metabase._read_export(fake_response(body), "csv")
+
+        self.assertEqual(export[0], {"id": "1", "name": "joe", "id_3": "2", "id_2": "3", "id_4": "4"})
+
+    async def test_ragged_csv_rows_are_rejected(self):
+        """Rows with a different number of values than there are columns shouldn't be silently misaligned."""
+        with self.assertRaisesRegex(ValueError, "row 3 has 1 values, but there are 2 columns"):
+            await Metabase._read_export(fake_response(b"id,name\n1,joe\n2\n"), "csv")
+
+    @patch.object(metabase, "SPOOL_MAX_SIZE", 16)
+    async def test_large_body_is_spilled(self):
+        """Bodies larger than the spool size shouldn't count against the memory budget."""
+        body = b"id\n" + b"1\n" * 100
+        small = await Metabase._read_export(fake_response(body[:9]), "csv")
+        large = await Metabase._read_export(fake_response(body), "csv")
+
+        self.assertFalse(small._body._rolled)
+        self.assertTrue(large._body._rolled)
+        self.assertEqual(large.read_body(), body.decode())
+
+        def columns_size(export: Export) -> int:
+            return sum(sys.getsizeof(values) + sum(map(sys.getsizeof, values)) for values in export.columns.values())
+
+        self.assertEqual(small.memory_size, columns_size(small) + 9)
+        self.assertEqual(large.memory_size, columns_size(large))
+
+
+class ExportCacheTests(unittest.TestCase):
+    @staticmethod
+    def make_export(memory_size: int) -> MagicMock:
+        return MagicMock(spec=Export, memory_size=memory_size, created_at=metabase.time.monotonic())
+
+    def test_least_recently_used_export_is_evicted(self):
+        """Exports should be evicted in LRU order when they exceed the memory budget."""
+        cache = ExportCache(memory_budget=100)
+        exports = [self.make_export(40) for _ in range(3)]
+
+        cache[1] = exports[0]
+        cache[2] = exports[1]
+        cache[1]
+        cache[3] = exports[2]
+
+        self.assertIn(1, cache)
+        self.assertNotIn(2, cache)
+        self.assertIn(3, cache)
+        # The export may still be used in internal eval, so it's left to be released once unreferenced.
+        exports[1].close.assert_not_called()
+
+    def test_oversized_export_is_kept(self):
+        """The newest export should be kept even if it's larger than the budget by itself."""
+        cache = ExportCache(memory_budget=100)
+        cache[1] = self.make_export(40)
+        cache[2] = self.make_export(200)
+
+        self.assertEqual(len(cache), 1)
+        self.assertIn(2, cache)
+
+    def test_expired_export_is_evicted(self):
+        """Exports should be evicted once they're older than the TTL."""
+        cache = ExportCache(ttl=timedelta(seconds=60))
+        export = self.make_export(10)
+        cache[1] = export
+
+        with (
+            patch.object(metabase.time, "monotonic", return_value=export.created_at + 61),
+            self.assertRaises(KeyError),
+        ):
+            cache[1]
+
+        export.close.assert_not_called()
+
+    def test_dict_methods(self):
+        """The cache should still offer the dict methods that internal eval users relied on."""
+        cache = ExportCache()
+        export = self.make_export(10)
+        cache[1] = export
+
+        self.assertIs(cache.get(1), export)
+        self.assertIsNone(cache.get(2))
+        self.assertEqual(list(cache.keys()), [1])
+        self.assertEqual(dict(cache.items()), {1: export})
+
+        del cache[1]
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache._memory_size, 0)
@@ -0,0 +1,179 @@
+import asyncio
+import datetime
+import logging
+import unittest
+from unittest.mock import patch
+
+import arrow
+
+from bot.constants import Roles
+from bot.exts.moderation import modpings
+from bot.exts.moderation.modpings import ModPings, RoleState, role_state
+from tests.base import RedisTestCase
+from tests.helpers import MockBot, MockMember, MockRole
+
+NOW = datetime.datetime(2024, 6, 1, 12, tzinfo=datetime.UTC)
+HOUR = datetime.timedelta(hours=1)
+
+
+class RoleStateTests(unittest.TestCase):
+    def test_pings_off_takes_precedence(self):
+        """A moderator with pings off shouldn't have the role until pings are back on, whatever their schedule."""
+        schedule = (NOW - HOUR, 8 * HOUR.total_seconds())
+        self.assertEqual(role_state(NOW, NOW + HOUR, schedule), RoleState(False, NOW + HOUR))
+
+    def test_expired_pings_off_without_schedule(self):
+        """A moderator whose pings off period is over should have the role."""
+        self.assertEqual(role_state(NOW, NOW - HOUR, None), RoleState(True, None))
+
+    def test_schedule(self):
+        """A scheduled moderator should have the role during their work time on any day after the start."""
+        start = NOW - datetime.timedelta(days=3, hours=1)
+        work_time = 2 * HOUR.total_seconds()
+
+        self.assertEqual(role_state(NOW, None, (start, work_time)), RoleState(True, NOW + HOUR))
+        self.assertEqual(role_state(NOW + 2 * HOUR, None, (start, work_time)), RoleState(False, NOW + 23 * HOUR))
+
+    def test_schedule_not_started(self):
+        """A schedule shouldn't decide anything before it first starts."""
+        self.assertEqual(role_state(NOW, None, (NOW + HOUR, 60)), RoleState(None, NOW + HOUR))
+
+
+class ModPingsReconciliationTests(RedisTestCase):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
+        self.bot = MockBot()
+        self.cog = ModPings(self.bot)
+        self.addAsyncCleanup(self.cog.cog_unload)
+
+        self.moderators_role = MockRole(id=Roles.moderators)
+        self.mod_team_role = MockRole(id=Roles.mod_team, members=[])
+        roles = {Roles.moderators: self.moderators_role, Roles.mod_team: self.mod_team_role}
+        self.bot.get_guild.return_value.get_role.side_effect = roles.get
+
+        self.concurrent = self.max_concurrent = 0
+
+    def make_mod(self, mod_id: int, *, pingable: bool) -> MockMember:
+        """Return a member of the mod team, who has the moderators role if `pingable`."""
+        roles = [self.mod_team_role, self.moderators_role] if pingable else [self.mod_team_role]
+        mod = MockMember(id=mod_id, roles=roles)
+
+        async def edit(*_args, **_kwargs) -> None:
+            self.concurrent += 1
+            self.max_concurrent = max(self.max_concurrent, self.concurrent)
+            await asyncio.sleep(0)
+            self.concurrent -= 1
+
+        mod.add_roles.side_effect = edit
+        mod.remove_roles.side_effect = edit
+        self.mod_team_role.members.append(mod)
+        return mod
+
+    async def test_only_differences_are_applied(self):
+        """Only the moderators whose role differs from what it should be should have it edited."""
+        in_sync = [self.make_mod(i, pingable=True) for i in range(40)]
+        missing_role = [self.make_mod(i, pingable=False) for i in range(100, 110)]
+        pings_off = [self.make_mod(i, pingable=False) for i in range(200, 205)]
+        pings_off_expired = self.make_mod(300, pingable=False)
+        pings_back_on = self.make_mod(301, pingable=True)
+        on_shift = self.make_mod(400, pingable=False)
+        off_shift = self.make_mod(401, pingable=True)
+
+        for mod in pings_off:
+            await self.cog.pings_off_mods.set(mod.id, (NOW + HOUR).isoformat())
+        await self.cog.pings_off_mods.set(pings_off_expired.id, (NOW - HOUR).isoformat())
+        await self.cog.pings_off_mods.set(pings_back_on.id, (NOW + HOUR).isoformat())
+        shift_start = (NOW - datetime.timedelta(days=2, hours=1)).timestamp()
+        await self.cog.modpings_schedule.set(on_shift.id, f"{shift_start}|{2 * HOUR.total_seconds()}")
+        await self.cog.modpings_schedule.set(off_shift.id, f"{shift_start}|{HOUR.total_seconds() / 2}")
+
+        # The timer isn't started, since it would fire straight away with the real time being past the test's.
+        with (
+            patch.object(modpings.arrow, "utcnow", return_value=arrow.get(NOW)),
+            patch.object(modpings.scheduling, "create_task") as create_task,
+        ):
+            reconciliation = await self.cog.reconcile_roles()
+        timer = create_task.call_args.args[0]
+        self.assertEqual(timer.cr_frame.f_locals["at"], NOW + HOUR)
+        timer.close()
+
+        self.assertEqual(reconciliation, modpings.Reconciliation(edited=13, skipped=46))
+        for mod in in_sync + pings_off + [pings_back_on]:
+            mod.add_roles.assert_not_awaited()
+            mod.remove_roles.assert_not_awaited()
+        for mod in [*missing_role, pings_off_expired, on_shift]:
+            mod.add_roles.assert_awaited_once()
+        off_shift.remove_roles.assert_awaited_once()
+        self.assertEqual(self.max_concurrent, modpings.MAX_CONCURRENT_ROLE_EDITS)
+
+        self.assertEqual(set(await self.cog.pings_off_mods.to_dict()), {mod.id for mod in pings_off})
+        self.assertEqual(self.cog._next_changes[on_shift.id], NOW + HOUR)
+        self.assertEqual(self.cog._next_changes[off_shift.id], NOW + 23 * HOUR)
+        self.assertEqual(self.cog._next_changes[pings_off[0].id], NOW + HOUR)
+        self.assertNotIn(in_sync[0].id, self.cog._next_changes)
+
+    async def test_former_moderators_are_removed_from_the_cache(self):
+        """Pings off entries of users who aren't on the mod team anymore should be deleted."""
+        await self.cog.pings_off_mods.set(1, (NOW + HOUR).isoformat())
+
+        with patch.object(modpings, "get_or_fetch_member", return_value=None):
+            reconciliation = await self.cog.reconcile_roles()
+
+        self.assertEqual(reconciliation, modpings.Reconciliation(edited=0, skipped=0))
+        self.assertEqual(await self.cog.pings_off_mods.to_dict(), {})
+
+    async def test_timer_reconciles_due_moderators(self):
+        """When the timer fires, the roles of the moderators whose role could change should be reconciled."""
+        mod = self.make_mod(1, pingable=False)
+        other = self.make_mod(2, pingable=False)
+        await self.cog.pings_off_mods.set(mod.id, (NOW - HOUR).isoformat())
+        await self.cog.pings_off_mods.set(other.id, (NOW + HOUR).isoformat())
+        self.cog._next_changes = {mod.id: NOW - HOUR, other.id: NOW + HOUR}
+        self.cog.guild = self.bot.get_guild.return_value
+
+        with (
+            patch.object(modpings.arrow, "utcnow", return_value=arrow.get(NOW)),
+            patch.object(modpings, "get_or_fetch_member", return_value=mod),
+        ):
+            await self.cog._wait_for_change(NOW - HOUR)
+
+        mod.add_roles.assert_awaited_once()
+        other.add_roles.assert_not_awaited()
+        self.assertEqual(self.cog._next_changes, {other.id: NOW + HOUR})
+        self.assertEqual(set(await self.cog.pings_off_mods.to_dict()), {other.id})
+
+    async def test_timer_retries_after_failure(self):
+        """A failed reconciliation when the timer fires should be retried for the due moderators."""
+        mod = self.make_mod(1, pingable=False)
+        other = self.make_mod(2, pingable=False)
+        self.cog._next_changes = {mod.id: NOW - HOUR, other.id: NOW + HOUR}
+        self.cog.guild = self.bot.get_guild.return_value
+
+        with (
+            patch.object(modpings.arrow, "utcnow", return_value=arrow.get(NOW)),
+            patch.object(modpings, "get_or_fetch_member", side_effect=ConnectionError),
+            self.assertLogs(modpings.log, logging.ERROR),
+        ):
+            await self.cog._wait_for_change(NOW - HOUR)
+
+        retry_at = NOW + modpings.RECONCILE_RETRY_DELAY
+        self.assertEqual(self.cog._next_changes, {mod.id: retry_at, other.id: NOW + HOUR})
+        self.assertIsNotNone(self.cog._timer)
+
+    async def test_failed_edits_are_retried(self):
+        """A failed role edit should be retried, keeping the expired pings off period until the role is restored."""
+        failing = self.make_mod(1, pingable=False)
+        failing.add_roles.side_effect = ConnectionError
+        restored = self.make_mod(2, pingable=False)
+        for mod in (failing, restored):
+            await self.cog.pings_off_mods.set(mod.id, (NOW - HOUR).isoformat())
+
+        with (
+            patch.object(modpings.arrow, "utcnow", return_value=arrow.get(NOW)),
+            self.assertLogs(modpings.log, logging.ERROR),
+        ):
+            reconciliation = await self.cog.reconcile_roles()
+
+        self.assertEqual(reconciliation, modpings.Reconciliation(edited=1, skipped=0))
+        self.assertEqual(self.cog._next_changes, {failing.id: NOW + modpings.RECONCILE_RETRY_DELAY})
+        self.assertEqual(set(await self.cog.pings_off_mods.to_dict()), {failing.id})
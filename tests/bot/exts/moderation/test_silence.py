@@ -1,3 +1,4 @@
+import asyncio
 import itertools
 import unittest
 from datetime import UTC, datetime
@@ -238,6 +239,36 @@ class SilenceCogTests(SilenceTest):
         for member in members:
             self.assertEqual(member.move_to.call_count, 1 if member == failing_member else 2)
 
+    async def test_voice_moves_are_concurrent_and_bounded(self):
+        """Members should be moved concurrently, but no more than the limit at a time."""
+        await self.cog.cog_load()
+        concurrent = max_concurrent = 0
+
+        async def move_to(*args, **kwargs) -> None:
+            nonlocal concurrent, max_concurrent
+            concurrent += 1
+            max_concurrent = max(max_concurrent, concurrent)
+            await asyncio.sleep(0)
+            concurrent -= 1
+
+        members = [MockMember(move_to=AsyncMock(side_effect=move_to)) for _ in range(20)]
+        result = await self.cog._force_voice_sync(MockVoiceChannel(members=members))
+
+        self.assertEqual(max_concurrent, silence.MAX_CONCURRENT_VOICE_MOVES)
+        self.assertEqual(result.moved, 20)
+        for member in members:
+            self.assertEqual(member.move_to.call_count, 2)
+
+    async def test_voice_move_failures_are_aggregated(self):
+        """Failed moves should be collected in the result, rather than interrupting the others."""
+        await self.cog.cog_load()
+        failing_member, members = self.create_erroneous_members()
+
+        result = await self.cog._kick_voice_members(MockVoiceChannel(members=members))
+
+        self.assertEqual(result.moved, 1)
+        self.assertEqual(result.failed, [failing_member])
+
 
 class SilenceArgumentParserTests(unittest.IsolatedAsyncioTestCase):
     """Tests for the silence argument parser utility function."""
@@ -0,0 +1,182 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from bot.exts.moderation.watchchannels import _watchchannel
+from bot.exts.moderation.watchchannels.bigbrother import BigBrother
+from tests.helpers import MockBot, MockMember, MockMessage, MockTextChannel
+
+
+@patch.object(_watchchannel.BigBrotherConfig, "log_delay", 0)
+@patch.object(_watchchannel.BigBrotherConfig, "header_message_limit", 3)
+class RelayLaneTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.bot = MockBot()
+        self.cog = BigBrother(self.bot)
+        self.cog.watched_users = {1: {"actor": 10}, 2: {"actor": 10}}
+        self.relayed = []
+
+        async def relay_message(msg, _watch_info) -> None:
+            await asyncio.sleep(0)
+            self.relayed.append((msg.author.id, msg.id))
+
+        self.cog.relay_message = relay_message
+        self.cog.get_actor_name = AsyncMock(return_value="actor")
+
+    async def queue_messages(self, *authors: int) -> None:
+        channel = MockTextChannel()
+        for message_id, author_id in enumerate(authors):
+            await self.cog.on_message(MockMessage(id=message_id, author=MockMember(id=author_id), channel=channel))
+
+    async def wait_for_lanes(self) -> None:
+        await asyncio.gather(*(lane.task for lane in list(self.cog.lanes.values())))
+
+    async def test_messages_are_relayed_in_order_per_author(self):
+        """Each author's messages should be relayed in order, in blocks of at most the header limit."""
+        await self.queue_messages(1, 2, 1, 1, 2, 1, 1, 3)
+        self.assertEqual(self.cog.queue_depth, 7)
+
+        await self.wait_for_lanes()
+
+        self.assertEqual([message_id for author, message_id in self.relayed if author == 1], [0, 2, 3, 5, 6])
+        self.assertEqual([message_id for author, message_id in self.relayed if author == 2], [1, 4])
+        self.assertEqual(self.cog.lanes, {})
+        self.bot.metrics.gauge.assert_called_with("watchchannels.bigbrother.queue_depth", 0)
+        self.assertEqual(self.bot.metrics.timing.call_count, 7)
+
+    async def test_unwatched_user_messages_are_dropped(self):
+        """Messages of users who were unwatched before they were relayed shouldn't be relayed."""
+        await self.queue_messages(1, 2)
+        del self.cog.watched_users[2]
+
+        await self.wait_for_lanes()
+
+        self.assertEqual(self.relayed, [(1, 0)])
+
+    async def test_failed_lane_is_restarted(self):
+        """Messages left in a lane whose consumption failed should be relayed along with the next message."""
+        self.cog.get_actor_name.side_effect = [RuntimeError, "actor"]
+        await self.queue_messages(1)
+        with self.assertRaises(RuntimeError):
+            await self.wait_for_lanes()
+
+        await self.queue_messages(1)
+        await self.wait_for_lanes()
+
+        self.assertEqual(self.relayed, [(1, 0), (1, 0)])
+
+
+@patch.object(_watchchannel.BigBrotherConfig, "log_delay", 0)
+@patch.object(_watchchannel.BigBrotherConfig, "header_message_limit", 3)
+class ConcurrentRelayTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the relaying of messages from several lanes to the webhook at once."""
+
+    def setUp(self):
+        self.bot = MockBot()
+        self.cog = BigBrother(self.bot)
+        self.cog.watched_users = {1: {"actor": 10}, 2: {"actor": 10}}
+        self.cog.get_actor_name = AsyncMock(return_value="actor")
+        self.sent = []
+
+        async def send_header(msg, _watch_info) -> None:
+            self.sent.append(("header", msg.author.id))
+            await asyncio.sleep(0)
+
+        async def webhook_send(content=None, username=None, **_kwargs) -> None:
+            self.sent.append((content, int(username)))
+            await asyncio.sleep(0)
+
+        self.cog.send_header = send_header
+        self.cog.webhook_send = webhook_send
+        self.channel = MockTextChannel(id=100)
+
+    async def queue_message(self, message_id: int, author_id: int, *, attachments: list | None = None) -> None:
+        author = MockMember(id=author_id, display_name=str(author_id))
+        content = f"message {message_id}"
+        await self.cog.on_message(MockMessage(
+            id=message_id,
+            author=author,
+            channel=self.channel,
+            content=content,
+            clean_content=content,
+            embeds=[],
+            attachments=attachments or [],
+        ))
+
+    async def wait_for_lanes(self) -> None:
+        await asyncio.gather(*(lane.task for lane in list(self.cog.lanes.values())))
+
+    async def test_interleaved_lanes_get_headers(self):
+        """A message relayed after another user's should get a header, even within its author's turn."""
+        for message_id, author_id in enumerate((1, 2, 1, 2, 1, 2)):
+            await self.queue_message(message_id, author_id)
+
+        await self.wait_for_lanes()
+
+        # The lanes took turns, so each message is that of another user than the previous one.
+        self.assertEqual([author_id for content, author_id in self.sent if content != "header"], [1, 2] * 3)
+        header_author = None
+        for content, author_id in self.sent:
+            if content == "header":
+                header_author = author_id
+            else:
+                self.assertEqual(header_author, author_id)
+
+    async def test_attachments_follow_their_message(self):
+        """A message's attachments should be relayed right after it, before another lane's messages."""
+        async def send_attachments(msg, _webhook) -> None:
+            await asyncio.sleep(0)
+            self.sent.append(("attachments", msg.author.id))
+
+        with patch.object(_watchchannel.messages, "send_attachments", send_attachments):
+            await self.queue_message(1, 1, attachments=["file"])
+            await self.queue_message(2, 2, attachments=["file"])
+            await self.wait_for_lanes()
+
+        self.assertCountEqual(
+            [self.sent[:3], self.sent[3:]],
+            [
+                [("header", 1), ("message 1", 1), ("attachments", 1)],
+                [("header", 2), ("message 2", 2), ("attachments", 2)],
+            ],
+        )
+
+    async def test_headers_precede_their_messages(self):
+        """Each header should be directly followed by the message it's for, even when lanes are interleaved."""
+        for message_id, author_id in enumerate((1, 2, 1, 2, 1, 2, 1, 2)):
+            await self.queue_message(message_id, author_id)
+
+        await self.wait_for_lanes()
+
+        for i, (content, author_id) in enumerate(self.sent):
+            if content == "header":
+                self.assertEqual(self.sent[i + 1][1], author_id)
+                self.assertNotEqual(self.sent[i + 1][0], "header")
+
+    async def test_header_is_repeated_after_the_limit(self):
+        """A user's consecutive messages should get a header before the first, and again after the limit of 3."""
+        for message_id in range(4):
+            await self.queue_message(message_id, 1)
+
+        await self.wait_for_lanes()
+
+        self.assertEqual(
+            self.sent,
+            [
+                ("header", 1), ("message 0", 1), ("message 1", 1), ("message 2", 1),
+                ("header", 1), ("message 3", 1),
+            ],
+        )
+
+
+class ActorNameTests(unittest.IsolatedAsyncioTestCase):
+    @patch.object(_watchchannel, "get_or_fetch_member", new_callable=AsyncMock)
+    async def test_actor_names_are_cached(self, get_or_fetch_member):
+        """An actor's name should be looked up once for all the headers within the TTL."""
+        get_or_fetch_member.return_value = MockMember(display_name="Mod")
+        cog = BigBrother(MockBot())
+
+        names = [await cog.get_actor_name(10) for _ in range(5)]
+
+        self.assertEqual(names, ["Mod"] * 5)
+        get_or_fetch_member.assert_awaited_once()
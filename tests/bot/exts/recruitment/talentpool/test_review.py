@@ -1,9 +1,9 @@
-import unittest
 from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, Mock, patch
 
 from bot.exts.recruitment.talentpool import _review
-from tests.helpers import MockBot, MockMember, MockMessage, MockReaction, MockTextChannel
+from tests.base import RedisTestCase
+from tests.helpers import MockBot, MockGuild, MockMember, MockMessage, MockReaction, MockTextChannel
 
 
 class AsyncIterator:
@@ -44,10 +44,11 @@ def nomination(
     )
 
 
-class ReviewerTests(unittest.IsolatedAsyncioTestCase):
+class ReviewerTests(RedisTestCase):
     """Tests for the talentpool reviewer."""
 
-    def setUp(self):
+    async def asyncSetUp(self):
+        await super().asyncSetUp()
         self.bot_user = MockMember(bot=True)
         self.bot = MockBot(user=self.bot_user)
 
@@ -63,95 +64,96 @@ class ReviewerTests(unittest.IsolatedAsyncioTestCase):
         """Tests for the `is_ready_for_review` function."""
         too_recent = datetime.now(UTC) - timedelta(hours=1)
         not_too_recent = datetime.now(UTC) - timedelta(days=7)
-        ticket_reaction = MockReaction(users=[self.bot_user], emoji="\N{TICKET}")
 
         cases = (
             # Only one active review, and not too recent, so ready.
-            (
-                [
-                    MockMessage(author=self.bot_user, content="wookie for Helper!", created_at=not_too_recent),
-                    MockMessage(author=self.bot_user, content="Not a review", created_at=not_too_recent),
-                    MockMessage(author=self.bot_user, content="Not a review", created_at=not_too_recent),
-                ],
-                not_too_recent.timestamp(),
-                True,
-            ),
+            ({1: False}, not_too_recent.timestamp(), True),
 
             # Three active reviews, so not ready.
-            (
-                [
-                    MockMessage(author=self.bot_user, content="Chrisjl for Helper!", created_at=not_too_recent),
-                    MockMessage(author=self.bot_user, content="Zig for Helper!", created_at=not_too_recent),
-                    MockMessage(author=self.bot_user, content="Scaleios for Helper!", created_at=not_too_recent),
-                ],
-                not_too_recent.timestamp(),
-                False,
-            ),
+            ({1: False, 2: False, 3: False}, not_too_recent.timestamp(), False),
 
             # Only one active review, but too recent, so not ready.
-            (
-                [
-                    MockMessage(author=self.bot_user, content="Chrisjl for Helper!", created_at=too_recent),
-                ],
-                too_recent.timestamp(),
-                False,
-            ),
+            ({1: False}, too_recent.timestamp(), False),
 
             # Only two active reviews, and not too recent, so ready.
-            (
-                [
-                    MockMessage(author=self.bot_user, content="Not a review", created_at=too_recent),
-                    MockMessage(author=self.bot_user, content="wookie for Helper!", created_at=not_too_recent),
-                    MockMessage(author=self.bot_user, content="wookie for Helper!", created_at=not_too_recent),
-                    MockMessage(author=self.bot_user, content="Not a review", created_at=not_too_recent),
-                ],
-                not_too_recent.timestamp(),
-                True,
-            ),
+            ({1: False, 2: False, 3: True}, not_too_recent.timestamp(), True),
 
             # Over the active threshold, but below the total threshold
-            (
-                [
-                    MockMessage(
-                        author=self.bot_user,
-                        content="joe for Helper!",
-                        created_at=not_too_recent,
-                        reactions=[ticket_reaction]
-                    )
-                ] * 6,
-                not_too_recent.timestamp(),
-                True
-            ),
+            (dict.fromkeys(range(6), True), not_too_recent.timestamp(), True),
 
             # Over the total threshold
-            (
-                [
-                    MockMessage(
-                        author=self.bot_user,
-                        content="joe for Helper!",
-                        created_at=not_too_recent,
-                        reactions=[ticket_reaction]
-                    )
-                ] * 11,
-                not_too_recent.timestamp(),
-                False
-            ),
+            (dict.fromkeys(range(11), True), not_too_recent.timestamp(), False),
 
-            # No messages, so ready.
-            ([], None, True),
+            # No reviews, so ready.
+            ({}, None, True),
         )
 
-        for messages, last_review_timestamp, expected in cases:
-            with self.subTest(messages=messages, expected=expected):
-                self.voting_channel.history = AsyncIterator(messages)
-
-                cache_get_mock = AsyncMock(return_value=last_review_timestamp)
-                self.reviewer.status_cache.get = cache_get_mock
+        for reviews, last_review_timestamp, expected in cases:
+            with self.subTest(reviews=reviews, expected=expected):
+                await self.flush()
+                self.reviewer._reviews_synced = True
+                if reviews:
+                    await self.reviewer.review_messages.update(reviews)
+                if last_review_timestamp:
+                    await self.reviewer.status_cache.set("last_vote_date", last_review_timestamp)
 
                 res = await self.reviewer.is_ready_for_review()
 
                 self.assertIs(res, expected)
-                cache_get_mock.assert_called_with("last_vote_date")
+
+    async def test_review_state_is_seeded_from_history_once(self):
+        """The review state should be read from the voting channel's history only once after the cog is loaded."""
+        ticket_reaction = MockReaction(users=[self.bot_user], emoji="\N{TICKET}")
+        messages = [
+            MockMessage(id=1, author=self.bot_user, content="wookie for Helper!", reactions=[]),
+            MockMessage(id=2, author=self.bot_user, content="joe for Helper!", reactions=[ticket_reaction]),
+            MockMessage(id=3, author=self.bot_user, content="Not a review", reactions=[]),
+            MockMessage(id=4, author=MockMember(bot=False), content="zig for Helper!", reactions=[]),
+        ]
+        self.voting_channel.history = Mock(side_effect=lambda: AsyncIterator(messages))
+
+        self.assertEqual(await self.reviewer.get_review_states(), {1: False, 2: True})
+        self.assertEqual(await self.reviewer.get_review_states(), {1: False, 2: True})
+        self.voting_channel.history.assert_called_once()
+
+    async def test_review_state_is_resynced_when_reloaded(self):
+        """Changes made while the bot was offline should be picked up from the history when the cog is loaded."""
+        await self.reviewer.review_messages.update({1: False, 2: False})
+        messages = [MockMessage(id=2, author=self.bot_user, content="joe for Helper!", reactions=[])]
+        self.voting_channel.history = Mock(side_effect=lambda: AsyncIterator(messages))
+
+        reloaded_reviewer = _review.Reviewer(self.bot, self.nomination_api)
+
+        self.assertEqual(await reloaded_reviewer.get_review_states(), {2: False})
+
+    async def test_review_state_updates(self):
+        """Ticketing, un-ticketing and deleting reviews should update the tracked state."""
+        self.reviewer._reviews_synced = True
+        await self.reviewer.review_messages.update({1: False, 2: False, 3: False})
+
+        await self.reviewer.mark_ticketed(1)
+        await self.reviewer.mark_ticketed(4)
+        self.assertEqual(await self.reviewer.get_review_states(), {1: True, 2: False, 3: False})
+
+        message = Mock(id=1, fetch=AsyncMock(return_value=MockMessage(id=1, reactions=[])))
+        await self.reviewer.refresh_ticketed(message)
+        self.assertEqual(await self.reviewer.get_review_states(), {1: False, 2: False, 3: False})
+
+        await self.reviewer.forget_reviews(2, 3, 4)
+        self.assertEqual(await self.reviewer.get_review_states(), {1: False})
+
+    async def test_present_members_are_queried_in_batches(self):
+        """Users missing from an incomplete member cache should be queried in batches."""
+        cached_ids = set(range(0, 300, 2))
+        guild = MockGuild(chunked=False)
+        guild.get_member = Mock(side_effect=lambda user_id: MockMember(id=user_id) if user_id in cached_ids else None)
+        guild.query_members = AsyncMock(side_effect=lambda user_ids: [MockMember(id=user_ids[0])])
+        self.bot.get_guild = Mock(return_value=guild)
+
+        present = await self.reviewer.get_present_member_ids(list(range(300)))
+
+        self.assertEqual(guild.query_members.await_count, 2)
+        self.assertEqual(present, cached_ids | {1, 201})
 
     @patch("bot.exts.recruitment.talentpool._review.MIN_NOMINATION_TIME", timedelta(days=7))
     async def test_get_nomination_to_review(self):
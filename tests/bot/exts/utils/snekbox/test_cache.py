@@ -0,0 +1,131 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from bot.exts.utils.snekbox import EvalJob, EvalResult
+from bot.exts.utils.snekbox._cache import ResultCache, is_deterministic, job_key
+
+
+class ResultCacheTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.stats = MagicMock()
+        self.cache = ResultCache(ttl=60, max_size=2, stats=self.stats)
+        self.job = EvalJob.from_code("print(1 + 1)")
+        self.result = EvalResult("2", 0)
+
+    def test_job_key(self):
+        """Identical jobs should share a key, and any difference should change it."""
+        self.assertEqual(job_key(self.job), job_key(EvalJob.from_code("print(1 + 1)")))
+        self.assertNotEqual(job_key(self.job), job_key(EvalJob.from_code("print(1 + 2)")))
+        self.assertNotEqual(job_key(self.job), job_key(self.job.as_version("3.13")))
+
+    def test_is_deterministic(self):
+        """Jobs which may produce different output each run shouldn't be considered deterministic."""
+        cases = (
+            ("print(1 + 1)", True),
+            ("print(sorted([3, 1, 2]))", True),
+            ("import random\nprint(random.random())", False),
+            ("from time import time\nprint(time())", False),
+            ("print(id(object()))", False),
+            ("print({'a', 'b'} | set())", False),
+        )
+        for code, expected in cases:
+            with self.subTest(code=code):
+                self.assertIs(is_deterministic(EvalJob.from_code(code)), expected)
+
+        self.assertFalse(is_deterministic(EvalJob(["-m", "timeit", "1 + 1"], name="timeit")))
+
+    async def test_result_is_reused(self):
+        """A second identical job should reuse the first job's result."""
+        runner = AsyncMock(return_value=self.result)
+
+        self.assertIs(await self.cache.run(self.job, runner), self.result)
+        self.assertIs(await self.cache.run(EvalJob.from_code("print(1 + 1)"), runner), self.result)
+
+        runner.assert_awaited_once()
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        self.assertEqual(self.cache.hit_ratio, 0.5)
+        self.stats.incr.assert_any_call("snekbox.result_cache.hit")
+
+    async def test_disabled_cache_always_runs(self):
+        """Nothing should be reused if the TTL is 0."""
+        cache = ResultCache(ttl=0, max_size=2, stats=self.stats)
+        runner = AsyncMock(return_value=self.result)
+
+        await cache.run(self.job, runner)
+        await cache.run(self.job, runner)
+
+        self.assertEqual(runner.await_count, 2)
+
+    async def test_non_deterministic_job_always_runs(self):
+        """Jobs which aren't deterministic should never be reused."""
+        job = EvalJob.from_code("import random\nprint(random.random())")
+        runner = AsyncMock(return_value=self.result)
+
+        await self.cache.run(job, runner)
+        await self.cache.run(job, runner)
+
+        self.assertEqual(runner.await_count, 2)
+
+    async def test_expired_result_is_not_reused(self):
+        """Results should be re-computed once their TTL has passed."""
+        runner = AsyncMock(return_value=self.result)
+
+        with patch("bot.exts.utils.snekbox._cache.time.monotonic", return_value=0):
+            await self.cache.run(self.job, runner)
+        with patch("bot.exts.utils.snekbox._cache.time.monotonic", return_value=61):
+            await self.cache.run(self.job, runner)
+
+        self.assertEqual(runner.await_count, 2)
+
+    async def test_least_recently_used_result_is_evicted(self):
+        """The cache should not grow past its maximum size."""
+        runner = AsyncMock(return_value=self.result)
+        jobs = [EvalJob.from_code(f"print({i})") for i in range(3)]
+
+        for job in jobs:
+            await self.cache.run(job, runner)
+        await self.cache.run(jobs[0], runner)
+
+        self.assertEqual(runner.await_count, 4)
+
+    async def test_identical_in_flight_jobs_are_coalesced(self):
+        """Concurrent identical jobs should share a single execution."""
+        started = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def runner() -> EvalResult:
+            started.set()
+            await finish.wait()
+            return self.result
+
+        runner_mock = AsyncMock(side_effect=runner)
+        first = asyncio.create_task(self.cache.run(self.job, runner_mock))
+        await started.wait()
+        second = asyncio.create_task(self.cache.run(self.job, runner_mock))
+        await asyncio.sleep(0)
+        finish.set()
+
+        self.assertEqual(await asyncio.gather(first, second), [self.result, self.result])
+        runner_mock.assert_awaited_once()
+        self.stats.incr.assert_any_call("snekbox.result_cache.coalesced")
+
+    async def test_cancelled_in_flight_job_is_not_shared(self):
+        """If the running job doesn't produce a result, a coalesced job should run by itself."""
+        started = asyncio.Event()
+        finish = asyncio.Event()
+
+        async def cancelled_runner() -> None:
+            started.set()
+            await finish.wait()
+
+        first = asyncio.create_task(self.cache.run(self.job, cancelled_runner))
+        await started.wait()
+        second_runner = AsyncMock(return_value=self.result)
+        second = asyncio.create_task(self.cache.run(self.job, second_runner))
+        await asyncio.sleep(0)
+        finish.set()
+
+        self.assertIsNone(await first)
+        self.assertIs(await second, self.result)
+        second_runner.assert_awaited_once()
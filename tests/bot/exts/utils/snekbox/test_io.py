@@ -1,3 +1,4 @@
+from base64 import b64encode
 from unittest import TestCase
 
 # noinspection PyProtectedMember
@@ -32,3 +33,34 @@ class SnekboxIOTests(TestCase):
                 # Test FileAttachment.to_file()
                 obj = _io.FileAttachment(name, b"")
                 self.assertEqual(obj.to_file().filename, expected)
+
+    def test_file_attachment_from_dict_is_lazy(self):
+        """Files from a response should only be decoded once their content is needed."""
+        content = b"some file content"
+        attachment = _io.FileAttachment.from_dict({"path": "file.txt", "content": b64encode(content).decode()})
+
+        self.assertFalse(attachment.is_decoded)
+        self.assertEqual(attachment.size, len(content))
+        self.assertEqual(attachment.to_dict()["content"], b64encode(content).decode())
+        self.assertFalse(attachment.is_decoded)
+
+        self.assertEqual(attachment.content, content)
+        self.assertTrue(attachment.is_decoded)
+
+    def test_file_attachment_size_without_decoding(self):
+        """The decoded size should be computed from the encoded content for any padding."""
+        for content in (b"", b"a", b"ab", b"abc", b"abcd"):
+            with self.subTest(content=content):
+                attachment = _io.FileAttachment("file", encoded_content=b64encode(content).decode())
+                self.assertEqual(attachment.size, len(content))
+
+    def test_file_attachment_from_dict_size_limit(self):
+        """Files exceeding the size limit should be rejected without being decoded."""
+        encoded = b64encode(b"a" * 11).decode()
+        cases = (
+            {"path": "file", "content": encoded},
+            {"path": "file", "content": "", "size": 11},
+        )
+        for data in cases:
+            with self.subTest(data=data), self.assertRaises(ValueError):
+                _io.FileAttachment.from_dict(data, size_limit=10)
@@ -0,0 +1,207 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from bot.exts.utils.snekbox import EvalJob, EvalResult, Snekbox
+from bot.exts.utils.snekbox._queue import JobCancelledError, JobQueue
+from tests.helpers import MockBot, MockContext, MockMessage, MockTextChannel, MockUser
+
+
+class JobQueueTests(unittest.IsolatedAsyncioTestCase):
+    async def test_jobs_admitted_while_below_limit(self):
+        """Jobs should be admitted straight away until the concurrency limit is reached."""
+        queue = JobQueue(2)
+
+        first = queue.submit(user_id=1, channel_id=1, message_id=1)
+        second = queue.submit(user_id=2, channel_id=1, message_id=2)
+        third = queue.submit(user_id=3, channel_id=1, message_id=3)
+
+        self.assertTrue(first.is_admitted)
+        self.assertTrue(second.is_admitted)
+        self.assertFalse(third.is_admitted)
+        self.assertEqual(queue.position(third), 1)
+        self.assertEqual(len(queue), 1)
+
+        queue.release(first)
+        self.assertTrue(third.is_admitted)
+        self.assertEqual(len(queue), 0)
+
+    async def test_channels_and_users_take_turns(self):
+        """A busy channel or user shouldn't be able to starve other channels and users."""
+        queue = JobQueue(1)
+        running = queue.submit(user_id=0, channel_id=0, message_id=0)
+
+        busy_channel = [queue.submit(user_id=1, channel_id=1, message_id=i) for i in range(1, 4)]
+        other_user = queue.submit(user_id=2, channel_id=1, message_id=4)
+        other_channel = queue.submit(user_id=3, channel_id=2, message_id=5)
+
+        self.assertEqual(queue.position(busy_channel[0]), 1)
+        self.assertEqual(queue.position(other_channel), 2)
+        self.assertEqual(queue.position(other_user), 3)
+        self.assertEqual(queue.position(busy_channel[1]), 4)
+        self.assertEqual(queue.position(busy_channel[2]), 5)
+
+        admitted = []
+        job = running
+        for _ in range(5):
+            queue.release(job)
+            job = next(j for j in (*busy_channel, other_user, other_channel) if j.is_admitted and j not in admitted)
+            admitted.append(job)
+
+        self.assertEqual(admitted, [busy_channel[0], other_channel, other_user, busy_channel[1], busy_channel[2]])
+
+    async def test_cancel_waiting_job(self):
+        """Cancelling a waiting job should raise in its waiter and free its place."""
+        queue = JobQueue(1)
+        running = queue.submit(user_id=1, channel_id=1, message_id=1)
+        waiting = queue.submit(user_id=2, channel_id=1, message_id=2)
+        behind = queue.submit(user_id=3, channel_id=1, message_id=3)
+
+        self.assertFalse(queue.cancel(running.message_id, "it's running"))
+        self.assertTrue(queue.cancel(waiting.message_id, "the invoking message was deleted"))
+
+        with self.assertRaises(JobCancelledError):
+            await queue.wait(waiting)
+        self.assertEqual(queue.position(behind), 1)
+
+        queue.release(running)
+        await queue.wait(behind)
+        self.assertEqual(queue.running, 1)
+
+    async def test_cancelled_waiter_gives_up_place(self):
+        """Cancelling the task waiting on a job should remove the job from the queue."""
+        queue = JobQueue(1)
+        running = queue.submit(user_id=1, channel_id=1, message_id=1)
+        waiting = queue.submit(user_id=2, channel_id=1, message_id=2)
+
+        task = asyncio.create_task(queue.wait(waiting))
+        await asyncio.sleep(0)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+        self.assertEqual(len(queue), 0)
+        queue.release(running)
+        self.assertEqual(queue.running, 0)
+
+
+class FakeSnekboxTests(unittest.IsolatedAsyncioTestCase):
+    """Run jobs through the cog's queue against a local fake snekbox server."""
+
+    async def asyncSetUp(self):
+        self.concurrent = 0
+        self.max_concurrent = 0
+        self.release = asyncio.Event()
+
+        app = web.Application()
+        app.router.add_post("/eval", self.fake_eval)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.session = ClientSession()
+
+        self.bot = MockBot()
+        self.bot.http_session = self.session
+        self.cog = Snekbox(bot=self.bot)
+
+        patcher = patch("bot.exts.utils.snekbox._cog.URLs.snekbox_eval_api", str(self.server.make_url("/eval")))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.server.close()
+
+    async def fake_eval(self, request: web.Request) -> web.Response:
+        """Pretend to evaluate the job, blocking until the test releases it."""
+        data = await request.json()
+        self.concurrent += 1
+        self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        try:
+            await self.release.wait()
+        finally:
+            self.concurrent -= 1
+        return web.json_response({"stdout": data["args"][0], "returncode": 0, "files": []})
+
+    @staticmethod
+    def make_ctx(user_id: int, channel_id: int, message_id: int) -> MockContext:
+        """Return a context for a command invoked by the given user in the given channel."""
+        channel = MockTextChannel(id=channel_id)
+        message = MockMessage(id=message_id, channel=channel, author=MockUser(id=user_id))
+        return MockContext(message=message, channel=channel, author=message.author)
+
+    async def test_concurrency_is_bounded(self):
+        """No more jobs than the limit should reach snekbox at the same time."""
+        self.cog.job_queue = JobQueue(2)
+        contexts = [self.make_ctx(user_id=i, channel_id=i % 2, message_id=i) for i in range(6)]
+        tasks = [
+            asyncio.create_task(self.cog.queue_job(ctx, EvalJob([f"job{i}"])))
+            for i, ctx in enumerate(contexts)
+        ]
+
+        while self.concurrent < 2:
+            await asyncio.sleep(0.01)
+        self.assertEqual(len(self.cog.job_queue), 4)
+
+        # Queued jobs are told their position.
+        queued_notices = [ctx.send.call_args.args[0] for ctx in contexts if ctx.send.called]
+        self.assertEqual(len(queued_notices), 4)
+        self.assertIn("queued at position 1", queued_notices[0])
+
+        self.release.set()
+        results = await asyncio.gather(*tasks)
+
+        self.assertEqual(results, [EvalResult(f"job{i}", 0) for i in range(6)])
+        self.assertEqual(self.max_concurrent, 2)
+        self.assertEqual(self.cog.job_queue.running, 0)
+        self.bot.metrics.timing.assert_any_call("snekbox.queue.wait_time", unittest.mock.ANY)
+        self.bot.metrics.timing.assert_any_call("snekbox.execution_time", unittest.mock.ANY)
+
+    async def test_deleted_message_cancels_queued_job(self):
+        """A queued job should be cancelled, and never reach snekbox, when its message is deleted."""
+        self.cog.job_queue = JobQueue(1)
+        running_ctx = self.make_ctx(user_id=1, channel_id=1, message_id=1)
+        queued_ctx = self.make_ctx(user_id=2, channel_id=1, message_id=2)
+
+        running = asyncio.create_task(self.cog.queue_job(running_ctx, EvalJob(["running"])))
+        queued = asyncio.create_task(self.cog.queue_job(queued_ctx, EvalJob(["queued"])))
+        while self.concurrent < 1 or not queued_ctx.send.called:
+            await asyncio.sleep(0.01)
+
+        payload = unittest.mock.MagicMock(message_id=2)
+        await self.cog.on_raw_message_delete(payload)
+        self.release.set()
+
+        self.assertIsNone(await queued)
+        self.assertEqual(await running, EvalResult("running", 0))
+        self.assertEqual(self.max_concurrent, 1)
+        self.assertIn("was cancelled", queued_ctx.send.return_value.edit.call_args.kwargs["content"])
+
+    async def test_slot_is_released_when_cancelled_after_admission(self):
+        """A job cancelled while its queue message is being deleted shouldn't keep holding its slot."""
+        self.cog.job_queue = JobQueue(1)
+        running_ctx = self.make_ctx(user_id=1, channel_id=1, message_id=1)
+        queued_ctx = self.make_ctx(user_id=2, channel_id=1, message_id=2)
+        deleting = asyncio.Event()
+
+        async def delete() -> None:
+            deleting.set()
+            await asyncio.Event().wait()
+
+        queued_ctx.send.return_value.delete.side_effect = delete
+
+        running = asyncio.create_task(self.cog.queue_job(running_ctx, EvalJob(["running"])))
+        queued = asyncio.create_task(self.cog.queue_job(queued_ctx, EvalJob(["queued"])))
+        while self.concurrent < 1 or not queued_ctx.send.called:
+            await asyncio.sleep(0.01)
+
+        self.release.set()
+        await running
+        await deleting.wait()
+        queued.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await queued
+
+        self.assertEqual(self.cog.job_queue.running, 0)
@@ -1,4 +1,5 @@
 import asyncio
+import json
 import unittest
 from base64 import b64encode
 from unittest.mock import AsyncMock, MagicMock, Mock, call, create_autospec, patch
@@ -58,6 +59,47 @@ class SnekboxTests(unittest.IsolatedAsyncioTestCase):
         )
         resp.json.assert_awaited_once()
 
+    async def test_post_job_prunes_files_while_parsing(self):
+        """The content of files that can't be uploaded should be dropped while the response is parsed."""
+        small_file = b64encode(b"hello").decode()
+        big_file = b64encode(b"a" * 30).decode()
+        body = json.dumps({
+            "stdout": "Hi",
+            "returncode": 0,
+            "files": [{"path": "small.txt", "content": small_file}, {"path": "big.bin", "content": big_file}],
+        })
+
+        async def response_json(*, loads):
+            return loads(body)
+
+        resp = MagicMock()
+        resp.json = response_json
+        context_manager = MagicMock()
+        context_manager.__aenter__.return_value = resp
+        self.bot.http_session.post.return_value = context_manager
+
+        with patch("bot.exts.utils.snekbox._eval.FILE_COUNT_LIMIT", 1):
+            result = await self.cog.post_job(self.job)
+
+        self.assertEqual(result.stdout, "Hi")
+        self.assertFalse(result.files[0].is_decoded)
+        self.assertEqual(result.files, [FileAttachment("small.txt", b"hello")])
+        self.assertEqual(result.failed_files, ["big.bin"])
+
+    @patch("bot.exts.utils.snekbox._eval.FILE_SIZE_LIMIT", 10)
+    @patch("bot.exts.utils.snekbox._eval.FILE_COUNT_LIMIT", 2)
+    def test_file_pruner_drops_unusable_content(self):
+        """File contents that can't be uploaded should be dropped while parsing."""
+        prune = snekbox._eval._make_file_pruner()
+        small = {"path": "small", "content": b64encode(b"a").decode()}
+        big = {"path": "big", "content": b64encode(b"a" * 11).decode()}
+        extra = {"path": "extra", "content": b64encode(b"a").decode()}
+
+        self.assertIs(prune(small), small)
+        self.assertEqual(prune(big), {"path": "big", "size": 11, "content": ""})
+        self.assertEqual(prune(extra), {"path": "extra", "size": 1, "content": ""})
+        self.assertEqual(prune({"stdout": "", "files": []}), {"stdout": "", "files": []})
+
     @patch(
         "bot.exts.utils.snekbox._cog.paste_service._lexers_supported_by_pastebin",
         {"https://paste.pythondiscord.com": ["text"]},
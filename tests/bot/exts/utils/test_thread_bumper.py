@@ -0,0 +1,95 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import discord
+
+from bot.exts.utils import thread_bumper
+from bot.exts.utils.thread_bumper import THREAD_BUMP_ENDPOINT, ThreadBumper
+from tests.helpers import MockBot
+
+
+class FakeDiscord:
+    """A guild with `thread_count` bumped threads, tracking the number of concurrent requests made to it."""
+
+    def __init__(self, thread_count: int):
+        self.threads = {}
+        for thread_id in range(thread_count):
+            thread = MagicMock(spec=discord.Thread, id=thread_id, archived=thread_id % 2 == 0)
+            thread.name = f"thread-{thread_id}"
+            thread.edit.side_effect = self.request
+            self.threads[thread_id] = thread
+
+        # Every tenth thread was archived by hand, and every 25th was deleted.
+        self.manually_archived = {thread_id for thread_id in self.threads if thread_id % 10 == 0}
+        self.deleted = {thread_id for thread_id in self.threads if thread_id % 25 == 1}
+        self.concurrent = self.max_concurrent = 0
+
+    async def request(self, *_args, **_kwargs) -> None:
+        self.concurrent += 1
+        self.max_concurrent = max(self.max_concurrent, self.concurrent)
+        await asyncio.sleep(0)
+        self.concurrent -= 1
+
+    async def get_or_fetch_channel(self, _bot, thread_id: int) -> discord.Thread:
+        await self.request()
+        if thread_id in self.deleted:
+            raise discord.NotFound(MagicMock(status=404), "Unknown Channel")
+        return self.threads[thread_id]
+
+    async def audit_logs(self, **_kwargs):
+        for thread_id in sorted(self.manually_archived):
+            yield SimpleNamespace(target=SimpleNamespace(id=thread_id), after=SimpleNamespace(archived=True))
+
+
+class FakeSite:
+    """A site API client serving the bump list."""
+
+    def __init__(self, thread_ids: list[int]):
+        self.thread_ids = list(thread_ids)
+        self.deleted = []
+
+    async def get(self, _endpoint: str) -> list[int]:
+        return self.thread_ids
+
+    async def delete(self, endpoint: str) -> None:
+        self.deleted.append(int(endpoint.removeprefix(f"{THREAD_BUMP_ENDPOINT}/")))
+
+
+class ThreadReconciliationTests(unittest.IsolatedAsyncioTestCase):
+    async def test_reconciliation_of_hundreds_of_threads(self):
+        """All bumped threads should be reconciled, without exceeding the concurrency limit."""
+        fake_discord = FakeDiscord(300)
+        site = FakeSite(fake_discord.threads)
+        bot = MockBot()
+        bot.api_client = site
+        bot.get_guild.return_value.audit_logs = fake_discord.audit_logs
+        cog = ThreadBumper(bot)
+
+        with patch.object(thread_bumper, "get_or_fetch_channel", fake_discord.get_or_fetch_channel):
+            await cog.cog_load()
+
+        archived = {thread_id for thread_id, thread in fake_discord.threads.items() if thread.archived}
+        expected_unarchived = archived - fake_discord.manually_archived - fake_discord.deleted
+        unarchived = {thread.id for thread in fake_discord.threads.values() if thread.edit.await_count}
+
+        self.assertEqual(unarchived, expected_unarchived)
+        self.assertEqual(set(site.deleted), fake_discord.deleted | (archived & fake_discord.manually_archived))
+        self.assertEqual(len(site.deleted), len(set(site.deleted)))
+        self.assertEqual(fake_discord.max_concurrent, thread_bumper.MAX_CONCURRENT_RECONCILIATIONS)
+        bot.stats.timing.assert_called_once()
+        self.assertEqual(bot.stats.timing.call_args.args[0], "thread_bumper.reconciliation_time")
+
+    async def test_non_thread_channels_are_removed(self):
+        """Channels which aren't threads should be removed from the bump list."""
+        site = FakeSite([1])
+        bot = MockBot()
+        bot.api_client = site
+        cog = ThreadBumper(bot)
+
+        with patch.object(thread_bumper, "get_or_fetch_channel", return_value=MagicMock(spec=discord.TextChannel)):
+            threads = await cog.fetch_bumped_threads([1])
+
+        self.assertEqual(threads, [])
+        self.assertEqual(site.deleted, [1])
@@ -0,0 +1,61 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import discord
+from discord.ext import commands
+
+from bot import bot as bot_module
+from bot.bot import Bot
+
+
+class ExtensionLoadingTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.bot = Bot(
+            command_prefix="!",
+            redis_session=MagicMock(),
+            http_session=MagicMock(),
+            allowed_roles=[1],
+            guild_id=1,
+            intents=discord.Intents.none(),
+        )
+        self.bot.wait_until_guild_available = AsyncMock()
+
+        async def load_extension(_bot, name: str) -> None:
+            await asyncio.sleep(0.01)
+            if name == "exts.broken":
+                raise ValueError("Broken extension")
+
+        patcher = patch.object(commands.Bot, "load_extension", load_extension)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def load_extensions(self, extensions: set[str]) -> list[str]:
+        """Load `extensions` through `BotBase`, and return the log of the loading timeline."""
+        with (
+            patch("pydis_core._bot.walk_extensions", return_value=frozenset(extensions)),
+            patch.object(bot_module.scheduling, "_log_task_exception"),
+            self.assertLogs(bot_module.log, "INFO") as logs,
+        ):
+            await self.bot._load_extensions(MagicMock())
+            await asyncio.wait_for(self.bot._extensions_loaded.wait(), timeout=5)
+            while not any("Loaded" in line for line in logs.output):
+                await asyncio.sleep(0.01)
+
+        return logs.output
+
+    async def test_timeline_is_logged_once_extensions_are_loaded(self):
+        """The loading of every extension found at startup should be logged, including those which failed."""
+        output = await self.load_extensions({"exts.modlog", "exts.filtering", "exts.broken"})
+
+        self.assertIn("Loaded 3 extensions", output[-1])
+        self.assertIn("exts.filtering", output[-1])
+        self.assertIn("exts.broken (failed)", output[-1])
+
+    async def test_later_loads_are_not_recorded(self):
+        """Extensions loaded after startup, e.g. by a command, shouldn't be added to the reported timeline."""
+        await self.load_extensions({"exts.modlog"})
+
+        await self.bot.load_extension("exts.filtering")
+
+        self.assertIsNone(self.bot._extension_loads)
@@ -0,0 +1,76 @@
+import unittest
+from unittest.mock import patch
+
+import discord
+
+from bot.utils.guild_stats import GuildStatistics
+from tests.helpers import MockGuild, MockMember, MockRole, MockTextChannel, MockVoiceChannel
+
+
+class GuildStatisticsTests(unittest.TestCase):
+    def setUp(self):
+        patcher = patch("bot.utils.guild_stats.is_staff_channel", new=lambda channel: channel.name.startswith("staff"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.helpers = MockRole(name="Helpers", id=1)
+        self.admins = MockRole(name="Admins", id=2)
+        self.members = [
+            MockMember(id=1, roles=[self.helpers]),
+            MockMember(id=2, roles=[self.helpers, self.admins]),
+            MockMember(id=3),
+        ]
+        self.channels = [
+            MockTextChannel(id=1, name="general", type=discord.ChannelType.text),
+            MockTextChannel(id=2, name="staff-lounge", type=discord.ChannelType.text),
+            MockVoiceChannel(id=3, name="voice", type=discord.ChannelType.voice),
+        ]
+        self.guild = MockGuild(members=self.members, channels=self.channels)
+
+        self.stats = GuildStatistics()
+        self.stats.recount(self.guild)
+
+    def test_recount(self):
+        """Recounting should count the members of each role and the channels of each type."""
+        self.assertTrue(self.stats.ready)
+        self.assertEqual(self.stats.role_member_count(self.helpers.id), 2)
+        self.assertEqual(self.stats.role_member_count(self.admins.id), 1)
+        self.assertEqual(self.stats.role_member_count(self.helpers.id, self.admins.id), 3)
+        self.assertEqual(self.stats.channel_type_counts(), {"text": 1, "staff": 1, "voice": 1})
+
+    def test_member_events(self):
+        """Joins, leaves and role changes should update the role counts."""
+        joined = MockMember(id=4, roles=[self.admins])
+        self.stats.add_member(joined)
+        self.assertEqual(self.stats.role_member_count(self.admins.id), 2)
+
+        self.stats.remove_member(self.members[0])
+        self.assertEqual(self.stats.role_member_count(self.helpers.id), 1)
+
+        promoted = MockMember(id=3, roles=[self.helpers])
+        self.stats.update_member(self.members[2], promoted)
+        self.assertEqual(self.stats.role_member_count(self.helpers.id), 2)
+
+        self.stats.remove_role(self.admins.id)
+        self.assertEqual(self.stats.role_member_count(self.admins.id), 0)
+
+    def test_channel_events(self):
+        """Created, updated and deleted channels should update the channel type counts."""
+        self.stats.add_channel(MockTextChannel(id=4, name="staff-meta", type=discord.ChannelType.text))
+        self.assertEqual(self.stats.channel_type_counts()["staff"], 2)
+
+        # The permissions of a channel changed so that it's no longer a staff channel.
+        self.stats.add_channel(MockTextChannel(id=2, name="lounge", type=discord.ChannelType.text))
+        self.assertEqual(self.stats.channel_type_counts(), {"text": 2, "staff": 1, "voice": 1})
+
+        self.stats.remove_channel(self.channels[2])
+        self.assertEqual(self.stats.channel_type_counts(), {"text": 2, "staff": 1})
+
+    def test_recount_corrects_drift(self):
+        """A recount should correct counters which missed an event, and log the difference."""
+        self.stats.add_member(MockMember(id=5, roles=[self.helpers]))
+
+        with self.assertLogs("bot.utils.guild_stats", "INFO"):
+            self.stats.recount(self.guild)
+
+        self.assertEqual(self.stats.role_member_count(self.helpers.id), 2)
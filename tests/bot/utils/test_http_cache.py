@@ -0,0 +1,116 @@
+import unittest
+
+from aiohttp import ClientResponseError, ClientSession, web
+from aiohttp.test_utils import TestServer
+
+from bot.utils.http_cache import HTTPCache
+
+
+class HTTPCacheTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the conditional-request cache, against a local server which supports ETags."""
+
+    async def asyncSetUp(self):
+        self.requests = []
+        self.bodies = {"/a": "a" * 10, "/b": "b" * 10, "/c": "c" * 10, "/json": '{"key": "value"}'}
+
+        app = web.Application()
+        app.router.add_get("/missing", self.missing)
+        app.router.add_get("/search", self.search)
+        app.router.add_get("/{name}", self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.session = ClientSession()
+
+        self.cache = HTTPCache()
+
+    async def asyncTearDown(self):
+        await self.session.close()
+        await self.server.close()
+
+    async def handle(self, request: web.Request) -> web.Response:
+        """Return the body for the path, or 304 if the client's ETag matches."""
+        self.requests.append((request.path, request.headers.get("If-None-Match")))
+        body = self.bodies[request.path]
+        etag = f'"{hash(body)}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=body, headers={"ETag": etag})
+
+    async def search(self, request: web.Request) -> web.Response:
+        """Return the query of the request as its body."""
+        self.requests.append((request.path_qs, request.headers.get("If-None-Match")))
+        return web.Response(text=request.query_string, headers={"ETag": f'"{request.query_string}"'})
+
+    async def missing(self, request: web.Request) -> web.Response:
+        """Always respond with 404."""
+        raise web.HTTPNotFound
+
+    def url(self, path: str) -> str:
+        return str(self.server.make_url(path))
+
+    async def test_cached_response_is_revalidated(self):
+        """A second request should be conditional, and use the cached body when the server answers 304."""
+        self.assertEqual(await self.cache.get(self.session, self.url("/a")), "a" * 10)
+        self.assertEqual(await self.cache.get(self.session, self.url("/a")), "a" * 10)
+
+        self.assertEqual(len(self.requests), 2)
+        self.assertIsNone(self.requests[0][1])
+        self.assertIsNotNone(self.requests[1][1])
+
+    async def test_changed_response_replaces_cached_one(self):
+        """If the resource changed, the new body should be returned and cached."""
+        await self.cache.get(self.session, self.url("/a"))
+        self.bodies["/a"] = "changed"
+
+        self.assertEqual(await self.cache.get(self.session, self.url("/a")), "changed")
+        self.assertEqual(await self.cache.get(self.session, self.url("/a")), "changed")
+
+    async def test_json_format(self):
+        """The cached body should be decoded as JSON when requested."""
+        for _ in range(2):
+            self.assertEqual(await self.cache.get(self.session, self.url("/json"), "json"), {"key": "value"})
+
+    async def test_fresh_response_is_not_requested_again(self):
+        """No request should be made while the cached response is younger than `max_age`."""
+        await self.cache.get(self.session, self.url("/a"))
+        await self.cache.get(self.session, self.url("/a"), max_age=60)
+
+        self.assertEqual(len(self.requests), 1)
+
+    async def test_accept_header_is_part_of_the_key(self):
+        """Responses to requests with different Accept headers shouldn't be shared."""
+        await self.cache.get(self.session, self.url("/a"))
+        await self.cache.get(self.session, self.url("/a"), headers={"Accept": "application/json"}, max_age=60)
+
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_params_are_part_of_the_key(self):
+        """Responses to requests with different query params shouldn't be shared."""
+        first = await self.cache.get(self.session, self.url("/search"), params={"q": "first"})
+        second = await self.cache.get(self.session, self.url("/search"), params={"q": "second"}, max_age=60)
+        cached = await self.cache.get(self.session, self.url("/search?q=first"), max_age=60)
+
+        self.assertEqual((first, second, cached), ("q=first", "q=second", "q=first"))
+        self.assertEqual(len(self.requests), 2)
+
+    async def test_least_recently_used_response_is_evicted(self):
+        """The cache should be bounded by both its number of entries and their total size."""
+        for max_entries, max_size in ((2, 1000), (1000, 25)):
+            with self.subTest(max_entries=max_entries, max_size=max_size):
+                self.requests.clear()
+                self.cache = HTTPCache(max_entries=max_entries, max_size=max_size)
+
+                for path in ("/a", "/b", "/a", "/c", "/a", "/b"):
+                    await self.cache.get(self.session, self.url(path))
+
+                # "/b" was evicted by "/c" as "/a" had been used more recently.
+                conditional = [path for path, etag in self.requests if etag is not None]
+                self.assertEqual(conditional, ["/a", "/a"])
+
+    async def test_error_status_raises(self):
+        """An error response should raise and not be cached."""
+        with self.assertRaises(ClientResponseError) as error:
+            await self.cache.get(self.session, self.url("/missing"))
+
+        self.assertEqual(error.exception.status, 404)
+        self.assertEqual(len(self.cache._responses), 0)
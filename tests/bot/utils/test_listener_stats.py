@@ -0,0 +1,118 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import ANY, MagicMock
+
+from discord.ext.commands import Cog
+
+from bot.utils import listener_stats
+from bot.utils.listener_stats import ListenerStats
+from bot.utils.metrics import AggregatingStats
+from tests.bot.utils.test_metrics import FakeStatsClient
+
+
+class Listeners(Cog, name="Some Cog"):
+    async def on_message(self, delay: float) -> str:
+        await asyncio.sleep(delay)
+        return "done"
+
+    async def on_typing(self, duration: float) -> None:
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            pass
+        await asyncio.sleep(0)
+
+    async def on_error(self) -> None:
+        await asyncio.sleep(0)
+        raise ValueError("oops")
+
+
+class ListenerStatsTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.metrics = MagicMock()
+        self.stats = ListenerStats(self.metrics)
+        self.cog = Listeners()
+
+    async def test_awaiting_is_excluded_from_cpu_time(self):
+        """The time a listener spends suspended should count towards its wall time, but not its CPU time."""
+        listener = self.stats.instrument(self.cog.on_message, "on_message")
+
+        self.assertEqual(await listener(0.05), "done")
+
+        timings = self.stats.timings["on_message", "Some Cog.on_message"]
+        self.assertEqual(timings.calls, 1)
+        self.assertGreaterEqual(timings.wall_time, 0.05)
+        self.assertLess(timings.cpu_time, 0.05)
+        self.assertLess(timings.longest_step, 0.05)
+        self.metrics.incr.assert_called_once_with("listeners.on_message.Some_Cog.on_message.calls")
+        self.metrics.timing.assert_not_called()
+
+        self.stats._report()
+        self.metrics.timing.assert_any_call("listeners.on_message.Some_Cog.on_message.wall", ANY)
+        self.metrics.timing.assert_any_call("listeners.on_message.Some_Cog.on_message.cpu", ANY)
+        self.metrics.gauge.assert_called_once_with("listeners.on_message.Some_Cog.on_message.longest_step", ANY)
+
+    async def test_blocking_listener_is_reported(self):
+        """A listener which blocks the event loop should be logged along with its cog."""
+        listener = self.stats.instrument(self.cog.on_typing, "on_typing")
+
+        with self.assertLogs(listener_stats.log, "WARNING") as logs:
+            await listener(listener_stats.SLOW_STEP_DURATION * 1.5)
+
+        self.assertIn("Some Cog.on_typing", logs.output[0])
+        self.assertGreater(self.stats.timings["on_typing", "Some Cog.on_typing"].cpu_time, 0)
+
+    async def test_errors_are_propagated_and_recorded(self):
+        """Errors raised by listeners should propagate, and their calls should still be timed."""
+        listener = self.stats.instrument(self.cog.on_error, "on_error")
+
+        with self.assertRaises(ValueError):
+            await listener()
+
+        self.assertEqual(self.stats.timings["on_error", "Some Cog.on_error"].calls, 1)
+
+    async def test_cancellation_is_propagated(self):
+        """Cancelling the task running a listener should cancel the listener."""
+        listener = self.stats.instrument(self.cog.on_message, "on_message")
+        task = asyncio.create_task(listener(10))
+        await asyncio.sleep(0)
+
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+
+    async def test_top_listeners_are_sorted_by_cpu_time(self):
+        """The top listeners should be the ones which used the most CPU time."""
+        await self.stats.instrument(self.cog.on_message, "on_message")(0)
+        await self.stats.instrument(self.cog.on_typing, "on_typing")(0.01)
+
+        top = self.stats.top(1)
+
+        self.assertEqual([(name, event_name) for name, event_name, _ in top], [("Some Cog.on_typing", "on_typing")])
+
+    async def test_timings_are_reported_once_per_flush(self):
+        """Many calls of a listener should be reported in a fixed number of lines, with their mean timings."""
+        client = FakeStatsClient()
+        metrics = AggregatingStats(lambda: client, flush_interval=60)
+        stats = ListenerStats(metrics)
+        listener = stats.instrument(self.cog.on_message, "on_message")
+
+        for _ in range(1000):
+            await listener(0)
+        metrics.flush()
+
+        lines = [line for packet in client.packets for line in packet.split("\n")]
+        self.assertEqual(len(client.packets), 1)
+        self.assertEqual(
+            [line.split(":")[0] for line in lines],
+            [
+                "bot.listeners.on_message.Some_Cog.on_message.calls",
+                "bot.listeners.on_message.Some_Cog.on_message.longest_step",
+                "bot.listeners.on_message.Some_Cog.on_message.wall",
+                "bot.listeners.on_message.Some_Cog.on_message.cpu",
+            ]
+        )
+        self.assertIn("bot.listeners.on_message.Some_Cog.on_message.calls:1000|c", lines)
+
+        metrics.flush()
+        self.assertEqual(len(client.packets), 1)
@@ -1,6 +1,53 @@
+import asyncio
+import gzip
+import json
+import tracemalloc
 import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import discord
+from aiohttp.payload import get_payload
 
 from bot.utils import messages
+from tests.helpers import MockBot
+
+
+def deleted_message(message_id: int) -> SimpleNamespace:
+    """Return a lightweight deleted message with an embed, as `upload_log` reads it."""
+    embed = discord.Embed(title=f"Embed {message_id}", description="An embed in a deleted message. " * 4)
+    return SimpleNamespace(
+        id=message_id,
+        author=SimpleNamespace(id=message_id % 50),
+        channel=SimpleNamespace(id=1),
+        content=f"Message {message_id}\0 " + "spam " * 40,
+        embeds=[embed],
+    )
+
+
+class FakeReaction:
+    """A reaction whose users are paged in after a delay, like a REST call, counting how often they're fetched."""
+
+    DELAY = 0.05
+
+    def __init__(self, emoji: str, users: list[SimpleNamespace], in_flight: list[int]):
+        self.emoji = emoji
+        self._users = users
+        self.fetches = 0
+        # The number of reactions whose users are being fetched, and the most fetched at once.
+        self._in_flight = in_flight
+
+    def __str__(self) -> str:
+        return self.emoji
+
+    async def users(self):
+        self.fetches += 1
+        self._in_flight[0] += 1
+        self._in_flight[1] = max(self._in_flight)
+        await asyncio.sleep(self.DELAY)
+        self._in_flight[0] -= 1
+        for user in self._users:
+            yield user
 
 
 class TestMessages(unittest.TestCase):
@@ -26,3 +73,130 @@ class TestMessages(unittest.TestCase):
         for username_in, username_out in test_cases:
             with self.subTest(input=username_in, expected_output=username_out):
                 self.assertEqual(messages.sub_clyde(username_in), username_out)
+
+
+class UploadLogTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the upload of deleted messages logs."""
+
+    def setUp(self):
+        self.bot = MockBot()
+        self.bodies = []
+
+        async def post(_endpoint, *, data, headers):
+            # The body shouldn't be sent with chunked transfer encoding, so its length must be known.
+            self.assertIsNotNone(get_payload(data).size)
+            body = data.read()
+            if headers.get("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+            self.bodies.append(json.loads(body))
+            return {"id": 42}
+
+        self.bot.api_client.post = AsyncMock(side_effect=post)
+        patcher = patch("bot.instance", self.bot)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_log_is_serialised_in_chunks(self):
+        """A log larger than a chunk should be serialised in several chunks, forming the same JSON."""
+        log_messages = [deleted_message(i) for i in range(500)]
+        attachments = {3: ["https://cdn.example/3.png"]}
+
+        url = await messages.upload_log(log_messages, actor_id=7, attachments=attachments)
+
+        self.assertTrue(url.endswith("/42"))
+        body = self.bodies[0]
+        self.assertEqual(body["actor"], 7)
+        self.assertEqual(len(body["deletedmessage_set"]), 500)
+        self.assertEqual(body["deletedmessage_set"][3]["attachments"], ["https://cdn.example/3.png"])
+        self.assertEqual(body["deletedmessage_set"][4]["attachments"], [])
+        self.assertNotIn("\0", body["deletedmessage_set"][0]["content"])
+        self.assertEqual(body["deletedmessage_set"][0]["embeds"], [log_messages[0].embeds[0].to_dict()])
+
+        chunks = list(messages._iter_deleted_messages_body(log_messages, 7, None, compress=False))
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) < 2 * messages.UPLOAD_CHUNK_SIZE for chunk in chunks))
+
+    @patch.object(messages.URLs, "site_api_gzip", True)
+    async def test_log_is_compressed_when_supported(self):
+        """The body should be gzip compressed when the site API accepts it."""
+        await messages.upload_log([deleted_message(i) for i in range(100)], actor_id=7)
+
+        self.assertEqual(self.bot.api_client.post.call_args.kwargs["headers"]["Content-Encoding"], "gzip")
+        self.assertEqual(len(self.bodies[0]["deletedmessage_set"]), 100)
+
+    async def test_empty_log(self):
+        """A log without messages should still be valid JSON."""
+        await messages.upload_log([], actor_id=7)
+
+        self.assertEqual(self.bodies[0]["deletedmessage_set"], [])
+
+    async def test_peak_memory_is_flat(self):
+        """The peak memory used to upload 10k messages should be a fraction of the size of the whole log."""
+        log_messages = [deleted_message(i) for i in range(10_000)]
+
+        async def post(_endpoint, *, data, **_kwargs):
+            # Read the body in chunks, like aiohttp streams a file.
+            while data.read(messages.UPLOAD_CHUNK_SIZE):
+                pass
+            return {"id": 42}
+
+        self.bot.api_client.post = AsyncMock(side_effect=post)
+
+        tracemalloc.start()
+        try:
+            payload = json.dumps([messages._serialise_deleted_message(message, []) for message in log_messages])
+            _, unstreamed_peak = tracemalloc.get_traced_memory()
+            del payload
+
+            tracemalloc.reset_peak()
+            await messages.upload_log(log_messages, actor_id=7)
+            _, streamed_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        # Besides a chunk or two of the log, the list of messages and the thread writing the file take some memory.
+        self.assertLess(streamed_peak, 8 * messages.UPLOAD_CHUNK_SIZE)
+        self.assertLess(streamed_peak, unstreamed_peak / 20)
+
+
+class ReactionUsersTests(unittest.IsolatedAsyncioTestCase):
+    """Tests for the concurrent collection of the users who reacted to a message."""
+
+    def setUp(self):
+        self.users = [SimpleNamespace(id=i, bot=i % 10 == 0) for i in range(100)]
+        # Each of the 40 reactions was added by 10 users, overlapping with those of the next reaction.
+        self.in_flight = [0, 0]
+        self.reactions = [
+            FakeReaction(f"emoji_{i}", self.users[(i * 5) % 95:(i * 5) % 95 + 10], self.in_flight) for i in range(40)
+        ]
+        self.message = SimpleNamespace(id=1, reactions=self.reactions)
+
+    async def test_reactions_are_fetched_concurrently(self):
+        """The users of dozens of reactions should all be fetched at once, rather than one reaction after another."""
+        users = await messages.get_unique_reaction_users(self.message)
+
+        self.assertEqual(set(users), {user.id for user in self.users})
+        self.assertTrue(all(reaction.fetches == 1 for reaction in self.reactions))
+        self.assertEqual(self.in_flight[1], len(self.reactions))
+
+    async def test_predicates_are_applied(self):
+        """Only the matching reactions should be fetched, and only the matching users should be counted."""
+        count = await messages.count_unique_users_reaction(
+            self.message,
+            lambda reaction: str(reaction) in ("emoji_0", "emoji_1"),
+            lambda user: user.id % 2 == 0,
+            count_bots=False,
+        )
+
+        # The users 0 to 14 reacted with either emoji; 0 and 10 are bots, leaving 2, 4, 6, 8, 12 and 14.
+        self.assertEqual(count, 6)
+        self.assertEqual(sum(reaction.fetches for reaction in self.reactions), 2)
+
+    async def test_users_are_not_reused(self):
+        """A reaction's users should be fetched again on each call, so changes to the reactions are seen."""
+        await messages.count_unique_users_reaction(self.message, lambda reaction: str(reaction) == "emoji_0")
+        self.reactions[0]._users[0] = self.users[-1]
+        users = await messages.get_unique_reaction_users(self.message, lambda reaction: str(reaction) == "emoji_0")
+
+        self.assertIn(self.users[-1].id, users)
+        self.assertEqual(self.reactions[0].fetches, 2)
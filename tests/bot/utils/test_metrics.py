@@ -0,0 +1,106 @@
+import unittest
+from datetime import timedelta
+
+from statsd.client.base import StatsClientBase
+
+from bot.constants import Guild
+from bot.exts.info.stats import Stats
+from bot.utils.metrics import AggregatingStats, MAX_PACKET_SIZE
+from tests.helpers import MockBot, MockGuild, MockMessage, MockTextChannel
+
+
+class FakeStatsClient(StatsClientBase):
+    """A statsd client which records the packets it would send."""
+
+    def __init__(self):
+        self._prefix = "bot"
+        self.packets = []
+
+    def _send(self, data: str) -> None:
+        self.packets.append(data)
+
+
+class AggregatingStatsTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.client = FakeStatsClient()
+        self.metrics = AggregatingStats(lambda: self.client, flush_interval=60)
+
+    def flushed_lines(self) -> list[str]:
+        self.metrics.flush()
+        return [line for packet in self.client.packets for line in packet.split("\n")]
+
+    async def test_metrics_are_aggregated(self):
+        """Counters should be summed, gauges should keep their last value, and timings should all be kept."""
+        for _ in range(3):
+            self.metrics.incr("messages")
+        self.metrics.decr("messages")
+        self.metrics.gauge("members", 10)
+        self.metrics.gauge("members", 12)
+        self.metrics.gauge("drift", -1)
+        self.metrics.timing("time", timedelta(milliseconds=5))
+        self.metrics.timing("time", 7)
+
+        self.assertEqual(self.client.packets, [])
+        self.assertEqual(
+            self.flushed_lines(),
+            [
+                "bot.messages:2|c",
+                "bot.members:12|g",
+                "bot.drift:0|g",
+                "bot.drift:-1|g",
+                "bot.time:5.000000|ms",
+                "bot.time:7.000000|ms",
+            ]
+        )
+
+    async def test_flush_is_scheduled_once(self):
+        """A single flush should be scheduled for the metrics reported within an interval."""
+        self.metrics.incr("a")
+        handle = self.metrics._flush_handle
+        self.metrics.incr("b")
+
+        self.assertIsNotNone(handle)
+        self.assertIs(self.metrics._flush_handle, handle)
+
+        self.metrics.flush()
+        self.assertIsNone(self.metrics._flush_handle)
+        self.assertTrue(handle.cancelled())
+
+    async def test_metrics_are_kept_until_client_is_available(self):
+        """Metrics reported before the statsd client exists shouldn't be lost."""
+        client = self.client
+        self.client = None
+        self.metrics.incr("messages")
+        self.metrics.flush()
+
+        self.client = client
+        self.assertEqual(self.flushed_lines(), ["bot.messages:1|c"])
+
+    async def test_packets_are_bounded_in_size(self):
+        """Metrics should be split into packets no larger than the maximum size."""
+        for i in range(500):
+            self.metrics.incr(f"channels.channel_{i}")
+        self.metrics.flush()
+
+        self.assertGreater(len(self.client.packets), 1)
+        self.assertTrue(all(len(packet) <= MAX_PACKET_SIZE for packet in self.client.packets))
+        self.assertEqual(sum(packet.count("\n") + 1 for packet in self.client.packets), 500)
+
+    async def test_message_burst_sends_bounded_number_of_packets(self):
+        """A burst of messages in the Stats cog should result in a handful of packets, rather than one per metric."""
+        bot = MockBot()
+        bot.metrics = self.metrics
+        cog = Stats(bot)
+        self.addAsyncCleanup(cog.cog_unload)
+
+        guild = MockGuild(id=Guild.id)
+        channels = [MockTextChannel(id=i, name=f"channel-{i}", guild=guild, category_id=None) for i in range(20)]
+        messages = [MockMessage(guild=guild, channel=channel) for channel in channels]
+        for i in range(10_000):
+            await cog.on_message(messages[i % len(messages)])
+        self.metrics.flush()
+
+        self.assertLessEqual(len(self.client.packets), 2)
+        lines = [line for packet in self.client.packets for line in packet.split("\n")]
+        self.assertIn("bot.messages:10000|c", lines)
+        self.assertIn("bot.channels.channel_0:500|c", lines)